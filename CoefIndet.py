@@ -3,127 +3,188 @@
 #  Versión 1: Mejorada
 # ============================================================
 
-from sympy import (
-    symbols, Function, Eq, dsolve, sin, cos, tan, exp, log,
-    simplify, nsimplify, lambdify, Derivative, sympify
-)
-import matplotlib.pyplot as plt
-import numpy as np
-import re
+from sympy import symbols, Eq, dsolve, nsimplify, Derivative, Subs, Float, expand
+
+from anulador import base_homogenea, solucion_particular, aplicar_condiciones
+from cache_soluciones import clave_canonica
+from condiciones import familia_soluciones
+from diferido import importar_diferido
+from parser_edo import X, Y, parsear_ecuacion, parsear_condicion
+from perfilado import PERFIL_NULO, medir
+from simplificacion import simplificar
+from superposicion import agrupar_terminos, cache_terminos, clave_termino, es_familia, resolver_grupos
+
+#Solo se cargan al graficar
+np = importar_diferido('numpy')
+evaluador = importar_diferido('evaluador')
+muestreo = importar_diferido('muestreo')
+numerico = importar_diferido('numerico')
 
 
 class CoefIndet:
-    def __init__(self, ecuacion):
-        # Normalizar ^ -> **
-        self.ecuacion_raw = ecuacion.replace('^', '**').strip()
-        # Insertar multiplicaciones faltantes (2x -> 2*x)
-        self.ecuacion_raw = self._insert_missing_multiplication(self.ecuacion_raw)
-
-        self.x = symbols('x')
-        self.y_func = Function('y')(self.x)
+    metodo = 'indeterminados'
+
+    #simplificacion: 'auto', 'dirigida' o 'ninguna' (ver simplificacion.py)
+    #perfil: perfilado.Perfil para medir cada etapa (sin perfil no se mide nada)
+    #paralelo: los grupos de la forzante que van a dsolve se resuelven en procesos aparte
+    def __init__(self, ecuacion, simplificacion='auto', perfil=None, paralelo=False):
+        self.perfil = perfil if perfil is not None else PERFIL_NULO
+        self.ecuacion_raw = ecuacion.strip()
+        self.simplificacion = simplificacion
+        self.paralelo = paralelo
+
+        self.x = X
+        self.y_func = Y
         self.sol = None
+        #Solucion general (con C) antes de aplicar las CI; None si dsolve las aplico directamente
+        self.sol_general = None
+        #Motor que produjo la solucion: 'anulador', 'superposicion' (anulador y dsolve
+        #por grupos de terminos) o 'dsolve'
+        self.motor = None
         self.CI = {}
         self.C_symbols = []
+        self.ir = None
         self.orden = 0
 
+        #Funciones numericas compiladas por expresion (ver evaluador.py)
+        self.evaluadores = {}
+        self._expr_grafica = None
+        #(sol, texto) de la ultima solucion mostrada
+        self._sol_mostrada = None
+        #True si la ultima grafica salio del motor numerico
+        self.grafica_numerica = False
+
         self._parse_ecuacion()
 
+    #Las funciones compiladas no se pueden serializar; se vuelven a crear al graficar
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['evaluadores'] = {}
+        return estado
+
     # ---------------------------------------------------------
-    def _insert_missing_multiplication(self, s):
-        s = re.sub(r'(\d)\s*([a-zA-Z(])', r'\1*\2', s)
-        s = re.sub(r'([a-zA-Z)])\s*(\d)', r'\1*\2', s)
-        return s
+    #Representacion comun de la ecuacion (ver parser_edo.py)
+    @medir('parseo', tamano=lambda self, _: self.lhs - self.rhs)
+    def _parse_ecuacion(self):
+        self.ir = parsear_ecuacion(self.ecuacion_raw)
+        self.lhs = self.ir.lhs
+        self.rhs = self.ir.rhs
+        self.orden = self.ir.orden
 
     # ---------------------------------------------------------
-    def _replace_derivs(self, s):
-        pattern_n = r"y\(\s*(\d+)\s*\)"
-        s = re.sub(pattern_n, lambda m: f"Derivative(y_func, x, {m.group(1)})", s)
+    @medir('condiciones')
+    def agregar_CI(self, ci_list):
+        for ci in ci_list:
+            orden, x0, val = parsear_condicion(ci.strip())
+            if orden == 0:
+                self.CI[self.y_func.subs({self.x: x0})] = val
+            else:
+                self.CI[Derivative(self.y_func, self.x, orden).subs({self.x: x0})] = val
 
-        pattern_ticks = r"y('{1,})"
-        def repl_ticks(m):
-            n = len(m.group(1))
-            return f"Derivative(y_func, x, {n})"
-        s = re.sub(pattern_ticks, repl_ticks, s)
+    def clave_cache(self):
+        condiciones = sorted((clave_canonica(k, v) for k, v in self.CI.items()), key=str)
+        return clave_canonica('coeficientes', self.lhs - self.rhs, tuple(condiciones))
 
-        s = re.sub(r"(?<![A-Za-z0-9_])y(?![A-Za-z0-9_\(])", "y_func", s)
-        return s
+    def resolver(self, cache=None):
+        clave = None
+        if cache is not None:
+            with self.perfil.etapa('cache'):
+                clave = self.clave_cache()
+                guardado = cache.obtener(clave)
+            if guardado is not None:
+                self.restaurar_solucion(guardado)
+                return
 
-    # ---------------------------------------------------------
-    def _parse_ecuacion(self):
-        if '=' not in self.ecuacion_raw:
-            raise ValueError("La ecuación debe contener '='.")
+        #dsolve de la ecuacion completa solo si no hay base exacta de la homogenea
+        #o la ecuacion no es lineal de coeficientes constantes
+        motor = self._resolver_anulador()
+        if motor is not None:
+            self.motor = motor
+        else:
+            self._resolver_dsolve()
+            self.motor = 'dsolve'
 
-        lhs, rhs = self.ecuacion_raw.split('=', 1)
-        lhs_t = self._replace_derivs(lhs.strip())
-        rhs_t = self._replace_derivs(rhs.strip())
+        if cache is not None and self.solucion_guardable():
+            cache.guardar(clave, self.estado_solucion())
 
-        contexto = {
-            "Derivative": Derivative,
-            "y_func": self.y_func,
-            "x": self.x,
-            "sin": sin, "cos": cos, "tan": tan,
-            "exp": exp, "ln": log, "log": log
-        }
+    def solucion_guardable(self):
+        return self.sol is not None
 
-        try:
-            self.lhs = sympify(lhs_t, locals=contexto)
-            self.rhs = sympify(rhs_t, locals=contexto)
-        except Exception as e:
-            raise ValueError(f"Error al parsear la ecuación: {e}")
+    def estado_solucion(self):
+        return {'sol': self.sol, 'sol_general': self.sol_general, 'motor': self.motor}
 
-        self.orden = 0
-        for d in self.lhs.atoms(Derivative):
-            try:
-                order = len(d.variables)
-            except Exception:
-                order = 1
-            if order > self.orden:
-                self.orden = order
+    def restaurar_solucion(self, estado):
+        self.sol = estado['sol']
+        self.sol_general = estado.get('sol_general')
+        self.motor = estado.get('motor')
 
     # ---------------------------------------------------------
-    def agregar_CI(self, ci_list):
-        for ci in ci_list:
-            if '=' not in ci:
-                raise ValueError(f"CI inválida: {ci}")
-
-            left, right = ci.split('=', 1)
-            left = left.strip()
-            val = sympify(right.strip(), locals={"x": self.x})
-
-            m_general = re.match(r"^\s*y\(\s*(\d+)\s*\)\s*\(\s*([^\)]+)\s*\)\s*$", left)
-            if m_general:
-                n = int(m_general.group(1))
-                x0 = sympify(m_general.group(2))
-                self.CI[Derivative(self.y_func, self.x, n).subs({self.x: x0})] = val
-                continue
-
-            m0 = re.match(r"^\s*y\(\s*([^\)]+)\s*\)\s*$", left)
-            if m0:
-                x0 = sympify(m0.group(1))
-                self.CI[self.y_func.subs({self.x: x0})] = val
-                continue
+    #Particular por superposicion: cada grupo de terminos de la forzante por el
+    #anulador si es de su familia, o por dsolve si no; se guarda por grupo.
+    #Devuelve el motor usado ('anulador' o 'superposicion') o None.
+    @medir('anulador', tamano=lambda self, motor: self.sol.rhs if motor else None)
+    def _resolver_anulador(self):
+        if not self.ir.lineal_constante:
+            return None
+        caracteristico = self.ir.polinomio_caracteristico()
+
+        base = base_homogenea(caracteristico, self.x)
+        if base is None:
+            return None
 
-            m1 = re.match(r"^\s*y'\(\s*([^\)]+)\s*\)\s*$", left)
-            if m1:
-                x0 = sympify(m1.group(1))
-                self.CI[Derivative(self.y_func, self.x).subs({self.x: x0})] = val
-                continue
+        y_p = 0
+        motor = 'anulador'
+        pendientes = []
+        for tipo, grupo in agrupar_terminos(self.ir.forzante, self.x):
+            if not es_familia(tipo):
+                motor = 'superposicion'
+            clave = clave_termino('coeficientes', caracteristico.as_expr(), grupo)
+            guardado = cache_terminos.obtener(clave)
+            if guardado is not None:
+                y_p += guardado['y_p']
+            elif es_familia(tipo):
+                particular = solucion_particular(caracteristico, grupo, self.x)
+                if particular is None:
+                    return None
+                cache_terminos.guardar(clave, {'y_p': particular})
+                y_p += particular
+            else:
+                pendientes.append((clave, grupo))
 
-            m2 = re.match(r"^\s*y''\(\s*([^\)]+)\s*\)\s*$", left)
-            if m2:
-                x0 = sympify(m2.group(1))
-                self.CI[Derivative(self.y_func, self.x, 2).subs({self.x: x0})] = val
-                continue
+        if pendientes:
+            with self.perfil.etapa('dsolve') as medicion:
+                operador = self.ir.operador()
+                particulares = resolver_grupos(particular_dsolve, [(operador, grupo) for _, grupo in pendientes],
+                                               self.paralelo)
+                medicion.tamano(sum(particulares))
+            for (clave, _), particular in zip(pendientes, particulares):
+                cache_terminos.guardar(clave, {'y_p': particular})
+                y_p += particular
+
+        constantes = symbols(f'C1:{len(base) + 1}')
+        y_general = sum(c * f for c, f in zip(constantes, base)) + y_p
+        self.sol_general = Eq(self.y_func, y_general)
+
+        if self.CI:
+            print(f"Resolviendo con condiciones: {self.CI}")
+            condiciones = [self._condicion_a_tupla(k, v) for k, v in self.CI.items()]
+            y_final = aplicar_condiciones(y_general, constantes, condiciones, self.x)
+            if y_final is None:
+                print("Error aplicando CI: el sistema de constantes no tiene solución")
+            else:
+                y_general = y_final
 
-            m_short = re.match(r"^\s*y\(\s*(\d+)\s*\)\s*$", left)
-            if m_short:
-                n = int(m_short.group(1))
-                self.CI[Derivative(self.y_func, self.x, n).subs({self.x: 0})] = val
-                continue
+        self.sol = Eq(self.y_func, y_general)
+        return motor
 
-            raise ValueError(f"Formato de CI no soportado: {ci}")
+    #y(x0) o Subs(Derivative(y, x, n), x, x0)  ->  (n, x0, valor)
+    def _condicion_a_tupla(self, clave, valor):
+        if isinstance(clave, Subs):
+            return len(clave.expr.variables), clave.point[0], valor
+        return 0, clave.args[0], valor
 
-    def resolver(self):
+    @medir('dsolve', tamano=lambda self, _: self.sol.rhs if self.sol is not None else None)
+    def _resolver_dsolve(self):
         eq = Eq(self.lhs - self.rhs, 0)
         
         if self.CI:
@@ -134,41 +195,132 @@ class CoefIndet:
                 print(f"Error aplicando CI en dsolve: {e}")
 
                 self.sol = dsolve(eq)
+                self.sol_general = self.sol
         else:
             self.sol = dsolve(eq)
+            self.sol_general = self.sol
 
+    @medir('simplificacion')
     def mostrar_sol(self):
         if self.sol is None:
             return "Primero debes resolver la ecuación."
 
-        expr = simplify(self.sol.rhs)
+        if self._sol_mostrada is not None and self._sol_mostrada[0] is self.sol:
+            return self._sol_mostrada[1]
+
+        expr = simplificar(self.sol.rhs, self.x, nivel=self.simplificacion)
         self.C_symbols = sorted([s for s in expr.free_symbols if str(s).startswith("C")], key=lambda z: str(z))
+        #nsimplify solo cambia algo si quedaron decimales
+        if expr.has(Float):
+            try:
+                expr = nsimplify(expr)
+            except Exception:
+                pass
+        self._sol_mostrada = (self.sol, str(expr))
+        return self._sol_mostrada[1]
+
+    # ---------------------------------------------------------
+    #Solucion con las constantes C = 1, calculada una vez por solucion
+    def expresion_grafica(self):
+        if self._expr_grafica is None or self._expr_grafica[0] is not self.sol:
+            expr = self.sol.rhs
+            subs_dict = {s: 1 for s in expr.free_symbols if str(s).startswith('C')}
+            self._expr_grafica = (self.sol, expr.subs(subs_dict))
+        return self._expr_grafica[1]
+
+    def evaluar_solucion(self, x_vals):
+        expr = self.expresion_grafica()
+        if self.perfil.activo and expr not in self.evaluadores:
+            with self.perfil.etapa('lambdify') as medicion:
+                evaluador.obtener_evaluador(self.evaluadores, expr, self.x)
+                medicion.tamano(expr)
+        return evaluador.obtener_evaluador(self.evaluadores, expr, self.x)(x_vals)
+
+    # ---------------------------------------------------------
+    #Curvas para muchos conjuntos de condiciones sobre la solucion general (con C,
+    #aunque ya se hayan aplicado CI): arreglo (n_conjuntos, n_puntos) con una sola
+    #evaluacion de la base y un solo solve por lotes
+    def familia_soluciones(self, conjuntos, x_vals):
+        if self.sol is None:
+            raise ValueError("Primero debes resolver la ecuación.")
+        general = self.sol_general if self.sol_general is not None else self.sol
+        #Expandida: separar_constantes usa .coeff y no ve constantes dentro de productos
+        expr = expand(general.rhs)
+        constantes = sorted([s for s in expr.free_symbols if str(s).startswith('C')], key=str)
+        return familia_soluciones(expr, constantes, self.x, conjuntos, x_vals)
+
+    @medir('familia')
+    def datos_familia(self, conjuntos, x_min=-10, x_max=10, puntos=500):
         try:
-            expr = nsimplify(expr)
-        except Exception:
-            pass
-        return str(expr)
+            x_vals = np.linspace(float(x_min), float(x_max), puntos)
+            return (x_vals, self.familia_soluciones(conjuntos, x_vals)), f"{len(conjuntos)} curvas"
+        except Exception as e:
+            return None, str(e)
+
+    # ---------------------------------------------------------
+    #Datos (x, y) para graficar con C = 1; (None, mensaje) si no hay solucion.
+    #numerico=True (o si no hay solucion simbolica evaluable) usa el motor numerico
+    @medir('grafica')
+    def datos_grafica(self, x_min=-10, x_max=10, numerico=False):
+        self.grafica_numerica = False
+        if numerico or self.sol is None:
+            datos, msg = self.datos_grafica_numerica(x_min, x_max)
+            if datos is None and not numerico:
+                return None, "No hay solución para graficar."
+            return datos, msg
+
+        try:
+            try:
+                x_vals, y_vals = muestreo.muestrear(self.evaluar_solucion, x_min, x_max)
+            except Exception:
+                #Recorriendo el arbol de la expresion (integrales sin evaluar incluidas)
+                arbol = evaluador.EvaluadorArbol(self.expresion_grafica(), self.x)
+                x_vals, y_vals = muestreo.muestrear(arbol, x_min, x_max)
+            if not np.isfinite(y_vals).any():
+                raise ValueError("La solución no da valores finitos en el intervalo.")
+        except Exception as e:
+            datos, msg = self.datos_grafica_numerica(x_min, x_max)
+            if datos is None:
+                return None, f"No se pudo evaluar la solución: {e}"
+            return datos, msg
+        return (x_vals, y_vals), "Gráfico generado con éxito"
+
+    #Solucion numerica con las CI (solo operadores lineales de coeficientes constantes)
+    @medir('numerica')
+    def datos_grafica_numerica(self, x_min=-10, x_max=10):
+        if not self.ir.lineal_constante:
+            return None, "La solución numérica requiere un operador lineal de coeficientes constantes."
+        caracteristico, forzante = self.ir.polinomio_caracteristico(), self.ir.forzante
+
+        try:
+            condiciones = [self._condicion_a_tupla(k, v) for k, v in self.CI.items()]
+            datos, msg = numerico.datos_numericos(caracteristico, forzante, self.x, condiciones, x_min, x_max)
+        except Exception as e:
+            return None, f"No se pudo calcular la solución numérica: {e}"
+        self.grafica_numerica = True
+        return datos, msg
 
     # ---------------------------------------------------------
     def graficar(self):
-        if self.sol is None:
-            print("No hay solución para graficar.")
+        datos, msg = self.datos_grafica()
+        if datos is None:
+            print(msg)
             return
 
-        expr = simplify(self.sol.rhs)
-        for C in [s for s in expr.free_symbols if 'C' in str(s)]:
-            expr = expr.subs(C, 1)
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots()
+        ax.plot(*datos)
+        ax.grid()
+        ax.set_title("Solución aproximada (C=1)")
+        ax.set_xlabel("x")
+        ax.set_ylabel("y(x)")
+        plt.show()
+        plt.close(fig)
 
-        f = lambdify(self.x, expr, "numpy")
-        x_vals = np.linspace(-10, 10, 400)
-        try:
-            y_vals = f(x_vals)
-        except Exception:
-            y_vals = [float(expr.subs({self.x: x})) for x in x_vals]
-
-        plt.plot(x_vals, y_vals)
-        plt.grid()
-        plt.title("Solución aproximada (C=1)")
-        plt.xlabel("x")
-        plt.ylabel("y(x)")
-        plt.show()
\ No newline at end of file
+
+#Solucion particular de L[y] = termino por dsolve (constantes en cero).
+#Funcion de modulo para poder mandarla a otro proceso (ver superposicion.py)
+def particular_dsolve(operador, termino):
+    sol = dsolve(Eq(operador, termino))
+    constantes = {s: 0 for s in sol.rhs.free_symbols if str(s).startswith('C')}
+    return sol.rhs.subs(constantes)
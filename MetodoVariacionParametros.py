@@ -1,23 +1,51 @@
-import numpy as np
 import sympy as sp
-from sympy import degree, roots, E, solve
-import matplotlib.pyplot as plt
-import re
 
-from sympy.parsing.sympy_parser import (
-    parse_expr, 
-    standard_transformations, 
-    implicit_multiplication_application, 
-    convert_xor
-)
+from cache_soluciones import clave_canonica
+from condiciones import leer_condicion, separar_constantes, derivadas_sucesivas, familia_soluciones
+from diferido import importar_diferido
+from integracion import integrar, integrar_en_paralelo
+from parser_edo import parsear_ecuacion, parsear_expresion
+from perfilado import PERFIL_NULO, medir
+from raices import raices_caracteristicas
+from simplificacion import Presupuesto, simplificar
+from superposicion import agrupar_terminos, cache_terminos, clave_termino
+from wronskiano import columna_inversa_estructurada, determinante_wronskiano
+
+#Solo se cargan al graficar o al resolver constantes en punto flotante
+np = importar_diferido('numpy')
+evaluador = importar_diferido('evaluador')
+green = importar_diferido('green')
+muestreo = importar_diferido('muestreo')
+numerico = importar_diferido('numerico')
 
 class EDOSolver:
+
+    metodo = 'variacion'
+
+    #Estado que se guarda en la cache de soluciones
+    _ATRIBUTOS_SOLUCION = ('raices', 'motor_raices_usado', 'CFS', 'C', 'U', 'solucionHomogenea',
+                           'solucionParticular_u', 'columna_wronskiano', 'matriz_U_integrada', 'y_p', 'y_general')
     
-    def __init__(self, ecuacion_str: str):
+    #paralelo: integrar los u_k en un pool de procesos
+    #tiempo_limite: segundos por integral (solo con paralelo); las que no terminan quedan como Integral
+    #motor_raices: 'auto', 'exacto' (sympy.roots) o 'numerico' (valores propios, ver raices.py)
+    #simplificacion: 'auto', 'dirigida' o 'ninguna' (ver simplificacion.py)
+    #perfil: perfilado.Perfil para medir cada etapa (sin perfil no se mide nada)
+    def __init__(self, ecuacion_str: str, paralelo=False, tiempo_limite=None, motor_raices='auto',
+                 simplificacion='auto', perfil=None):
+        self.perfil = perfil if perfil is not None else PERFIL_NULO
         self.x = sp.Symbol('x')
         self.y = sp.Symbol('y')
         
         self.ecuacion_str = ecuacion_str
+        self.paralelo = paralelo
+        self.tiempo_limite = tiempo_limite
+        self.motor_raices = motor_raices
+        self.simplificacion = simplificacion
+        #Motor que dio las raices en la ultima resolucion ('exacto' o 'numerico')
+        self.motor_raices_usado = None
+        #Representacion comun de la ecuacion (ver parser_edo.py)
+        self.ir = None
         self.fHomogenea = None
         self.fComplementaria = None
         
@@ -30,9 +58,20 @@ class EDOSolver:
         self.solucionHomogenea = 0
         self.solucionParticular_u = 0
         self.matriz_U_integrada = None
+        #Ruta usada en cada integral u_k ('tabla', 'mixta' o 'sympy')
+        self.rutas_integracion = []
+        #Ultima columna de W^-1 (solo depende del lado izquierdo)
+        self.columna_wronskiano = None
         self.y_p = 0
         self.y_general = 0
         self.y_final_sustituida = 0
+        #Condiciones leidas como (orden, x0, valor)
+        self.condiciones_iniciales = []
+        #True si la ultima grafica salio del motor numerico
+        self.grafica_numerica = False
+
+        #Funciones numericas compiladas por expresion (ver evaluador.py)
+        self.evaluadores = {}
         
         try:
             self._parsear_ecuacion()
@@ -41,12 +80,68 @@ class EDOSolver:
             print(f"Error fatal al parsear la ecuación: {e}")
             raise
 
+    #Las funciones compiladas no se pueden serializar; se vuelven a crear al graficar
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['evaluadores'] = {}
+        return estado
+
+    #Resolver completo (homogenea + particular + general) con cache opcional
+    def resolver(self, cache=None):
+        clave = None
+        if cache is not None:
+            with self.perfil.etapa('cache'):
+                clave = self.clave_cache()
+                guardado = cache.obtener(clave)
+            if guardado is not None:
+                self.restaurar_solucion(guardado)
+                return
+
+        self.resolver_homogenea()
+        self.resolver_particular()
+        self.crear_solucion_general()
+
+        if cache is not None and self.solucion_guardable():
+            cache.guardar(clave, self.estado_solucion())
+
+    #Las opciones que cambian y_general entran en la clave solo si no son las de
+    #siempre, asi las entradas guardadas con las opciones por defecto siguen valiendo
+    def clave_cache(self):
+        opciones = []
+        if self.motor_raices != 'auto':
+            opciones.append(self.motor_raices)
+        if self.simplificacion != 'auto':
+            opciones.append(('simplificacion', self.simplificacion))
+        return clave_canonica('variacion', self.fHomogenea, self.fComplementaria, *opciones)
+
+    #Una integral que agoto el tiempo queda sin evaluar: esa solucion no se guarda
+    #para que una resolucion sin limite (o con mas tiempo) la vuelva a intentar
+    def solucion_guardable(self):
+        return 'tiempo_agotado' not in self.rutas_integracion
+
+    def estado_solucion(self):
+        return {nombre: getattr(self, nombre) for nombre in self._ATRIBUTOS_SOLUCION}
+
+    def restaurar_solucion(self, estado):
+        for nombre, valor in estado.items():
+            setattr(self, nombre, valor)
+        self.y_final_sustituida = self.y_general
+
     def resolver_homogenea(self):
         #Buscar raices funcion
-        self.raices = roots(self.fHomogenea, self.y)
+        with self.perfil.etapa('raices') as medicion:
+            self.raices, self.motor_raices_usado = raices_caracteristicas(
+                sp.Poly(self.fHomogenea, self.y), self.motor_raices)
+            medicion.tamano(self.fHomogenea)
+        if sum(self.raices.values()) != self.grado:
+            raise ValueError("sympy no encontró todas las raíces; pruebe con el motor de raíces numérico")
         
         #CFS
-        self.CFS = self._revisarMultiplicidad(self.raices)
+        with self.perfil.etapa('cfs') as medicion:
+            self.CFS = self._revisarMultiplicidad(self.raices)
+            medicion.tamano(self.CFS)
+
+        self.columna_wronskiano = None
 
         self.C = sp.symbols(f'c1:{self.grado+1}')
         self.U = sp.symbols(f'u1:{self.grado+1}')
@@ -61,111 +156,205 @@ class EDOSolver:
             self.solucionParticular_u += self.U[i] * self.CFS[i]
         
     def resolver_particular(self):
-        wronskiano_matriz = self._hacerWronskiano()
-        soluciones_determinantes = self._hacerDeterminantesComplementaria(wronskiano_matriz)
-        self.matriz_U_integrada = self._integrarObtenerU(soluciones_determinantes)
-        self.y_p = self._sustitucionU()
+        columna = self._columnaInversaWronskiano()
+        self.matriz_U_integrada = self._integrarPorTerminos(columna, self.fComplementaria)
+        self.y_p = self._sustitucionU(self.matriz_U_integrada)
 
     #Solucion General
     def crear_solucion_general(self):
-        solucionGeneral = self.solucionHomogenea + self.y_p
-
-        solucionGeneral = solucionGeneral.doit()
-        solucionGeneral = solucionGeneral.subs(sp.E, sp.exp(1))
-        #solucionGeneral = sp.exptrigsimp(solucionGeneral)
-        #solucionGeneral = sp.simplify(solucionGeneral)
-        solucionGeneral = sp.expand(solucionGeneral)
-        self.y_general = solucionGeneral
+        self.y_general = self._formarSolucionGeneral(self.y_p)
         self.y_final_sustituida = self.y_general
 
-    def gestionar_condiciones_iniciales(self, lista_condiciones_str):
+    #Varias funciones complementarias para el mismo lado izquierdo:
+    #raices, CFS y Wronskiano se calculan una sola vez
+    def resolver_lote(self, funciones):
+        if not self.CFS:
+            self.resolver_homogenea()
+        columna = self._columnaInversaWronskiano()
+
+        for funcion in funciones:
+            if isinstance(funcion, str):
+                fComplementaria = parsear_expresion(funcion)
+            else:
+                fComplementaria = sp.sympify(funcion)
+            matriz_U = self._integrarPorTerminos(columna, fComplementaria)
+            y_p = self._sustitucionU(matriz_U)
+            yield fComplementaria, y_p, self._formarSolucionGeneral(y_p)
+
+    @medir('solucion_general', tamano=lambda self, y: y)
+    def _formarSolucionGeneral(self, y_p):
+        #Sin evaluar integrales que quedaron pendientes por tiempo
+        y_p = y_p.doit(integrals=False)
+        y_p = sp.expand(y_p.subs(sp.E, sp.exp(1)))
+        #Solo reescrituras baratas agrupadas por la CFS; la homogenea queda como
+        #suma de c_i * CFS_i para que las constantes se puedan separar
+        if self.simplificacion != 'ninguna':
+            y_p = simplificar(y_p, self.x, base=self.CFS, nivel='dirigida')
+        return sp.expand(self.solucionHomogenea) + y_p
+
+    #Las constantes entran de forma lineal: y = sum(c_i * base_i) + particular.
+    #Se arma el sistema n x n con las derivadas de la base y de la particular en x0
+    #y se resuelve directo: exacto (LUsolve con racionales) o, con exacto=False,
+    #en punto flotante, mas rapido para ordenes altos pero con constantes decimales
+    @medir('condiciones')
+    def gestionar_condiciones_iniciales(self, lista_condiciones_str, exacto=True):
         if self.y_general == 0:
             return "Error: Debe llamar a .crear_solucion_general() antes."
 
-        patron = re.compile(r"^\s*y('*)\s*\(\s*([-\d\.]+)\s*\)\s*=\s*([-\d\.]+)\s*$")
-
         datos_procesados = []
-        
         for cadena in lista_condiciones_str:
-            match = patron.match(cadena)
-            if match:
-                try:
-                    comillas = match.group(1)
-                    orden_k = len(comillas)
-                    
-                    valor_x = float(match.group(2))
-                    valor_y = float(match.group(3))
-                    
-                    datos_procesados.append((orden_k, valor_x, valor_y))
-                except ValueError:
-                    return f"Error al leer números en: {cadena}"
-            else:
-                return f"Formato inválido en: '{cadena}'. Use formato y''(0)=1"
+            try:
+                datos_procesados.append(leer_condicion(cadena, exacto))
+            except ValueError as e:
+                return str(e)
+
+        self.condiciones_iniciales = datos_procesados
 
         if len(datos_procesados) != self.grado:
             return f"Error: Se requieren {self.grado} condiciones, se recibieron {len(datos_procesados)}."
 
-        ecuaciones = []
         log_texto = "Sistema generado:\n"
         
         try:
+            base, particular = separar_constantes(self.y_general, self.C)
+
+            #Derivadas hasta el orden mas alto pedido, cada una a partir de la anterior
+            orden_max = max(k for k, _, _ in datos_procesados)
+            derivadas = derivadas_sucesivas(base + [particular], self.x, orden_max)
+
+            filas = []
+            valores = []
             for k, x0, y0 in datos_procesados:
-                if k == 0:
-                    derivada_k = self.y_general
-                else:
-                    derivada_k = sp.diff(self.y_general, self.x, k)
-                
-                eq_sustituida = derivada_k.subs(self.x, x0).doit()
-                ecuacion_final = sp.Eq(eq_sustituida, y0)
-                ecuaciones.append(ecuacion_final)
-                log_texto += f"  y{''.join(['\'' for _ in range(k)])}({x0}) = {y0}\n"
+                en_x0 = [self._evaluar_en(f, x0) for f in derivadas[k]]
+                filas.append(en_x0[:-1])
+                valores.append(y0 - en_x0[-1])
+                log_texto += "  y" + "'" * k + f"({x0}) = {y0}\n"
 
-            soluciones_C = sp.solve(ecuaciones, self.C, dict=True)
-            
-            if soluciones_C:
-                valores_C = soluciones_C[0]
-                self.y_final_sustituida = self.y_general.subs(valores_C).doit()
-                log_texto += "\nConstantes:\n" + sp.pretty(valores_C)
-                return log_texto
+            if exacto:
+                try:
+                    solucion = list(sp.Matrix(filas).LUsolve(sp.Matrix(valores)))
+                except ValueError:
+                    return "No se encontró solución única para las constantes."
             else:
-                return "No se encontró solución única para las constantes."
+                sistema = np.array([[complex(sp.N(v)) for v in fila] for fila in filas])
+                lado_derecho = np.array([complex(sp.N(v)) for v in valores])
+                if np.linalg.matrix_rank(sistema) < self.grado:
+                    return "No se encontró solución única para las constantes."
+                solucion = [sp.Float(v.real) if abs(v.imag) < 1e-12 else sp.sympify(v)
+                            for v in np.linalg.solve(sistema, lado_derecho)]
+
+            valores_C = {c: sp.radsimp(v) if exacto else v for c, v in zip(self.C, solucion)}
+            self.y_final_sustituida = self.y_general.subs(valores_C).doit(integrals=False)
+            log_texto += "\nConstantes:\n" + sp.pretty(valores_C)
+            return log_texto
                 
         except Exception as e:
             return f"Error matemático al resolver condiciones: {e}"
 
-    def generar_grafica_tk(self, x_min=-10, x_max=10):
+    def _evaluar_en(self, expresion, x0):
+        #Integrales sin evaluar (tiempo agotado): con la misma primitiva numerica que la grafica
+        if expresion.has(sp.Integral):
+            valor = complex(evaluador.EvaluadorArbol(expresion, self.x)(np.array([float(x0)]))[0])
+            return sp.Float(valor.real) if abs(valor.imag) < 1e-12 else sp.sympify(valor)
+        return expresion.subs(self.x, x0).doit(integrals=False)
+
+    #Curvas para muchos conjuntos de condiciones (cadenas "y'(0)=1" o tuplas (orden, x0, valor)):
+    #arreglo (n_conjuntos, n_puntos) con una sola evaluacion de la base y un solo solve por lotes
+    def familia_soluciones(self, conjuntos, x_vals):
+        return familia_soluciones(self.y_general, self.C, self.x, conjuntos, x_vals)
+
+    @medir('familia')
+    def datos_familia(self, conjuntos, x_min=-10, x_max=10, puntos=500):
+        if self.y_general == 0:
+            return None, "Error: No hay solución general."
+        try:
+            x_vals = np.linspace(float(x_min), float(x_max), puntos)
+            return (x_vals, self.familia_soluciones(conjuntos, x_vals)), f"{len(conjuntos)} curvas"
+        except Exception as e:
+            return None, str(e)
+
+    #Datos (x, y) para graficar la solucion final; la figura la maneja quien llama.
+    #numerico=True (o si la solucion simbolica no se puede evaluar) usa el motor numerico
+    @medir('grafica')
+    def datos_grafica(self, x_min=-10, x_max=10, numerico=False):
+        self.grafica_numerica = False
+        if numerico:
+            return self.datos_grafica_numerica(x_min, x_max)
+
         if self.y_final_sustituida == 0:
-            return None, "Error: No hay solución final para graficar."
+            return self._respaldo_numerico(x_min, x_max, "Error: No hay solución final para graficar.")
         
         if any(c in self.y_final_sustituida.free_symbols for c in self.C):
             return None, "La solución aún contiene constantes C sin resolver."
 
-        print(f"\nGenerando gráfico de la solución final de x={x_min} a x={x_max}...")
-        
         try:
-            f_numerica = sp.lambdify(self.x, self.y_final_sustituida, 'numpy')
-            x_vals = np.linspace(float(x_min), float(x_max), 400)
-            
             try:
-                y_vals = f_numerica(x_vals)
-                if np.isscalar(y_vals) or (isinstance(y_vals, np.ndarray) and y_vals.shape != x_vals.shape):
-                     y_vals = np.full_like(x_vals, float(self.y_final_sustituida))
-            except:
-                 y_vals = np.full_like(x_vals, float(self.y_final_sustituida))
-            
-            fig = plt.figure(figsize=(6, 4), dpi=100)
-            plt.plot(x_vals, y_vals, label='y(x)')
-            plt.xlabel("x")
-            plt.ylabel("y(x)")
-            plt.title("Solución Final de la Ecuación Diferencial")
-            plt.grid(True)
-            plt.legend()
+                x_vals, y_vals = muestreo.muestrear(self.evaluar_solucion, x_min, x_max)
+            except Exception:
+                #Recorriendo el arbol de la expresion (integrales sin evaluar incluidas)
+                arbol = evaluador.EvaluadorArbol(self.y_final_sustituida, self.x)
+                x_vals, y_vals = muestreo.muestrear(arbol, x_min, x_max)
+            if not np.isfinite(y_vals).any():
+                raise ValueError("La solución no da valores finitos en el intervalo.")
             
-            return fig, "Gráfico generado con éxito"
+            return (x_vals, y_vals), "Gráfico generado con éxito"
             
         except Exception as e:
             print(f"\nError al generar el gráfico: {e}")
-            return None, str(e)
+            return self._respaldo_numerico(x_min, x_max, str(e))
+
+    #Solucion numerica con las condiciones leidas (no necesita raices ni integrales)
+    @medir('numerica')
+    def datos_grafica_numerica(self, x_min=-10, x_max=10):
+        try:
+            caracteristico = sp.Poly(self.fHomogenea, self.y)
+            datos, msg = numerico.datos_numericos(caracteristico, self.fComplementaria, self.x,
+                                         self.condiciones_iniciales, x_min, x_max)
+        except Exception as e:
+            return None, f"No se pudo calcular la solución numérica: {e}"
+        self.grafica_numerica = True
+        return datos, msg
+
+    #Funcion de Green del operador (ver green.py); se arma una vez por lado izquierdo
+    def funcion_green(self):
+        if not self.CFS:
+            self.resolver_homogenea()
+        return green.obtener(self.ir.coeficientes, tuple(self.CFS), self.x)
+
+    #Solucion por convolucion con la funcion de Green, sin integrales simbolicas.
+    #forzante: la de la ecuacion por defecto, otra expresion, una funcion numerica o
+    #un arreglo con muestras de f en una malla uniforme de x_min a x_max.
+    #Con las condiciones leidas se ajusta la homogenea; sin ellas es la particular
+    #con estado nulo en x_min.
+    @medir('green')
+    def datos_grafica_green(self, x_min=-10, x_max=10, forzante=None, puntos=2001):
+        if forzante is None:
+            forzante = self.fComplementaria
+        try:
+            datos = self.funcion_green().resolver(forzante, x_min, x_max, self.condiciones_iniciales, puntos)
+        except Exception as e:
+            return None, f"No se pudo calcular la solución con la función de Green: {e}"
+        self.grafica_numerica = True
+        if self.condiciones_iniciales:
+            return datos, "Solución por convolución con la función de Green"
+        return datos, f"Particular por convolución con la función de Green (estado nulo en x = {x_min})"
+
+    def _respaldo_numerico(self, x_min, x_max, error):
+        datos, msg = self.datos_grafica_numerica(x_min, x_max)
+        if datos is None:
+            return None, error
+        return datos, msg
+
+    #Evalua la solucion final en un arreglo; la funcion compilada queda en cache
+    def evaluar_solucion(self, x_vals):
+        if self.perfil.activo and self.y_final_sustituida not in self.evaluadores:
+            with self.perfil.etapa('lambdify') as medicion:
+                evaluador.obtener_evaluador(self.evaluadores, self.y_final_sustituida, self.x)
+                medicion.tamano(self.y_final_sustituida)
+        return evaluador.obtener_evaluador(self.evaluadores, self.y_final_sustituida, self.x)(x_vals)
+
+    def get_determinante_wronskiano(self):
+        return determinante_wronskiano(self.CFS, self.fHomogenea, self.y, self.x, self.grado)
 
     def get_solucion_general(self):
         return self.y_general
@@ -181,56 +370,16 @@ class EDOSolver:
 
 
     #Ingreso ecuacion diferencial y division en partes
+    @medir('parseo', tamano=lambda self, _: self.ir.lhs - self.ir.rhs)
     def _parsear_ecuacion(self):
-        fSplit = self.ecuacion_str.split('=') 
-        if len(fSplit) != 2:
-            raise ValueError("La ecuación debe tener un formato 'LHS = RHS'")
-        
-        self.fHomogenea = self._convertirACaracteristica(fSplit[0])
-        self.fComplementaria = self._convertirASimbolica(fSplit[1])
-        self.grado = self._obtener_exponente_maximo(self.fHomogenea)
-
-    #Transformar a expresion caracteristica
-    def _convertirACaracteristica(self, expresionDiferencial):
-        def replacer(match):
-            comillas = match.group(1)
-            orden = len(comillas)
-            return f"y**{orden}"
-        
-        patron = r"y('*)"
-        ecCaracteristica_str = re.sub(patron, replacer, expresionDiferencial)
-        
-        try:
-            transformations = (standard_transformations + (implicit_multiplication_application, convert_xor))
-            fCaracteristica = parse_expr(ecCaracteristica_str, 
-                                           local_dict={'y': self.y}, 
-                                           transformations=transformations)
-            return fCaracteristica
-        except Exception as e:
-            print(f"Error al analizar la ecuación característica: {e}")
-            raise
+        self.ir = parsear_ecuacion(self.ecuacion_str)
+        if not self.ir.lineal_constante:
+            raise ValueError("Variación de parámetros necesita una ecuación lineal de coeficientes constantes")
 
-    #Tranformacion a expresion simbolica con x
-    def _convertirASimbolica(self, expresion):
-        try:
-            transformations = (standard_transformations + (implicit_multiplication_application, convert_xor))
-
-            f_locals = {
-                'x': self.x,
-                'e': sp.exp(1) 
-            }
-
-            funcion_simbolica = parse_expr(expresion, 
-                                             local_dict=f_locals, 
-                                             transformations=transformations)
-            return funcion_simbolica
-        except Exception as e:
-            print(f"Error al analizar la función complementaria: {e}")
-            raise
-
-    #Orden mayor
-    def _obtener_exponente_maximo(self, expresion):
-        return int(degree(expresion, gen=self.y))
+        #Polinomio caracteristico en y (y**k por la k-esima derivada)
+        self.fHomogenea = sp.Poly(self.ir.coeficientes, self.y).as_expr()
+        self.fComplementaria = self.ir.forzante
+        self.grado = len(self.ir.coeficientes) - 1
         
     #Revisar multiplicidad
     def _revisarMultiplicidad(self, raicesMultiplicidad):
@@ -244,6 +393,10 @@ class EDOSolver:
             beta = sp.im(raiz)
 
             if beta != 0:
+                #Cada par conjugado se procesa desde la raiz con parte imaginaria positiva
+                #(el conjugado de sympy no siempre coincide estructuralmente con la otra raiz)
+                if beta.is_negative:
+                    continue
                 raicesProcesadas.add(raiz)
                 raicesProcesadas.add(sp.conjugate(raiz))
                 beta = abs(beta)
@@ -271,30 +424,93 @@ class EDOSolver:
                 matriz[j, i] = sp.diff(matriz[j-1, i], self.x)
         return matriz
 
-    #Hacer determinantes
-    def _hacerDeterminantesComplementaria(self, wronskiano_matriz):
-        matrizCramer = sp.zeros(self.grado, 1)
-        matrizCramer[self.grado-1, 0] = self.fComplementaria
-        
-        soluciones = wronskiano_matriz.solve(matrizCramer) 
-        return soluciones
+    #Ultima columna de W^-1: W * columna = (0, ..., 0, 1)
+    @medir('wronskiano', tamano=lambda self, columna: columna)
+    def _columnaInversaWronskiano(self):
+        if self.columna_wronskiano is None:
+            self.columna_wronskiano = columna_inversa_estructurada(
+                self.raices, self.fHomogenea, self.y, self.x, self.grado)
+        if self.columna_wronskiano is None:
+            wronskiano_matriz = self._hacerWronskiano()
+            matrizCramer = sp.zeros(self.grado, 1)
+            matrizCramer[self.grado-1, 0] = 1
+            self.columna_wronskiano = wronskiano_matriz.solve(matrizCramer)
+        return self.columna_wronskiano
 
-    #Integrar para obtener U1, U2, ..., Un
-    def _integrarObtenerU(self, matrizSoluciones):
+    #Hacer determinantes (u_k' = columna_k * f / a_n); la columna es la de W^-1,
+    #que no depende del coeficiente principal
+    def _hacerDeterminantesComplementaria(self, columna, fComplementaria):
+        return columna * (fComplementaria / self.ir.coeficientes[0])
+
+    #Superposicion: u_k = sum_g integral(columna_k * f_g) para cada grupo de terminos
+    #de la forzante (ver superposicion.py). Los grupos ya integrados para este
+    #operador salen de la cache; los demas se integran juntos (en un solo pool con paralelo)
+    def _integrarPorTerminos(self, columna, fComplementaria):
         matrizU = sp.zeros(self.grado, 1)
-        for i in range(self.grado):
-            integralSinLimpiar = matrizSoluciones[i, 0]
-            integralLimpia = integralSinLimpiar.subs(sp.E, sp.exp(1))
-            integralLimpia = sp.integrate(integralLimpia, self.x)
-            integralLimpia = integralLimpia.doit()
-            #integralLimpia = sp.exptrigsimp(integralLimpia)
-            integralLimpia = sp.simplify(integralLimpia)
-            #integralLimpia = sp.expand(integralLimpia)
+        pendientes = []
+        with self.perfil.etapa('cache'):
+            for _, grupo in agrupar_terminos(fComplementaria, self.x):
+                clave = clave_termino('variacion', self.fHomogenea, grupo, self.motor_raices, self.simplificacion)
+                guardado = cache_terminos.obtener(clave)
+                if guardado is None:
+                    pendientes.append((clave, grupo))
+                else:
+                    matrizU += guardado['U']
+
+        self.rutas_integracion = []
+        if not pendientes:
+            return matrizU
+
+        determinantes = [self._hacerDeterminantesComplementaria(columna, grupo) for _, grupo in pendientes]
+        integradas = self._integrarObtenerU(sp.Matrix.vstack(*determinantes))
+        for j, (clave, _) in enumerate(pendientes):
+            bloque = integradas[j * self.grado:(j + 1) * self.grado, :]
+            #Las integrales cortadas por tiempo no se guardan
+            if 'tiempo_agotado' not in self.rutas_integracion[j * self.grado:(j + 1) * self.grado]:
+                cache_terminos.guardar(clave, {'U': bloque})
+            matrizU += bloque
+        return matrizU
+
+    #Integrar para obtener U1, U2, ..., Un (una fila por integral)
+    def _integrarObtenerU(self, matrizSoluciones):
+        matrizU = sp.zeros(matrizSoluciones.rows, 1)
+        integrandos = [matrizSoluciones[i, 0].subs(sp.E, sp.exp(1)) for i in range(matrizSoluciones.rows)]
+
+        #Ruta por tabla para x^k e^{ax} {cos,sin}(bx); sp.integrate solo para el resto
+        if self.paralelo:
+            with self.perfil.etapa('integracion') as medicion:
+                resultados = integrar_en_paralelo(integrandos, self.x, tiempo_limite=self.tiempo_limite)
+                medicion.tamano([r for r, _ in resultados])
+        else:
+            resultados = []
+            for integrando in integrandos:
+                with self.perfil.etapa('integracion') as medicion:
+                    resultados.append(integrar(integrando, self.x))
+                    medicion.tamano(resultados[-1][0])
+
+        self.rutas_integracion = []
+        #Un solo presupuesto de simplify para todas las u_k
+        presupuesto = Presupuesto()
+        for i, (integralLimpia, ruta) in enumerate(resultados):
+            self.rutas_integracion.append(ruta)
+            #La ruta por tabla ya da la forma final
+            if ruta in ('mixta', 'sympy'):
+                with self.perfil.etapa('simplificacion') as medicion:
+                    integralLimpia = simplificar(integralLimpia, self.x, nivel=self.simplificacion,
+                                                 presupuesto=presupuesto)
+                    medicion.tamano(integralLimpia)
             matrizU[i, 0] = integralLimpia
         return matrizU
 
     #Sustituir en U
-    def _sustitucionU(self):
-        soluciones = list(zip(self.U, self.matriz_U_integrada))
+    @medir('sustitucion', tamano=lambda self, y_p: y_p)
+    def _sustitucionU(self, matriz_U_integrada):
+        soluciones = list(zip(self.U, matriz_U_integrada))
         solucionParticularEvaluada = self.solucionParticular_u.subs(soluciones)
-        return solucionParticularEvaluada
\ No newline at end of file
+        return solucionParticularEvaluada
+
+
+#Lote de funciones complementarias contra un mismo operador (lado izquierdo)
+def resolver_lote(lhs, funciones):
+    solver = EDOSolver(f"{lhs} = 0")
+    yield from solver.resolver_lote(funciones)
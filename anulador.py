@@ -0,0 +1,186 @@
+import sympy as sp
+from sympy import Derivative
+
+from terminos import terminos_aditivos, descomponer_termino
+
+
+#Metodo del anulador para L[y] = f con coeficientes constantes y f en la familia
+#x^k e^{ax} {cos,sin}(bx). Todas las funciones devuelven None cuando la ecuacion
+#queda fuera de esa clase, para que el llamador use dsolve.
+
+
+#Separar  ecuacion = 0  en el polinomio caracteristico p(r) y la forzante f
+def separar_operador(ecuacion, y_func, x, r):
+    ecuacion = sp.expand(ecuacion)
+
+    marcadores = {}
+    reemplazos = {}
+    for d in ecuacion.atoms(Derivative):
+        if d.expr != y_func or any(v != x for v in d.variables):
+            return None
+        orden = len(d.variables)
+        marcadores[orden] = sp.Dummy(f"d{orden}")
+        reemplazos[d] = marcadores[orden]
+    marcadores[0] = sp.Dummy("d0")
+    reemplazos[y_func] = marcadores[0]
+
+    sustituida = ecuacion.xreplace(reemplazos)
+    if sustituida.has(y_func.func):
+        return None
+
+    ordenes = sorted(marcadores)
+    try:
+        polinomio = sp.Poly(sustituida, *[marcadores[k] for k in ordenes])
+    except sp.PolynomialError:
+        return None
+    if polinomio.total_degree() > 1:
+        return None
+
+    caracteristico = 0
+    for k in ordenes:
+        monomio = [0] * len(ordenes)
+        monomio[ordenes.index(k)] = 1
+        coeficiente = polinomio.coeff_monomial(tuple(monomio))
+        if coeficiente.has(x):
+            return None
+        caracteristico += coeficiente * r**k
+
+    forzante = -polinomio.coeff_monomial(tuple([0] * len(ordenes)))
+    caracteristico = sp.Poly(caracteristico, r)
+    if caracteristico.degree() < 1:
+        return None
+    return caracteristico, forzante
+
+
+#Base de la homogenea a partir de las raices de p(r)
+def base_homogenea(caracteristico, x):
+    raices = sp.roots(caracteristico)
+    if sum(raices.values()) != caracteristico.degree():
+        return None
+
+    base = []
+    for raiz, multiplicidad in raices.items():
+        alfa = sp.re(raiz)
+        beta = sp.im(raiz)
+        if beta != 0:
+            if beta.is_negative:
+                continue
+            for i in range(multiplicidad):
+                base.append((x**i) * sp.exp(alfa * x) * sp.cos(beta * x))
+                base.append((x**i) * sp.exp(alfa * x) * sp.sin(beta * x))
+        else:
+            for i in range(multiplicidad):
+                base.append((x**i) * sp.exp(alfa * x))
+
+    if len(base) != caracteristico.degree():
+        return None
+    return base
+
+
+#Solucion particular por coeficientes indeterminados, una familia (a, b) a la vez
+def solucion_particular(caracteristico, forzante, x):
+    familias = {}
+    for termino in terminos_aditivos(forzante, x):
+        if termino == 0:
+            continue
+        partes = descomponer_termino(termino, x)
+        if partes is None:
+            return None
+        coeficiente, k, a, b, tipo, fase = partes
+        if tipo is not None and b == 0:
+            coeficiente *= sp.cos(fase) if tipo == 'cos' else sp.sin(fase)
+            tipo = None
+        #sin(-bx + fase) = -sin(bx - fase),  cos(-bx + fase) = cos(bx - fase)
+        if b.is_negative:
+            b, fase = -b, -fase
+            if tipo == 'sin':
+                coeficiente = -coeficiente
+
+        #Sin el factor e^{ax}: polinomio en x por cos(bx) y sin(bx)
+        if tipo is None:
+            parte = coeficiente * x**k
+        elif tipo == 'cos':
+            parte = coeficiente * x**k * (sp.cos(fase) * sp.cos(b * x) - sp.sin(fase) * sp.sin(b * x))
+        else:
+            parte = coeficiente * x**k * (sp.cos(fase) * sp.sin(b * x) + sp.sin(fase) * sp.cos(b * x))
+
+        grado, suma = familias.get((a, b), (0, 0))
+        familias[(a, b)] = (max(grado, k), suma + parte)
+
+    y_p = 0
+    for (a, b), (grado, parte) in familias.items():
+        familia = _particular_familia(caracteristico, a, b, grado, parte, x)
+        if familia is None:
+            return None
+        y_p += familia
+    return y_p
+
+
+def multiplicidad_raiz(caracteristico, raiz):
+    multiplicidad = 0
+    derivada = caracteristico
+    while not derivada.is_zero and _es_cero(derivada.eval(raiz)):
+        multiplicidad += 1
+        derivada = derivada.diff()
+    return multiplicidad
+
+
+#Constantes por sistema lineal: cada condicion es (orden, x0, valor)
+def aplicar_condiciones(y_general, constantes, condiciones, x):
+    ecuaciones = []
+    for orden, x0, valor in condiciones:
+        ecuaciones.append(sp.diff(y_general, x, orden).subs(x, x0) - valor)
+
+    soluciones = sp.linsolve(ecuaciones, constantes)
+    if not soluciones:
+        return None
+    valores = dict(zip(constantes, next(iter(soluciones))))
+    return y_general.subs(valores)
+
+
+#Prueba  x^s e^{ax} (P(x) cos(bx) + Q(x) sin(bx))  con s = multiplicidad de a + ib.
+#Como L[e^{ax} u] = e^{ax} p(D + a)[u], se trabaja sin la exponencial.
+def _particular_familia(caracteristico, a, b, grado, parte, x):
+    s = multiplicidad_raiz(caracteristico, a + sp.I * b)
+
+    r = caracteristico.gen
+    desplazado = sp.Poly(caracteristico.as_expr().subs(r, r + a), r)
+
+    A = sp.symbols(f"A0:{grado + 1}", cls=sp.Dummy)
+    B = sp.symbols(f"B0:{grado + 1}", cls=sp.Dummy) if b != 0 else ()
+    P = sum(A[j] * x**j for j in range(grado + 1))
+    if b != 0:
+        Q = sum(B[j] * x**j for j in range(grado + 1))
+        prueba = x**s * (P * sp.cos(b * x) + Q * sp.sin(b * x))
+    else:
+        prueba = x**s * P
+
+    derivadas = [prueba]
+    for _ in range(desplazado.degree()):
+        derivadas.append(sp.diff(derivadas[-1], x))
+    aplicado = sum(coeficiente * derivadas[k] for (k,), coeficiente in desplazado.terms())
+
+    residuo = sp.expand(aplicado - parte)
+    generadores = [x] + ([sp.cos(b * x), sp.sin(b * x)] if b != 0 else [])
+    try:
+        ecuaciones = sp.Poly(residuo, *generadores).coeffs()
+    except sp.PolynomialError:
+        return None
+
+    incognitas = list(A) + list(B)
+    soluciones = sp.linsolve(ecuaciones, incognitas)
+    if not soluciones:
+        return None
+    valores = dict(zip(incognitas, next(iter(soluciones))))
+    #Las incognitas libres (si las hubiera) se anulan
+    familia = prueba.subs(valores).subs({c: 0 for c in incognitas})
+    return sp.exp(a * x) * sp.expand(familia)
+
+
+def _es_cero(valor):
+    valor = sp.expand(valor)
+    if valor == 0:
+        return True
+    if valor.is_number:
+        return abs(sp.N(valor)) < 1e-10
+    return False
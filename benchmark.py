@@ -0,0 +1,292 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from procesos import terminar_procesos
+
+
+#Benchmark de los dos motores (Variacion de Parametros y Coeficientes
+#Indeterminados) sobre el corpus versionado de corpus_edo.json.
+#Cada caso se resuelve con cada motor en un proceso aparte con limite de tiempo,
+#con las caches de sympy y del parser vacias en cada repeticion. Se guarda el
+#mejor tiempo, el tiempo por etapa (perfilado.py), el pico de memoria
+#(tracemalloc, en una corrida aparte) y si las dos respuestas coinciden.
+#
+#  python benchmark.py --guardar            escribe benchmark_base.json
+#  python benchmark.py --comparar           compara contra esa base; sale con 1 si hay regresiones
+#
+#La base no se versiona porque los tiempos dependen de la maquina: se genera una
+#vez con --guardar (en el commit de referencia) y despues se compara con --comparar.
+#Los casos con la etiqueta 'lento' (no terminan en minutos) solo corren con
+#--lentos o si el filtro los nombra; un caso puede fijar su propio
+#"tiempo_limite" y al pasarlo se informa como tiempo_agotado.
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_CORPUS = os.path.join(DIRECTORIO, "corpus_edo.json")
+ARCHIVO_BASE = os.path.join(DIRECTORIO, "benchmark_base.json")
+
+MOTORES = ("variacion", "indeterminados")
+
+#Diferencias por debajo de esto se consideran ruido aunque superen el umbral relativo
+MINIMO_SEGUNDOS = 0.02
+TOLERANCIA_ACUERDO = 1e-6
+
+
+def cargar_json(archivo):
+    with open(archivo, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _vaciar_caches():
+    from sympy.core.cache import clear_cache
+    from parser_edo import _parsear_ecuacion, parsear_condicion, parsear_expresion
+    from superposicion import cache_terminos
+    clear_cache()
+    for funcion in (_parsear_ecuacion, parsear_condicion, parsear_expresion):
+        funcion.cache_clear()
+    cache_terminos.limpiar()
+
+
+#Una resolucion completa con el motor pedido; devuelve (solver, expresion final)
+def _resolver(motor, caso, perfil):
+    condiciones = caso.get("condiciones") or []
+    if motor == "variacion":
+        from MetodoVariacionParametros import EDOSolver
+        solver = EDOSolver(caso["ecuacion"], perfil=perfil)
+        solver.resolver()
+        if condiciones:
+            mensaje = solver.gestionar_condiciones_iniciales(condiciones)
+            if any(c in solver.get_solucion_final().free_symbols for c in solver.C):
+                raise ValueError(mensaje)
+        return solver, solver.get_solucion_final()
+
+    from CoefIndet import CoefIndet
+    solver = CoefIndet(caso["ecuacion"], perfil=perfil)
+    if condiciones:
+        solver.agregar_CI(condiciones)
+    solver.resolver()
+    if solver.sol is None:
+        raise ValueError("dsolve no devolvió solución")
+    return solver, solver.sol.rhs
+
+
+#Corre en el proceso hijo: repeticiones en frio y una corrida con tracemalloc
+def _medir(motor, caso, repeticiones, memoria):
+    import io
+    import contextlib
+    from perfilado import Perfil
+
+    mejor = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticiones):
+            _vaciar_caches()
+            perfil = Perfil(caso["id"])
+            inicio = time.perf_counter()
+            solver, expresion = _resolver(motor, caso, perfil)
+            segundos = time.perf_counter() - inicio
+            if mejor is None or segundos < mejor[0]:
+                mejor = (segundos, perfil)
+
+        pico = None
+        if memoria:
+            _vaciar_caches()
+            tracemalloc.start()
+            try:
+                _resolver(motor, caso, Perfil(caso["id"]))
+                pico = tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+
+    segundos, perfil = mejor
+    etapas = {e.nombre: round(e.propio, 6) for e in perfil.reporte().etapas}
+    return {
+        "estado": "ok",
+        "segundos": round(segundos, 6),
+        "etapas": etapas,
+        "memoria_kb": None if pico is None else round(pico, 1),
+        "solucion": str(expresion),
+        "_expresion": expresion,
+    }
+
+
+def medir_caso(motor, caso, repeticiones=3, tiempo_limite=60.0, memoria=True):
+    executor = ProcessPoolExecutor(max_workers=1)
+    futuro = executor.submit(_medir, motor, caso, repeticiones, memoria)
+    try:
+        resultado = futuro.result(timeout=tiempo_limite)
+    except TimeoutError:
+        terminar_procesos(executor)
+        return {"estado": "tiempo_agotado", "segundos": None}
+    except Exception as e:
+        executor.shutdown()
+        return {"estado": "error", "segundos": None, "error": f"{type(e).__name__}: {e}"}
+    executor.shutdown()
+    return resultado
+
+
+#Valores en los puntos; con integrales sin evaluar, recorriendo el arbol (evaluador.py)
+def _evaluar(expresion, puntos):
+    import sympy as sp
+    from parser_edo import X
+    if expresion.has(sp.Integral):
+        from evaluador import EvaluadorArbol
+        return [complex(v) for v in EvaluadorArbol(expresion, X)(puntos)]
+    return [complex(sp.N(expresion.subs(X, p))) for p in puntos]
+
+
+#Las dos respuestas coinciden si, con condiciones, dan los mismos valores; sin
+#condiciones (constantes libres) si las dos cumplen la ecuacion en los puntos.
+#Devuelve (acuerdo, diferencia) o (None, motivo) si no se pudo evaluar.
+def comparar_respuestas(caso, expresiones, puntos):
+    import sympy as sp
+    from parser_edo import X, Y, parsear_ecuacion
+
+    try:
+        if caso.get("condiciones"):
+            valores = [_evaluar(e, puntos) for e in expresiones]
+            diferencia = max(abs(a - b) / max(1.0, abs(a)) for a, b in zip(*valores))
+        else:
+            ir = parsear_ecuacion(caso["ecuacion"])
+            ecuacion = ir.lhs - ir.rhs
+            #La escala con la forzante: el lado derecho escrito puede tener y
+            forzante = ir.forzante if ir.lineal_constante else ir.rhs
+            diferencia = 0.0
+            for expresion in expresiones:
+                constantes = {s: 1 for s in expresion.free_symbols if s != X}
+                residuo = ecuacion.subs(Y, expresion.subs(constantes)).doit()
+                escala = max(1.0, max(abs(complex(sp.N(forzante.subs(X, p)))) for p in puntos))
+                diferencia = max(diferencia, max(abs(v) for v in _evaluar(residuo, puntos)) / escala)
+    except Exception as e:
+        return None, f"no se pudo evaluar: {type(e).__name__}"
+    return diferencia <= TOLERANCIA_ACUERDO, diferencia
+
+
+def ejecutar(corpus, repeticiones, tiempo_limite, memoria, filtro=None, avisar=print, lentos=False):
+    resultados = {}
+    for caso in corpus["casos"]:
+        if filtro and filtro not in caso["id"] and filtro not in caso.get("etiquetas", []):
+            continue
+        if "lento" in caso.get("etiquetas", []) and not lentos and filtro != caso["id"]:
+            continue
+        limite = caso.get("tiempo_limite", tiempo_limite)
+        por_motor = {}
+        for motor in MOTORES:
+            por_motor[motor] = medir_caso(motor, caso, repeticiones, limite, memoria)
+
+        expresiones = [r.pop("_expresion") for r in por_motor.values() if "_expresion" in r]
+        acuerdo, diferencia = (None, "falta una respuesta")
+        if len(expresiones) == len(MOTORES):
+            acuerdo, diferencia = comparar_respuestas(caso, expresiones, corpus.get("puntos", [0.5]))
+        resultados[caso["id"]] = {"motores": por_motor, "acuerdo": acuerdo, "diferencia": diferencia}
+        avisar(_linea_caso(caso["id"], resultados[caso["id"]]))
+    return resultados
+
+
+def _linea_caso(nombre, resultado):
+    columnas = []
+    for motor in MOTORES:
+        r = resultado["motores"][motor]
+        if r["estado"] == "ok":
+            memoria = "" if r.get("memoria_kb") is None else f" {r['memoria_kb'] / 1024:.1f}MB"
+            columnas.append(f"{r['segundos']:>8.3f}s{memoria:>8}")
+        else:
+            columnas.append(f"{r['estado']:>17}")
+    acuerdo = {True: "sí", False: "NO", None: "-"}[resultado["acuerdo"]]
+    return f"{nombre:<18}{columnas[0]:>19}{columnas[1]:>19}{acuerdo:>8}"
+
+
+#Regresiones: mas lento que la base por encima del umbral (y de MINIMO_SEGUNDOS),
+#un motor que dejo de resolver o respuestas que dejaron de coincidir
+def comparar(base, resultados, umbral):
+    regresiones = []
+    for nombre, resultado in resultados.items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            continue
+        for motor in MOTORES:
+            antes = anterior["motores"].get(motor, {})
+            ahora = resultado["motores"][motor]
+            if antes.get("estado") == "ok" and ahora["estado"] != "ok":
+                regresiones.append(f"{nombre}/{motor}: {antes['estado']} -> {ahora['estado']}")
+                continue
+            if antes.get("estado") != "ok" or ahora["estado"] != "ok":
+                continue
+            t0, t1 = antes["segundos"], ahora["segundos"]
+            if t1 > t0 * (1 + umbral) and t1 - t0 > MINIMO_SEGUNDOS:
+                peores = sorted(((ahora["etapas"].get(e, 0) - antes["etapas"].get(e, 0), e)
+                                 for e in ahora["etapas"]), reverse=True)
+                detalle = ", ".join(f"{e} +{d:.3f}s" for d, e in peores[:2] if d > 0)
+                regresiones.append(f"{nombre}/{motor}: {t0:.3f}s -> {t1:.3f}s "
+                                   f"(+{100 * (t1 / t0 - 1):.0f}%){'; ' + detalle if detalle else ''}")
+        if anterior.get("acuerdo") is True and resultado["acuerdo"] is False:
+            regresiones.append(f"{nombre}: las respuestas de los dos motores ya no coinciden")
+    return regresiones
+
+
+def _entorno():
+    import sympy
+    return {"python": platform.python_version(), "sympy": sympy.__version__, "plataforma": platform.platform()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los dos motores sobre el corpus de EDOs")
+    parser.add_argument("--corpus", default=ARCHIVO_CORPUS)
+    parser.add_argument("-r", "--repeticiones", type=int, default=3)
+    parser.add_argument("-t", "--tiempo-limite", type=float, default=60.0,
+                        help="segundos máximos por caso y motor")
+    parser.add_argument("-f", "--filtro", help="solo los casos con este id o etiqueta")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir memoria con tracemalloc")
+    parser.add_argument("--lentos", action="store_true", help="incluir los casos con la etiqueta 'lento'")
+    parser.add_argument("--guardar", nargs="?", const=ARCHIVO_BASE, metavar="ARCHIVO",
+                        help="guardar los resultados como base")
+    parser.add_argument("--comparar", nargs="?", const=ARCHIVO_BASE, metavar="ARCHIVO",
+                        help="comparar contra una base guardada")
+    parser.add_argument("--umbral", type=float, default=0.25,
+                        help="aumento relativo de tiempo que cuenta como regresión")
+    args = parser.parse_args()
+
+    corpus = cargar_json(args.corpus)
+    base = None
+    if args.comparar:
+        if not os.path.exists(args.comparar):
+            parser.error(f"no existe la base {args.comparar}; generela primero con "
+                         f"'python benchmark.py --guardar' en el commit de referencia")
+        base = cargar_json(args.comparar)
+        if base.get("version_corpus") != corpus["version"]:
+            parser.error(f"la base es de la versión {base.get('version_corpus')} del corpus "
+                         f"y el corpus es la versión {corpus['version']}; vuelva a guardarla")
+
+    print(f"{'caso':<18}{'variación':>19}{'indeterminados':>19}{'acuerdo':>8}")
+    resultados = ejecutar(corpus, args.repeticiones, args.tiempo_limite, not args.sin_memoria, args.filtro,
+                          lentos=args.lentos)
+
+    if args.guardar:
+        datos = {
+            "version_corpus": corpus["version"],
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "entorno": _entorno(),
+            "repeticiones": args.repeticiones,
+            "resultados": resultados,
+        }
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nBase guardada en {args.guardar}")
+
+    if base is not None:
+        regresiones = comparar(base, resultados, args.umbral)
+        if regresiones:
+            print(f"\nRegresiones respecto de {args.comparar} (umbral {args.umbral:.0%}):")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            sys.exit(1)
+        print(f"\nSin regresiones respecto de {args.comparar}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from diferido import importar_diferido
+
+#sympy se carga con la primera clave (la interfaz usa la cache antes de resolver)
+sp = importar_diferido('sympy')
+
+
+#Clave canonica: las expresiones se expanden y se serializan con srepr,
+#asi "y''+y=x" y "y'' + 1*y = x" producen la misma clave
+def clave_canonica(*partes):
+    clave = []
+    for parte in partes:
+        if isinstance(parte, sp.Basic):
+            clave.append(sp.srepr(sp.expand(parte)))
+        elif isinstance(parte, (list, tuple)):
+            clave.append(clave_canonica(*parte))
+        else:
+            clave.append(parte)
+    return tuple(clave)
+
+
+class CacheSoluciones:
+
+    def __init__(self, max_entradas=256, directorio=None, max_bytes_disco=64 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.directorio = directorio
+        self.max_bytes_disco = max_bytes_disco
+
+        self._memoria = OrderedDict()
+
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+
+        if self.directorio:
+            os.makedirs(self.directorio, exist_ok=True)
+
+    def obtener(self, clave):
+        #Nivel 1: memoria (LRU)
+        if clave in self._memoria:
+            self._memoria.move_to_end(clave)
+            self.aciertos += 1
+            return dict(self._memoria[clave])
+
+        #Nivel 2: disco
+        valor = self._leer_disco(clave)
+        if valor is not None:
+            self.aciertos += 1
+            self.aciertos_disco += 1
+            self._guardar_memoria(clave, valor)
+            return dict(valor)
+
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor):
+        self._guardar_memoria(clave, dict(valor))
+        if self.directorio:
+            self._escribir_disco(clave, valor)
+
+    def limpiar(self, disco=False):
+        self._memoria.clear()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        if disco and self.directorio:
+            for ruta, _, _ in self._archivos_disco():
+                os.remove(ruta)
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "aciertos_disco": self.aciertos_disco,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+            "entradas_memoria": len(self._memoria),
+        }
+
+    def __len__(self):
+        return len(self._memoria)
+
+    def __contains__(self, clave):
+        return clave in self._memoria or (self.directorio is not None and os.path.exists(self._ruta(clave)))
+
+    def _guardar_memoria(self, clave, valor):
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_entradas:
+            self._memoria.popitem(last=False)
+
+    def _ruta(self, clave):
+        nombre = hashlib.sha256(repr(clave).encode("utf-8")).hexdigest()
+        return os.path.join(self.directorio, nombre + ".pkl")
+
+    def _leer_disco(self, clave):
+        if not self.directorio:
+            return None
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as archivo:
+                clave_guardada, valor = pickle.load(archivo)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return None
+        #Colision de hash o archivo ajeno
+        if clave_guardada != clave:
+            return None
+        #Marcar como usado recientemente para la expulsion por tamaño
+        os.utime(ruta)
+        return valor
+
+    def _escribir_disco(self, clave, valor):
+        ruta = self._ruta(clave)
+        temporal = ruta + ".tmp"
+        try:
+            with open(temporal, "wb") as archivo:
+                pickle.dump((clave, dict(valor)), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"No se pudo guardar la solución en disco: {e}")
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            return
+        self._expulsar_disco()
+
+    def _archivos_disco(self):
+        archivos = []
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(".pkl"):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                info = os.stat(ruta)
+            except OSError:
+                continue
+            archivos.append((ruta, info.st_mtime, info.st_size))
+        return archivos
+
+    #Expulsion por tamaño: se borran primero los menos usados recientemente
+    def _expulsar_disco(self):
+        archivos = self._archivos_disco()
+        total = sum(tamaño for _, _, tamaño in archivos)
+        if total <= self.max_bytes_disco:
+            return
+        for ruta, _, tamaño in sorted(archivos, key=lambda a: a[1]):
+            try:
+                os.remove(ruta)
+            except OSError:
+                continue
+            total -= tamaño
+            if total <= self.max_bytes_disco:
+                break
+
+
+#Cache compartida por la interfaz y los scripts
+cache_global = CacheSoluciones()
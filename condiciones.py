@@ -0,0 +1,87 @@
+import sympy as sp
+
+from diferido import importar_diferido
+from parser_edo import parsear_condicion
+
+np = importar_diferido('numpy')
+evaluador = importar_diferido('evaluador')
+
+
+#Condiciones iniciales de la forma  y''(x0) = valor  y su aplicacion a una
+#solucion general  y = sum(c_i * base_i) + particular, lineal en las constantes.
+
+#"y''(0)=1" -> (2, 0.0, 1.0); con exacto=True los numeros quedan como racionales
+#(x0 y valor admiten expresiones constantes como pi/2)
+def leer_condicion(cadena, exacto=False):
+    try:
+        orden, x0, valor = parsear_condicion(cadena.strip())
+    except ValueError:
+        raise ValueError(f"Formato inválido en: '{cadena}'. Use formato y''(0)=1")
+    if not (x0.is_number and valor.is_number):
+        raise ValueError(f"Error al leer números en: {cadena}")
+    try:
+        if exacto:
+            return orden, sp.nsimplify(x0, rational=True), sp.nsimplify(valor, rational=True)
+        return orden, float(x0), float(valor)
+    except (ValueError, TypeError):
+        raise ValueError(f"Error al leer números en: {cadena}")
+
+
+def separar_constantes(y_general, constantes):
+    base = [y_general.coeff(c) for c in constantes]
+    particular = y_general.subs({c: 0 for c in constantes})
+    return base, particular
+
+
+#[expresiones, sus derivadas, ...] hasta el orden pedido, cada nivel a partir del anterior
+def derivadas_sucesivas(expresiones, x, orden):
+    derivadas = [list(expresiones)]
+    for _ in range(orden):
+        derivadas.append([sp.diff(e, x) for e in derivadas[-1]])
+    return derivadas
+
+
+#Curvas y(x) para muchos conjuntos de condiciones a la vez.
+#La base y la particular se evaluan una sola vez en la malla y en los puntos x0;
+#todas las constantes salen de una sola resolucion por lotes.
+#Devuelve un arreglo (n_conjuntos, n_puntos).
+def familia_soluciones(y_general, constantes, x, conjuntos, x_vals):
+    x_vals = np.asarray(x_vals, dtype=float)
+    n = len(constantes)
+    if n == 0:
+        raise ValueError("La solución no tiene constantes libres.")
+
+    conjuntos = [[c if isinstance(c, tuple) else leer_condicion(c) for c in conjunto]
+                 for conjunto in conjuntos]
+    for conjunto in conjuntos:
+        if len(conjunto) != n:
+            raise ValueError(f"Cada conjunto necesita {n} condiciones, uno tiene {len(conjunto)}.")
+    if not conjuntos:
+        return np.empty((0, len(x_vals)))
+
+    base, particular = separar_constantes(y_general, constantes)
+    ordenes = sorted({k for conjunto in conjuntos for k, _, _ in conjunto})
+    derivadas = derivadas_sucesivas(base + [particular], x, ordenes[-1])
+
+    #Valores de (base, particular) y sus derivadas en todos los x0 distintos
+    puntos = sorted({float(x0) for conjunto in conjuntos for _, x0, _ in conjunto})
+    indice = {p: i for i, p in enumerate(puntos)}
+    en_puntos = {k: evaluador.compilar_lista(derivadas[k], x)(puntos) for k in ordenes}
+    es_complejo = any(np.iscomplexobj(v) for v in en_puntos.values())
+
+    tipo = complex if es_complejo else float
+    sistemas = np.empty((len(conjuntos), n, n), dtype=tipo)
+    lados = np.empty((len(conjuntos), n), dtype=tipo)
+    for s, conjunto in enumerate(conjuntos):
+        for i, (k, x0, valor) in enumerate(conjunto):
+            columna = en_puntos[k][:, indice[float(x0)]]
+            sistemas[s, i] = columna[:n]
+            lados[s, i] = float(valor) - columna[n]
+
+    #En punto flotante un sistema singular (y(0), y(pi)) rara vez es exactamente singular
+    if np.any(np.linalg.matrix_rank(sistemas) < n):
+        raise ValueError("Algún conjunto de condiciones no determina las constantes.")
+    constantes_num = np.linalg.solve(sistemas, lados[..., None])[..., 0]
+
+    en_malla = evaluador.compilar_lista(base + [particular], x)(x_vals)
+    return constantes_num @ en_malla[:n] + en_malla[n]
@@ -0,0 +1,26 @@
+import importlib
+
+
+#Modulo que se importa la primera vez que se usa uno de sus atributos.
+#Sirve para que numpy, matplotlib y los modulos numericos no se carguen al
+#arrancar la interfaz o al resolver desde consola sin graficar.
+class ModuloDiferido:
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nombre)
+        valor = getattr(self._modulo, atributo)
+        #Los siguientes accesos ya no pasan por __getattr__
+        setattr(self, atributo, valor)
+        return valor
+
+    def __repr__(self):
+        estado = "cargado" if self._modulo is not None else "sin cargar"
+        return f"<modulo diferido {self._nombre!r} ({estado})>"
+
+
+def importar_diferido(nombre):
+    return ModuloDiferido(nombre)
@@ -0,0 +1,105 @@
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from procesos import terminar_procesos
+
+
+NOMBRES_METODOS = {
+    "variacion": "Variación de Parámetros",
+    "indeterminados": "Coeficientes Indeterminados",
+}
+
+
+#Metodo mas barato para la ecuacion, sin resolver nada (se llama en el hilo de Tk):
+#  - forzante en la familia x^k e^{ax} {cos,sin}(bx) -> coeficientes indeterminados (anulador)
+#  - operador lineal de coeficientes constantes con otra forzante (tan, ln, ...) -> variacion
+#  - cualquier otra cosa (coeficientes variables, no lineal) -> dsolve via CoefIndet
+def elegir_metodo(ecuacion):
+    from parser_edo import X, parsear_ecuacion
+    from superposicion import agrupar_terminos, es_familia
+    ir = parsear_ecuacion(ecuacion)
+    if not ir.lineal_constante:
+        return "indeterminados"
+    if all(es_familia(tipo) for tipo, _ in agrupar_terminos(ir.forzante, X)):
+        return "indeterminados"
+    return "variacion"
+
+
+#(primero, segundo): el elegido y el de respaldo
+def orden_metodos(ecuacion):
+    primero = elegir_metodo(ecuacion)
+    return primero, "variacion" if primero == "indeterminados" else "indeterminados"
+
+
+#Resolver con el metodo elegido y, si falla o se pasa de tiempo, con el otro.
+#Devuelve (metodo que respondio, solver). avisar(texto) recibe el progreso.
+#perfil (perfilado.Perfil) mide la eleccion del metodo y las etapas del solver.
+#tiempo_limite: segundos por metodo; cada intento corre en su propio proceso
+def resolver_automatico(ecuacion, condiciones=None, tiempo_limite=None, cache=None, avisar=None, perfil=None):
+    if perfil is not None:
+        with perfil.etapa('enrutado'):
+            primero, segundo = orden_metodos(ecuacion)
+    else:
+        primero, segundo = orden_metodos(ecuacion)
+
+    errores = []
+    for metodo in (primero, segundo):
+        if avisar is not None:
+            if errores:
+                avisar(f"Falló {errores[-1]}; probando {NOMBRES_METODOS[metodo]}...")
+            else:
+                avisar(f"Método elegido: {NOMBRES_METODOS[metodo]}...")
+        try:
+            if tiempo_limite is None:
+                solver = resolver_con_metodo(metodo, ecuacion, condiciones, cache, perfil)
+            else:
+                solver = _resolver_con_limite(metodo, ecuacion, condiciones, tiempo_limite, perfil)
+                if cache is not None and solver.solucion_guardable():
+                    cache.guardar(solver.clave_cache(), solver.estado_solucion())
+        except TimeoutError:
+            errores.append(f"{metodo}: tiempo agotado ({tiempo_limite} s)")
+            continue
+        except Exception as e:
+            errores.append(f"{metodo}: {e}")
+            continue
+        return metodo, solver
+
+    raise ValueError("Ningún método pudo resolver la ecuación. " + "; ".join(errores))
+
+
+def resolver_con_metodo(metodo, ecuacion, condiciones=None, cache=None, perfil=None):
+    if metodo == "variacion":
+        from MetodoVariacionParametros import EDOSolver
+        solver = EDOSolver(ecuacion, perfil=perfil)
+        solver.resolver(cache=cache)
+        if condiciones:
+            log = solver.gestionar_condiciones_iniciales(condiciones)
+            if any(c in solver.get_solucion_final().free_symbols for c in solver.C):
+                raise ValueError(log)
+        return solver
+
+    from CoefIndet import CoefIndet
+    solver = CoefIndet(ecuacion, perfil=perfil)
+    if condiciones:
+        solver.agregar_CI(condiciones)
+    solver.resolver(cache=cache)
+    return solver
+
+
+#Expresion final de cualquiera de los dos solvers
+def obtener_solucion(solver):
+    if hasattr(solver, "get_solucion_final"):
+        return solver.get_solucion_final()
+    return solver.sol.rhs if solver.sol is not None else None
+
+
+#El perfil viaja copiado al proceso; el medido vuelve en solver.perfil
+def _resolver_con_limite(metodo, ecuacion, condiciones, tiempo_limite, perfil=None):
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        futuro = executor.submit(resolver_con_metodo, metodo, ecuacion, condiciones, None, perfil)
+        return futuro.result(timeout=tiempo_limite)
+    except TimeoutError:
+        terminar_procesos(executor)
+        raise
+    finally:
+        executor.shutdown()
@@ -0,0 +1,303 @@
+import functools
+
+import numpy as np
+import sympy as sp
+
+
+#Funcion numerica compilada una sola vez con eliminacion de subexpresiones
+#comunes (cse), asi exp/sin/cos repetidos se calculan una vez por punto.
+#Lo que lambdify no sabe traducir (Integral sin evaluar, funciones que numpy no
+#tiene) se evalua con EvaluadorArbol, y tambien los puntos donde la funcion
+#compilada da NaN o inf: con floats log(sin(x) - 1) es NaN aunque la solucion,
+#con la rama compleja que cancelan las constantes, sea real (y'' + y = tan(x)).
+def compilar(expr, x):
+    if expr.has(sp.Integral):
+        return EvaluadorArbol(expr, x)
+    try:
+        funcion = sp.lambdify(x, expr, 'numpy', cse=True)
+    except Exception:
+        return EvaluadorArbol(expr, x)
+    arbol = functools.lru_cache(maxsize=1)(lambda: EvaluadorArbol(expr, x))
+
+    def evaluar(x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                y_vals = np.asarray(funcion(x_vals))
+        except (NameError, TypeError, AttributeError):
+            #Nombres que la impresora de numpy dejo sin traducir
+            return arbol()(x_vals)
+        if not np.iscomplexobj(y_vals):
+            y_vals = y_vals.astype(float)
+        #Expresiones constantes devuelven un escalar
+        if y_vals.shape != x_vals.shape:
+            y_vals = np.broadcast_to(y_vals, x_vals.shape).copy()
+        return _completar(y_vals, x_vals, arbol)
+
+    return evaluar
+
+
+#Recalcula con el arbol los puntos no finitos (columnas, si y_vals es una lista
+#de filas); los polos siguen sin ser finitos y quedan como estaban
+def _completar(y_vals, x_vals, arbol):
+    malos = ~np.isfinite(y_vals)
+    if y_vals.ndim > x_vals.ndim:
+        malos = malos.any(axis=0)
+    if not malos.any():
+        return y_vals
+    corregidos = np.asarray(arbol()(x_vals[malos]))
+    if np.iscomplexobj(corregidos) and not np.iscomplexobj(y_vals):
+        y_vals = y_vals.astype(complex)
+    y_vals[..., malos] = corregidos
+    return y_vals
+
+
+#Evaluador guardado en el diccionario del solver, uno por expresion
+def obtener_evaluador(evaluadores, expr, x):
+    evaluador = evaluadores.get(expr)
+    if evaluador is None:
+        evaluador = compilar(expr, x)
+        evaluadores[expr] = evaluador
+    return evaluador
+
+
+#Varias expresiones en una sola funcion (cse compartido); devuelve un arreglo (m, n_puntos)
+def compilar_lista(exprs, x):
+    exprs = list(exprs)
+    if any(e.has(sp.Integral) for e in exprs if isinstance(e, sp.Basic)):
+        return _lista_arbol(exprs, x)
+    try:
+        funcion = sp.lambdify(x, exprs, 'numpy', cse=True)
+    except Exception:
+        return _lista_arbol(exprs, x)
+
+    arbol = functools.lru_cache(maxsize=1)(lambda: _lista_arbol(exprs, x))
+
+    def evaluar(x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                filas = [np.broadcast_to(np.asarray(fila), x_vals.shape) for fila in funcion(x_vals)]
+        except (NameError, TypeError, AttributeError):
+            #Nombres que la impresora de numpy dejo sin traducir
+            return arbol()(x_vals)
+        if not filas:
+            return np.empty((0,) + x_vals.shape)
+        y_vals = np.array(filas)
+        if not np.iscomplexobj(y_vals):
+            y_vals = y_vals.astype(float)
+        return _completar(y_vals, x_vals, arbol)
+
+    return evaluar
+
+
+def _punto_a_punto(funcion, valores):
+    return np.vectorize(funcion, otypes=[complex])(*valores)
+
+
+def _lista_arbol(exprs, x):
+    evaluadores = [EvaluadorArbol(sp.sympify(e), x) for e in exprs]
+
+    def evaluar(x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        if not evaluadores:
+            return np.empty((0,) + x_vals.shape)
+        return np.array([evaluador(x_vals) for evaluador in evaluadores])
+
+    return evaluar
+
+
+#Evaluador por recorrido del arbol: cada nodo de sympy se traduce a numpy y se
+#calcula sobre todo el arreglo a la vez. Se trabaja en complejo (log y raices de
+#negativos dan la rama principal, como en sympy) y al final se devuelve la parte
+#real si la imaginaria es ruido. Los subarboles repetidos se calculan una vez.
+#Integral(f, x) se calcula con trapecio acumulado sobre una malla fina que incluye
+#los puntos pedidos, desde una referencia que solo depende de f (el primero de
+#_CANDIDATOS_REFERENCIA donde f es finita): mallas distintas, evaluadores distintos
+#y otros procesos usan la misma primitiva, asi las constantes ajustadas con
+#condiciones en un punto sirven para la grafica.
+_FUNCIONES = {
+    sp.exp: np.exp, sp.log: np.log,
+    sp.sin: np.sin, sp.cos: np.cos, sp.tan: np.tan,
+    sp.cot: lambda z: 1 / np.tan(z), sp.sec: lambda z: 1 / np.cos(z), sp.csc: lambda z: 1 / np.sin(z),
+    sp.asin: np.arcsin, sp.acos: np.arccos, sp.atan: np.arctan,
+    sp.sinh: np.sinh, sp.cosh: np.cosh, sp.tanh: np.tanh,
+    sp.coth: lambda z: 1 / np.tanh(z), sp.sech: lambda z: 1 / np.cosh(z), sp.csch: lambda z: 1 / np.sinh(z),
+    sp.asinh: np.arcsinh, sp.acosh: np.arccosh, sp.atanh: np.arctanh,
+    sp.Abs: np.abs, sp.re: np.real, sp.im: np.imag, sp.conjugate: np.conj,
+    sp.arg: np.angle, sp.sign: lambda z: np.sign(np.real(z)),
+    sp.floor: lambda z: np.floor(np.real(z)), sp.ceiling: lambda z: np.ceil(np.real(z)),
+    sp.Heaviside: lambda z, h0=0.5: np.heaviside(np.real(z), np.real(h0)),
+}
+
+_RELACIONES = {
+    sp.StrictLessThan: np.less, sp.LessThan: np.less_equal,
+    sp.StrictGreaterThan: np.greater, sp.GreaterThan: np.greater_equal,
+    sp.Equality: np.equal, sp.Unequality: np.not_equal,
+}
+
+
+_CANDIDATOS_REFERENCIA = (0.0, 1.0, -1.0, 0.5, -0.5, 2.0, -2.0, 0.25, 3.0, -3.0, 10.0, -10.0)
+
+
+class EvaluadorArbol:
+    #puntos_integral: puntos de la malla uniforme de cada Integral (ademas de los pedidos)
+    def __init__(self, expr, x, puntos_integral=4097):
+        self.expr = sp.sympify(expr)
+        self.x = x
+        self.puntos_integral = puntos_integral
+        #Integrando -> punto desde el que se acumula su integral
+        self._referencias = {}
+
+    def __call__(self, x_vals):
+        x_vals = np.asarray(x_vals, dtype=float)
+        with np.errstate(all='ignore'):
+            y_vals = self._evaluar(self.expr, x_vals.astype(complex), {})
+        y_vals = np.array(np.broadcast_to(y_vals, x_vals.shape))
+        imaginaria = np.abs(y_vals.imag)
+        if np.all((imaginaria <= 1e-9 * np.maximum(1.0, np.abs(y_vals.real))) | ~np.isfinite(y_vals)):
+            return y_vals.real.astype(float)
+        return y_vals
+
+    def _evaluar(self, nodo, x_vals, memo):
+        resultado = memo.get(nodo)
+        if resultado is None:
+            resultado = self._nodo(nodo, x_vals, memo)
+            memo[nodo] = resultado
+        return resultado
+
+    def _nodo(self, nodo, x_vals, memo):
+        if nodo == self.x:
+            return x_vals
+        if nodo in (sp.true, sp.false):
+            return bool(nodo)
+        if not nodo.free_symbols:
+            try:
+                return complex(sp.N(nodo))
+            except (TypeError, ValueError, AttributeError):
+                pass
+        if nodo.is_Symbol:
+            raise ValueError(f"El símbolo {nodo} no tiene valor numérico.")
+
+        args = nodo.args
+        if nodo.is_Add:
+            return sum(self._evaluar(a, x_vals, memo) for a in args)
+        if nodo.is_Mul:
+            resultado = 1
+            for a in args:
+                resultado = resultado * self._evaluar(a, x_vals, memo)
+            return resultado
+        if nodo.is_Pow:
+            base = self._evaluar(nodo.base, x_vals, memo)
+            if nodo.exp.is_Integer:
+                return base ** int(nodo.exp)
+            return np.power(base, self._evaluar(nodo.exp, x_vals, memo))
+        if isinstance(nodo, sp.Integral):
+            return self._integral(nodo, x_vals)
+        if isinstance(nodo, sp.Piecewise):
+            return self._por_tramos(nodo, x_vals, memo)
+        if type(nodo) in _RELACIONES:
+            izquierda, derecha = (np.real(self._evaluar(a, x_vals, memo)) for a in args)
+            return _RELACIONES[type(nodo)](izquierda, derecha)
+        if isinstance(nodo, (sp.And, sp.Or, sp.Not)):
+            valores = [np.asarray(self._evaluar(a, x_vals, memo), dtype=bool) for a in args]
+            if isinstance(nodo, sp.Not):
+                return ~valores[0]
+            operacion = np.logical_and if isinstance(nodo, sp.And) else np.logical_or
+            return functools.reduce(operacion, valores)
+        if nodo.func in _FUNCIONES:
+            return _FUNCIONES[nodo.func](*(self._evaluar(a, x_vals, memo) for a in args))
+
+        #Cualquier otra funcion: su propio lambdify con los argumentos ya evaluados;
+        #las que numpy no tiene (airyai, besselj...) punto a punto con mpmath, y si
+        #tampoco esta en mpmath (airyaiprime), con evalf de sympy
+        if isinstance(nodo, sp.Function):
+            variables = sp.symbols(f"a0:{len(args)}")
+            valores = [self._evaluar(a, x_vals, memo) for a in args]
+            try:
+                funcion = sp.lambdify(variables, nodo.func(*variables), 'numpy')
+                return funcion(*valores)
+            except (NameError, TypeError, AttributeError):
+                pass
+            funcion = sp.lambdify(variables, nodo.func(*variables), 'mpmath')
+            try:
+                return _punto_a_punto(lambda *a: complex(funcion(*a)), valores)
+            except (NameError, TypeError, AttributeError):
+                return _punto_a_punto(lambda *a: complex(sp.N(nodo.func(*a))), valores)
+        raise ValueError(f"No se puede evaluar {type(nodo).__name__} numéricamente.")
+
+    def _por_tramos(self, nodo, x_vals, memo):
+        resultado = np.full(np.shape(x_vals), np.nan, dtype=complex)
+        pendiente = np.ones(np.shape(x_vals), dtype=bool)
+        for expresion, condicion in nodo.args:
+            cumple = pendiente & np.broadcast_to(self._evaluar(condicion, x_vals, memo), pendiente.shape)
+            if cumple.any():
+                resultado[cumple] = np.broadcast_to(self._evaluar(expresion, x_vals, memo), pendiente.shape)[cumple]
+            pendiente &= ~cumple
+        return resultado
+
+    #Integral(f(t), t) con t = x, o Integral(f(t), (t, a, b)) con a y b constantes
+    #o funciones de x: F(b) - F(a) con F la primitiva acumulada
+    def _integral(self, nodo, x_vals):
+        if len(nodo.limits) != 1:
+            raise ValueError("Solo se evalúan integrales simples.")
+        variable, *extremos = nodo.limits[0]
+        integrando = nodo.function
+        if variable != self.x:
+            if integrando.has(self.x):
+                raise ValueError("El integrando depende de x además de la variable de integración.")
+            integrando = integrando.xreplace({variable: self.x})
+
+        if not extremos:
+            if variable != self.x:
+                raise ValueError(f"Integral indefinida en {variable} dentro de una función de x.")
+            return self._primitiva(integrando, x_vals.real)
+        if len(extremos) != 2:
+            raise ValueError("Integral con un solo extremo.")
+
+        a, b = (np.real(np.broadcast_to(self._evaluar(sp.sympify(e), x_vals, {}), x_vals.shape))
+                for e in extremos)
+        return self._primitiva(integrando, b) - self._primitiva(integrando, a)
+
+    def _primitiva(self, integrando, puntos):
+        puntos = np.asarray(puntos, dtype=float)
+        finitos = puntos[np.isfinite(puntos)]
+        resultado = np.full(puntos.shape, np.nan, dtype=complex)
+        if len(finitos) == 0:
+            return resultado
+
+        referencia = self._referencia(integrando)
+        bajo = min(finitos.min(), referencia)
+        alto = max(finitos.max(), referencia)
+        malla = np.union1d(np.linspace(bajo, alto, self.puntos_integral), np.append(finitos, referencia))
+
+        f = np.array(np.broadcast_to(self._evaluar(integrando, malla.astype(complex), {}), malla.shape),
+                     dtype=complex)
+        _rellenar_aislados(f)
+        acumulada = np.concatenate(([0], np.cumsum(np.diff(malla) * (f[1:] + f[:-1]) / 2)))
+        acumulada -= acumulada[np.searchsorted(malla, referencia)]
+
+        resultado[np.isfinite(puntos)] = acumulada[np.searchsorted(malla, finitos)]
+        return resultado
+
+    def _referencia(self, integrando):
+        referencia = self._referencias.get(integrando)
+        if referencia is None:
+            candidatos = np.array(_CANDIDATOS_REFERENCIA)
+            valores = np.broadcast_to(self._evaluar(integrando, candidatos.astype(complex), {}), candidatos.shape)
+            finitos = np.nonzero(np.isfinite(valores))[0]
+            if len(finitos) == 0:
+                raise ValueError(f"No hay un punto de referencia para integrar {integrando}.")
+            referencia = self._referencias[integrando] = float(candidatos[finitos[0]])
+        return referencia
+
+
+#Un valor no finito entre dos finitos (sin(x)/x en 0) se reemplaza por el promedio
+#de sus vecinos para que no corte la suma acumulada; los polos de verdad quedan
+def _rellenar_aislados(f):
+    malos = ~np.isfinite(f)
+    if not malos.any() or len(f) < 3:
+        return
+    indices = np.nonzero(malos[1:-1])[0] + 1
+    aislados = indices[~malos[indices - 1] & ~malos[indices + 1]]
+    f[aislados] = 0.5 * (f[aislados - 1] + f[aislados + 1])
@@ -0,0 +1,122 @@
+import functools
+
+import numpy as np
+import sympy as sp
+
+from evaluador import compilar_lista
+
+
+#Funcion de Green (respuesta al impulso causal) de
+#    a_n y^(n) + ... + a_1 y' + a_0 y = f(x)
+#armada con la CFS y el Wronskiano: g = sum c_k y_k con W(0) c = (0, ..., 0, 1/a_n),
+#es decir la homogenea con g(0) = ... = g^(n-2)(0) = 0 y g^(n-1)(0) = 1/a_n.
+#Con ella la particular con estado nulo en x0 es
+#    y_p(x) = integral_{x0}^{x} g(x - t) f(t) dt
+#y sus derivadas hasta n-1 salen igual con g^(k) (las g^(k)(0) anteriores son cero).
+#En una malla uniforme cada integral es una convolucion discreta (trapecio) que se
+#hace con FFT en O(N log N): no hay integrales simbolicas y f puede ser cualquier
+#expresion, una funcion numerica o muestras tabuladas.
+
+
+#coeficientes: (a_n, ..., a_0); base: la CFS (n funciones de x)
+def respuesta_impulso(coeficientes, base, x):
+    n = len(base)
+    filas = [list(base)]
+    for _ in range(1, n):
+        filas.append([sp.diff(f, x) for f in filas[-1]])
+    W0 = sp.Matrix(filas).subs(x, 0)
+
+    derecha = sp.zeros(n, 1)
+    derecha[n - 1, 0] = 1 / sp.sympify(coeficientes[0])
+    constantes = W0.LUsolve(derecha)
+    return sp.expand(sum(c * f for c, f in zip(constantes, base)))
+
+
+class FuncionGreen:
+    def __init__(self, coeficientes, base, x):
+        self.x = x
+        self.orden = len(base)
+        self.base = list(base)
+        self.g = respuesta_impulso(coeficientes, base, x)
+
+        #g, g', ..., g^(n-1) y las derivadas de la base (para ajustar condiciones)
+        derivadas = [self.g]
+        base_derivadas = [self.base]
+        for _ in range(1, self.orden):
+            derivadas.append(sp.diff(derivadas[-1], x))
+            base_derivadas.append([sp.diff(f, x) for f in base_derivadas[-1]])
+        self.derivadas = derivadas
+        self._nucleos = compilar_lista(derivadas, x)
+        self._base = compilar_lista([f for fila in base_derivadas for f in fila], x)
+
+    #forzante: expresion de sympy en x, funcion de un arreglo, o arreglo con f en una
+    #malla uniforme de x_min a x_max (puntos = len del arreglo).
+    #Devuelve (malla, Y) con Y[k] = y_p^(k) en la malla, k = 0..n-1
+    def particular(self, forzante, x_min, x_max, puntos=2001):
+        x_min, x_max = float(x_min), float(x_max)
+        if x_max <= x_min:
+            raise ValueError("x_max debe ser mayor que x_min.")
+
+        if isinstance(forzante, sp.Basic) or isinstance(forzante, (int, float)):
+            forzante = sp.sympify(forzante)
+            if forzante.free_symbols - {self.x}:
+                raise ValueError("La forzante contiene símbolos distintos de x.")
+            funcion = compilar_lista([forzante], self.x)
+            evaluar = lambda malla: funcion(malla)[0]
+        elif callable(forzante):
+            evaluar = forzante
+        else:
+            muestras = np.asarray(forzante, dtype=float)
+            if muestras.ndim != 1 or len(muestras) < 2:
+                raise ValueError("Las muestras de la forzante deben ser un arreglo 1D con al menos 2 valores.")
+            puntos = len(muestras)
+            evaluar = lambda malla: muestras
+
+        malla = np.linspace(x_min, x_max, puntos)
+        h = malla[1] - malla[0]
+        with np.errstate(all='ignore'):
+            f = np.real(np.asarray(evaluar(malla), dtype=complex))
+            #El nucleo solo se usa en los desplazamientos x - t = k h
+            nucleos = np.real(self._nucleos(malla - x_min))
+            Y = np.array([convolucion_causal(nucleo, f, h) for nucleo in nucleos])
+        return malla, Y
+
+    #Solucion en la malla: particular causal mas la homogenea que cumple las
+    #condiciones (orden, x0, valor), con x0 dentro de [x_min, x_max]
+    def resolver(self, forzante, x_min, x_max, condiciones=(), puntos=2001):
+        malla, Y = self.particular(forzante, x_min, x_max, puntos)
+        if not condiciones:
+            return malla, Y[0]
+
+        n = self.orden
+        filas = []
+        valores = []
+        for orden, x0, valor in condiciones:
+            orden, x0, valor = int(orden), float(x0), float(valor)
+            if orden >= n:
+                raise ValueError(f"Condición de orden {orden} no válida para una ecuación de orden {n}.")
+            if not malla[0] <= x0 <= malla[-1]:
+                raise ValueError(f"La condición en x = {x0} queda fuera del intervalo [{malla[0]}, {malla[-1]}].")
+            base = np.real(self._base(np.array([x0])))[:, 0].reshape(n, n)
+            filas.append(base[orden])
+            valores.append(valor - np.interp(x0, malla, Y[orden]))
+
+        #Con menos condiciones que el orden, la combinacion de norma minima
+        constantes, *_ = np.linalg.lstsq(np.array(filas), np.array(valores), rcond=None)
+        base = np.real(self._base(malla))[:n]
+        return malla, Y[0] + constantes @ base
+
+
+#Trapecio de  integral_{x0}^{x_i} nucleo(x_i - t) f(t) dt  para cada punto de la malla
+def convolucion_causal(nucleo, f, h):
+    N = len(f)
+    largo = 1 << (2 * N - 1).bit_length()
+    suma = np.fft.irfft(np.fft.rfft(nucleo, largo) * np.fft.rfft(f, largo), largo)[:N]
+    #Los extremos t = x0 y t = x_i pesan la mitad
+    return h * (suma - 0.5 * nucleo * f[0] - 0.5 * nucleo[0] * f)
+
+
+#Una FuncionGreen por operador: g y sus derivadas se arman y compilan una sola vez
+@functools.lru_cache(maxsize=32)
+def obtener(coeficientes, base, x):
+    return FuncionGreen(coeficientes, base, x)
@@ -0,0 +1,132 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+import sympy as sp
+
+from procesos import terminar_procesos
+from terminos import terminos_aditivos, descomponer_termino
+
+
+#Cuantas veces se uso cada ruta: 'tabla', 'mixta' o 'sympy'
+contador_rutas = Counter()
+
+
+#Integral indefinida con ruta rapida para sumas de x^k e^{ax} {cos,sin}(bx).
+#Devuelve (resultado, ruta); solo lo que no es de esa familia va a sp.integrate.
+def integrar(integrando, x):
+    resultado, resto, ruta = _integrar_por_tabla(integrando, x)
+    if resto is not None:
+        resultado += _integrar_sympy(resto, x)
+    contador_rutas[ruta] += 1
+    return resultado, ruta
+
+
+#Varias integrales independientes en un ProcessPoolExecutor.
+#La parte reconocida por la tabla se resuelve aqui mismo; solo el resto va al pool.
+#Cada integral tiene tiempo_limite segundos: si no termina se devuelve
+#Integral(f, x) sin evaluar con ruta 'tiempo_agotado' y el proceso se termina.
+def integrar_en_paralelo(integrandos, x, tiempo_limite=None, max_procesos=None):
+    resultados = [None] * len(integrandos)
+    pendientes = {}
+
+    for i, integrando in enumerate(integrandos):
+        parcial, resto, ruta = _integrar_por_tabla(integrando, x)
+        if resto is None:
+            resultados[i] = (parcial, ruta)
+        else:
+            pendientes[i] = (parcial, resto, ruta)
+
+    if pendientes:
+        #Con limite de tiempo cada integral necesita su propio proceso para que
+        #el plazo empiece a contar al mismo tiempo para todas
+        if tiempo_limite is None:
+            procesos = min(len(pendientes), max_procesos or os.cpu_count() or 1)
+        else:
+            procesos = len(pendientes)
+
+        executor = ProcessPoolExecutor(max_workers=procesos)
+        agotado = False
+        try:
+            futuros = {i: executor.submit(_integrar_sympy, resto, x) for i, (_, resto, _) in pendientes.items()}
+            limite = None if tiempo_limite is None else time.monotonic() + tiempo_limite
+
+            for i, futuro in futuros.items():
+                parcial, resto, ruta = pendientes[i]
+                restante = None if limite is None else max(0.0, limite - time.monotonic())
+                try:
+                    resultados[i] = (parcial + futuro.result(timeout=restante), ruta)
+                except TimeoutError:
+                    agotado = True
+                    resultados[i] = (parcial + sp.Integral(resto, x), 'tiempo_agotado')
+        finally:
+            if agotado:
+                terminar_procesos(executor)
+            else:
+                executor.shutdown()
+
+    for _, ruta in resultados:
+        contador_rutas[ruta] += 1
+    return resultados
+
+
+#Devuelve (parte integrada por tabla, resto para sympy o None, ruta)
+def _integrar_por_tabla(integrando, x):
+    reconocidos = []
+    otros = []
+    for termino in terminos_aditivos(integrando, x):
+        partes = descomponer_termino(termino, x)
+        if partes is None:
+            otros.append(termino)
+        else:
+            reconocidos.append(partes)
+
+    resultado = sp.Integer(0)
+    for partes in reconocidos:
+        resultado += integrar_termino(*partes, x)
+
+    if not otros:
+        return resultado, None, 'tabla'
+    ruta = 'mixta' if reconocidos else 'sympy'
+    return resultado, sp.Add(*otros), ruta
+
+
+def _integrar_sympy(integrando, x):
+    return sp.integrate(integrando, x).doit()
+
+
+#Tabla: integral de c * x^k * e^{ax} * {cos,sin}(bx + fase)
+#Con L = a + ib:  int x^k e^{Lx} = e^{Lx} sum_j (-1)^j k!/(k-j)! x^(k-j) / L^(j+1)
+def integrar_termino(coeficiente, k, a, b, tipo, fase, x):
+    if tipo is not None and b == 0:
+        coeficiente *= sp.cos(fase) if tipo == 'cos' else sp.sin(fase)
+        tipo = None
+
+    if tipo is None:
+        if a == 0:
+            return coeficiente * x**(k + 1) / (k + 1)
+        suma = 0
+        for j in range(k + 1):
+            suma += (-1)**j * sp.ff(k, j) * x**(k - j) / a**(j + 1)
+        return coeficiente * sp.exp(a * x) * sp.expand(suma)
+
+    #1/L^(j+1) = conj(L)^(j+1) / |L|^(2(j+1)) = rho_j + i sigma_j
+    modulo = a**2 + b**2
+    parte_coseno = 0
+    parte_seno = 0
+    for j in range(k + 1):
+        rho, sigma = sp.expand((a - sp.I * b)**(j + 1)).as_real_imag()
+        factor = (-1)**j * sp.ff(k, j) * x**(k - j) / modulo**(j + 1)
+        if tipo == 'cos':
+            #Re(e^{i theta} (rho + i sigma)) = rho cos - sigma sin
+            parte_coseno += factor * rho
+            parte_seno -= factor * sigma
+        else:
+            #Im(e^{i theta} (rho + i sigma)) = sigma cos + rho sin
+            parte_coseno += factor * sigma
+            parte_seno += factor * rho
+
+    theta = b * x + fase
+    return coeficiente * sp.exp(a * x) * (sp.expand(parte_coseno) * sp.cos(theta)
+                                          + sp.expand(parte_seno) * sp.sin(theta))
@@ -1,13 +1,17 @@
+import importlib
+import threading
 import tkinter as tk
 from tkinter import Toplevel, messagebox, simpledialog
-import sympy as sp
-from PIL import Image, ImageTk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 
 # Asegúrate de tener estos módulos o ajusta los imports según tu proyecto
-from CoefIndet import CoefIndet
+from cache_soluciones import cache_global
+from enrutador import NOMBRES_METODOS, elegir_metodo
+from presentacion import PanelSecciones, Seccion
+from diferido import importar_diferido
+from trabajador import Trabajador, crear_solver
+
+# numpy se carga al usarse; matplotlib solo al dibujar la primera gráfica
+np = importar_diferido('numpy')
 # from MetodoVariacionParametros import EDOSolver # (Se asume que existe por tu código)
 
 COLOR_FONDO = "#1e1e1e"
@@ -18,6 +22,16 @@ COLOR_INPUT = "#3c3c3c"
 COLOR_BOTON = "#4CAF50"
 COLOR_BOTON_SEC = "#007acc"
 COLOR_BOTON_ACTUALIZAR = "#e09f3e" 
+COLOR_BOTON_CANCELAR = "#c0392b"
+
+# Segundos por método en modo automático antes de probar el otro
+TIEMPO_LIMITE_AUTO = 60.0
+
+TITULOS_ERROR = {
+    "variacion": "Error Variación",
+    "indeterminados": "Error Coeficientes",
+    "auto": "Error",
+}
 
 FUENTE_TITULO = ("Segoe UI", 18, "bold")
 FUENTE_NORMAL = ("Segoe UI", 10)
@@ -31,6 +45,12 @@ class Interfaz:
         self.orden_ecuacion = None 
         self.entries_condiciones_variacion = []
         self.ultimo_metodo_exitoso = None 
+        self.trabajador = None
+        # Conjuntos de condiciones que se dibujan superpuestos (familia de curvas)
+        self.familia_ci = []
+        # Ventana de estadísticas por etapa (ver perfilado.py); None si está cerrada
+        self.ventana_estadisticas = None
+        self.texto_estadisticas = None
 
         self.ventana = tk.Tk()
         self.ventana.title("Solver Ecuaciones Diferenciales - Dark Mode")
@@ -63,7 +83,18 @@ class Interfaz:
         tk.Radiobutton(frame_radios, text="Variación de Parámetros", variable=self.metodo, 
                        value="variacion", command=self.limpiar_interfaz_variacion, **estilo_radio).pack(side=tk.LEFT, padx=(0, 10))
         tk.Radiobutton(frame_radios, text="Coeficientes Indeterminados", variable=self.metodo, 
-                       value="indeterminados", command=self.limpiar_interfaz_variacion, **estilo_radio).pack(side=tk.LEFT)
+                       value="indeterminados", command=self.limpiar_interfaz_variacion, **estilo_radio).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Radiobutton(frame_radios, text="Automático", variable=self.metodo, 
+                       value="auto", command=self.limpiar_interfaz_variacion, **estilo_radio).pack(side=tk.LEFT)
+
+        # Medir tiempo y tamaño de expresión por etapa
+        frame_perfil = tk.Frame(self.panel_izquierdo, bg=COLOR_FONDO)
+        frame_perfil.pack(anchor="w")
+        self.var_perfil = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_perfil, text="Medir etapas", variable=self.var_perfil,
+                       activeforeground=COLOR_TEXTO, **estilo_radio).pack(side=tk.LEFT)
+        tk.Button(frame_perfil, text="Estadísticas", font=FUENTE_NORMAL, bg=COLOR_INPUT, fg=COLOR_TEXTO,
+                  relief="flat", cursor="hand2", command=self.abrir_estadisticas).pack(side=tk.LEFT, padx=10)
 
         # Botones Resolver
         frame_botones = tk.Frame(self.panel_izquierdo, bg=COLOR_FONDO)
@@ -72,6 +103,10 @@ class Interfaz:
                                       bg=COLOR_BOTON, fg="white", relief="flat", cursor="hand2",
                                       command=self.resolver_ecuacion)
         self.btn_resolver.pack(side=tk.LEFT, fill="x", expand=True, ipady=5, padx=(0, 5))
+        self.btn_cancelar = tk.Button(frame_botones, text="Cancelar", font=FUENTE_NORMAL,
+                                      bg="#555", fg="white", relief="flat", cursor="hand2",
+                                      command=self.cancelar_resolucion, state=tk.DISABLED)
+        self.btn_cancelar.pack(side=tk.LEFT, ipady=5, padx=5)
         self.btn_valores_antiguo = tk.Button(frame_botones, text="Valores Iniciales (Coef.)", font=FUENTE_NORMAL,
                                              bg=COLOR_INPUT, fg=COLOR_TEXTO, relief="flat", cursor="hand2",
                                              command=self.abrir_valores_iniciales)
@@ -82,6 +117,8 @@ class Interfaz:
         self.etiqueta_resultado = tk.Text(self.panel_izquierdo, font=FUENTE_MONO, 
                                           bg=COLOR_PANEL, fg=COLOR_TEXTO, relief="flat", height=15)
         self.etiqueta_resultado.pack(fill="both", expand=True, pady=5)
+        # Secciones plegables: cada expresión se dibuja al abrir su sección
+        self.secciones = PanelSecciones(self.etiqueta_resultado, COLOR_TEXTO_SEC, COLOR_BOTON_SEC)
 
         # Frame Variación
         self.frame_variacion = tk.LabelFrame(self.panel_izquierdo, text="Condiciones Iniciales (Variación)", 
@@ -109,6 +146,18 @@ class Interfaz:
         self.entry_xmax.insert(0, "10")
         self.entry_xmax.pack(side=tk.LEFT, padx=5)
 
+        # Forzar el motor numérico (matriz compañera) en lugar de la solución simbólica
+        self.var_numerica = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.frame_controles_grafica, text="Numérica", variable=self.var_numerica,
+                       bg=COLOR_PANEL, fg=COLOR_TEXTO, selectcolor=COLOR_INPUT, activebackground=COLOR_PANEL,
+                       activeforeground=COLOR_TEXTO, command=self.actualizar_grafica_manual).pack(side=tk.LEFT, padx=5)
+
+        # Familia de curvas con varios conjuntos de condiciones
+        self.btn_familia = tk.Button(self.frame_controles_grafica, text="Familia de CI",
+                                     bg=COLOR_INPUT, fg=COLOR_TEXTO, relief="flat", cursor="hand2",
+                                     command=self.pedir_familia_ci)
+        self.btn_familia.pack(side=tk.LEFT, padx=5)
+
         # Botón Actualizar Gráfica
         self.btn_actualizar_grafica = tk.Button(self.frame_controles_grafica, text="🔄 Actualizar Gráfica", 
                                                 bg=COLOR_BOTON_ACTUALIZAR, fg="white", relief="flat", cursor="hand2",
@@ -116,10 +165,36 @@ class Interfaz:
         self.btn_actualizar_grafica.pack(side=tk.RIGHT, padx=5)
 
         # --- CANVAS ---
+        # Se crea con la primera gráfica (ver crear_grafica)
+        self.figura = None
         self.canvas = None
         self.limpiar_interfaz_variacion()
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar_ventana)
+
+        # sympy se precarga en segundo plano mientras se escribe la ecuación
+        threading.Thread(target=importlib.import_module, args=("sympy",), daemon=True).start()
         self.ventana.mainloop()
 
+    # Una sola figura para toda la sesión: al graficar solo cambian los datos de la línea
+    def crear_grafica(self):
+        from matplotlib import style
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+
+        with style.context('dark_background'):
+            self.figura = Figure(figsize=(6, 4), dpi=100, facecolor=COLOR_PANEL)
+            self.ejes = self.figura.add_subplot()
+            self.linea, = self.ejes.plot([], [], label="y(x)")
+        self.color_variacion = self.linea.get_color()
+        self.coleccion_familia = LineCollection([], linewidths=0.8, alpha=0.6, colors="#FFB74D")
+        self.ejes.add_collection(self.coleccion_familia)
+        self.ejes.set_xlabel("x")
+        self.ejes.set_ylabel("y(x)")
+        self.ejes.grid(True, color="#444")
+        self.canvas = FigureCanvasTkAgg(self.figura, master=self.panel_derecho)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
     def limpiar_interfaz_variacion(self):
         for widget in self.frame_variacion.winfo_children():
             if widget != self.btn_aplicar_variacion: widget.destroy()
@@ -127,9 +202,7 @@ class Interfaz:
         self.btn_aplicar_variacion.config(state=tk.DISABLED, bg="#555")
         
         # Limpiar gráfica también al cambiar método
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-            self.canvas = None
+        self.limpiar_grafica()
         
         self.ultimo_metodo_exitoso = None
 
@@ -203,31 +276,146 @@ class Interfaz:
             messagebox.showerror("Error", "Ingrese una ecuación.")
             return
 
+        # Una nueva resolución reemplaza a la que esté en curso
+        self.cancelar_resolucion(silencioso=True)
+        self.limpiar_resultado()
+
+        metodo = self.metodo.get()
+        for widget in self.frame_variacion.winfo_children():
+            if widget != self.btn_aplicar_variacion: widget.destroy()
+        self.entries_condiciones_variacion = []
+        if metodo == "variacion":
+            condiciones = None
+        else:
+            condiciones = list(self.valores_iniciales)
+
+        # Si ya está en la cache se muestra sin lanzar el proceso
+        perfilar = self.var_perfil.get()
+        try:
+            solver = self.buscar_en_cache(metodo, ecuacion, condiciones, perfilar)
+        except Exception as e:
+            messagebox.showerror(TITULOS_ERROR[metodo], str(e))
+            return
+        if solver is not None:
+            self.mostrar_resultado(solver.metodo, solver)
+            return
+
+        self.trabajador = Trabajador(metodo, ecuacion, condiciones, perfilar, tiempo_limite=TIEMPO_LIMITE_AUTO)
+        self.trabajador.iniciar()
+        self.btn_cancelar.config(state=tk.NORMAL, bg=COLOR_BOTON_CANCELAR)
+        self.mostrar_progreso("Iniciando...")
+        self.ventana.after(100, self.revisar_trabajador, self.trabajador)
+
+    def revisar_trabajador(self, trabajador):
+        # Un trabajador reemplazado o cancelado ya no actualiza la interfaz
+        if trabajador is not self.trabajador:
+            return
+
+        for tipo, contenido in trabajador.mensajes():
+            if tipo == "progreso":
+                self.mostrar_progreso(contenido)
+            elif tipo == "resultado":
+                self.finalizar_trabajador()
+                if contenido.solucion_guardable():
+                    cache_global.guardar(contenido.clave_cache(), contenido.estado_solucion())
+                self.mostrar_resultado(contenido.metodo, contenido)
+                return
+            else:
+                self.finalizar_trabajador()
+                self.limpiar_resultado()
+                messagebox.showerror(TITULOS_ERROR[trabajador.metodo], contenido)
+                self.mostrar_respaldo_numerico(trabajador, contenido)
+                return
+
+        self.ventana.after(100, self.revisar_trabajador, trabajador)
+
+    # Sin solución simbólica: se grafica la numérica si el operador lo permite
+    def mostrar_respaldo_numerico(self, trabajador, error):
+        metodo = "variacion" if trabajador.metodo == "variacion" else "indeterminados"
+        try:
+            solver = crear_solver(metodo, trabajador.ecuacion, trabajador.condiciones)
+        except Exception:
+            return
+        datos, msg = solver.datos_grafica_numerica(-1, 1)
+        if datos is None:
+            return
+
+        self.solver = solver
+        self.ultimo_metodo_exitoso = "variacion" if metodo == "variacion" else "coeficientes"
+        self.var_numerica.set(True)
+        self.etiqueta_resultado.insert(tk.END, f"No se obtuvo solución simbólica:\n{error}\n\n"
+                                               f"Se grafica la {msg[0].lower() + msg[1:]}.\n")
+        self.actualizar_grafica_manual()
+
+    def buscar_en_cache(self, metodo, ecuacion, condiciones, perfilar=False):
+        perfil = None
+        if perfilar:
+            from perfilado import Perfil
+            perfil = Perfil(ecuacion)
+        if metodo == "auto":
+            metodo = elegir_metodo(ecuacion)
+        solver = crear_solver(metodo, ecuacion, None if metodo == "variacion" else condiciones, perfil)
+        guardado = cache_global.obtener(solver.clave_cache())
+        if guardado is None:
+            return None
+        solver.restaurar_solucion(guardado)
+        # En modo automático las condiciones también se aplican a Variación
+        if metodo == "variacion" and condiciones:
+            solver.gestionar_condiciones_iniciales(condiciones)
+        return solver
+
+    def limpiar_resultado(self):
         self.etiqueta_resultado.delete("1.0", tk.END)
-        
+        self.secciones.limpiar()
+
+    def mostrar_progreso(self, texto):
+        self.limpiar_resultado()
+        self.etiqueta_resultado.insert(tk.END, f"Calculando... {texto}\n")
+
+    def cancelar_resolucion(self, silencioso=False):
+        if self.trabajador is None:
+            return
+        self.trabajador.cancelar()
+        self.finalizar_trabajador()
+        if not silencioso:
+            self.limpiar_resultado()
+            self.etiqueta_resultado.insert(tk.END, "Resolución cancelada.\n")
+
+    def finalizar_trabajador(self):
+        self.trabajador = None
+        self.btn_cancelar.config(state=tk.DISABLED, bg="#555")
+
+    def cerrar_ventana(self):
+        self.cancelar_resolucion(silencioso=True)
+        self.ventana.destroy()
+
+    def mostrar_resultado(self, metodo, solver):
+        # El texto y la primera gráfica se miden como parte de la resolución
+        with solver.perfil.etapa("presentacion"):
+            self._mostrar_resultado(metodo, solver)
+        solver.perfil.publicar()
+        self.actualizar_estadisticas()
+
+    def _mostrar_resultado(self, metodo, solver):
+        self.solver = solver
+        self.limpiar_resultado()
+        if self.metodo.get() == "auto":
+            self.etiqueta_resultado.insert(tk.END, f"(Automático: resuelto con {NOMBRES_METODOS[metodo]})\n\n")
+
         # --- VARIACIÓN DE PARÁMETROS ---
-        if self.metodo.get() == "variacion":
+        if metodo == "variacion":
             try:
-                for widget in self.frame_variacion.winfo_children():
-                    if widget != self.btn_aplicar_variacion: widget.destroy()
-                self.entries_condiciones_variacion = []
-                
-                from MetodoVariacionParametros import EDOSolver
-                self.solver = EDOSolver(ecuacion)
-                self.solver.resolver_homogenea()
-                self.solver.resolver_particular()
-                self.solver.crear_solucion_general()
                 self.orden_ecuacion = self.solver.grado
 
-                msg = "=== MÉTODO VARIACIÓN DE PARÁMETROS ===\n\n"
-                msg += f"1. Raíces:\n{self.solver.raices}\n\n"
-                msg += f"2. CFS:\n{sp.pretty(self.solver.CFS)}\n\n"
-                msg += f"3. Homogénea (yh):\n{sp.pretty(self.solver.solucionHomogenea)}\n\n"
-                msg += f"4. Integrales (u):\n{sp.pretty(self.solver.matriz_U_integrada)}\n\n"
-                msg += f"5. Particular (yp):\n{sp.pretty(self.solver.y_p)}\n\n"
-                msg += f"--- SOLUCIÓN GENERAL ---\n{sp.pretty(self.solver.get_solucion_general())}\n"
-                
-                self.etiqueta_resultado.insert(tk.END, msg)
+                # Solo las raíces y la solución general se abren de entrada
+                self.etiqueta_resultado.insert(tk.END, "=== MÉTODO VARIACIÓN DE PARÁMETROS ===\n\n")
+                self.secciones.agregar(Seccion("1. Raíces", solver.raices, abierta=True))
+                self.secciones.agregar(Seccion("2. CFS", solver.CFS))
+                self.secciones.agregar(Seccion("3. Homogénea (yh)", solver.solucionHomogenea))
+                self.secciones.agregar(Seccion("4. Integrales (u)", solver.matriz_U_integrada))
+                self.secciones.agregar(Seccion("5. Particular (yp)", solver.y_p))
+                self.secciones.agregar(Seccion("--- SOLUCIÓN GENERAL ---", solver.get_solucion_general, abierta=True))
+                self.frame_variacion.pack(fill="x", pady=10)
                 self.crear_inputs_variacion(self.orden_ecuacion)
                 self.btn_aplicar_variacion.config(state=tk.NORMAL, bg=COLOR_BOTON_SEC)
                 
@@ -240,19 +428,9 @@ class Interfaz:
         # --- COEFICIENTES INDETERMINADOS ---
         else:
             try:
-                self.solver = CoefIndet(ecuacion)
-                self.etiqueta_resultado.insert(tk.END, "Resolviendo por Coeficientes Indeterminados...\n")
-                self.solver.resolver()
                 self.orden_ecuacion = self.solver.orden
-
-                # --- CAMBIO IMPORTANTE ---
-                # Ahora self.valores_iniciales es una LISTA de strings ["y(0)=1", "y(4)(2)=0"]
-                # Ya no se reconstruye el string, se pasa directamente.
-                if self.valores_iniciales:
-                    self.solver.agregar_CI(self.valores_iniciales)
-                    self.solver.resolver()
-
-                self.etiqueta_resultado.insert(tk.END, "\nSolución:\n" + self.solver.mostrar_sol() + "\n")
+                self.frame_variacion.pack_forget()
+                self.secciones.agregar(Seccion("Solución", self.solver.mostrar_sol, abierta=True))
                 
                 self.ultimo_metodo_exitoso = "coeficientes"
                 self.actualizar_grafica_manual()
@@ -274,7 +452,7 @@ class Interfaz:
             entry = tk.Entry(f_row, bg=COLOR_INPUT, fg=COLOR_TEXTO, insertbackground="white",
                              relief="flat", highlightthickness=1, highlightbackground="#555")
             entry.pack(side=tk.LEFT, fill="x", expand=True)
-            sugerencia = f"y{''.join(['\'' for _ in range(i)])}(0)=0"
+            sugerencia = "y" + "'" * i + "(0)=0"
             entry.insert(0, sugerencia)
             self.entries_condiciones_variacion.append(entry)
 
@@ -288,7 +466,7 @@ class Interfaz:
             log = self.solver.gestionar_condiciones_iniciales(lista_textos)
             self.etiqueta_resultado.insert(tk.END, "\n\n=== CONSTANTES ===\n")
             self.etiqueta_resultado.insert(tk.END, log + "\n")
-            self.etiqueta_resultado.insert(tk.END, f"FINAL:\n{sp.pretty(self.solver.get_solucion_final())}\n")
+            self.secciones.agregar(Seccion("FINAL", self.solver.get_solucion_final(), abierta=True))
             self.etiqueta_resultado.see(tk.END)
             
             self.actualizar_grafica_manual()
@@ -313,56 +491,124 @@ class Interfaz:
         self.graficar_en_panel_derecho(self.ultimo_metodo_exitoso, xmin, xmax)
 
     def graficar_en_panel_derecho(self, metodo, xmin, xmax):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        
-        fig = None
-        msg = ""
-        
-        plt.style.use('dark_background')
+        with self.solver.perfil.etapa("grafica_panel"):
+            self._graficar_en_panel_derecho(metodo, xmin, xmax)
+        self.actualizar_estadisticas()
 
+    def _graficar_en_panel_derecho(self, metodo, xmin, xmax):
+        if self.figura is None:
+            self.crear_grafica()
         try:
-            if metodo == "variacion":
-                fig, msg = self.solver.generar_grafica_tk(x_min=xmin, x_max=xmax)
-            
-            elif metodo == "coeficientes":
-                if self.solver.sol is None: return
-                expr = self.solver.sol.rhs
-                x_sym = sp.Symbol('x')
-                
-                params = expr.free_symbols
-                subs_dict = {s: 1 for s in params if str(s).startswith('C')}
-                expr_num = expr.subs(subs_dict)
+            datos, msg = self.solver.datos_grafica(x_min=xmin, x_max=xmax, numerico=self.var_numerica.get())
+            familia = self.datos_familia(xmin, xmax)
+            if datos is None and familia is None:
+                self.limpiar_grafica()
+                if msg: messagebox.showwarning("Gráfica", msg)
+                return
 
-                f_num = sp.lambdify(x_sym, expr_num, "numpy")
-                x_vals = np.linspace(float(xmin), float(xmax), 400)
-                
-                try:
-                    y_vals = f_num(x_vals)
-                    if np.isscalar(y_vals) or (isinstance(y_vals, np.ndarray) and y_vals.shape != x_vals.shape):
-                        y_vals = np.full_like(x_vals, float(expr_num))
-                except:
-                    y_vals = np.full_like(x_vals, float(expr_num))
-
-                fig = plt.figure(figsize=(6, 4), dpi=100)
-                plt.plot(x_vals, y_vals, label="y(x)", color="#4CAF50")
-                plt.title("Solución Coef. Indeterminados")
-                plt.xlabel("x")
-                plt.ylabel("y")
-                plt.grid(True, color="#444")
-                plt.legend()
-
-            if fig:
-                fig.patch.set_facecolor(COLOR_PANEL)
-                self.canvas = FigureCanvasTkAgg(fig, master=self.panel_derecho)
-                self.canvas.draw()
-                widget = self.canvas.get_tk_widget()
-                widget.pack(fill=tk.BOTH, expand=True)
+            if metodo == "variacion":
+                titulo, color = "Solución Final de la Ecuación Diferencial", self.color_variacion
             else:
-                if msg: messagebox.showwarning("Gráfica", msg)
+                titulo, color = "Solución Coef. Indeterminados", "#4CAF50"
+
+            # La solución numérica se distingue con línea punteada y el aviso en el título
+            if datos is not None and self.solver.grafica_numerica:
+                titulo = msg
+            if familia is not None:
+                titulo += f" + {len(familia[1])} curvas de CI"
+
+            self.linea.set_data(*(datos if datos is not None else ([], [])))
+            self.linea.set_color(color)
+            self.linea.set_linestyle("--" if self.solver.grafica_numerica else "-")
+            if familia is not None:
+                x_vals, curvas = familia
+                self.coleccion_familia.set_segments(
+                    np.stack([np.broadcast_to(x_vals, curvas.shape), curvas], axis=-1))
+            else:
+                self.coleccion_familia.set_segments([])
+
+            self.ejes.set_title(titulo, fontsize=10)
+            self.ejes.legend(loc="best")
+            self.ajustar_limites(xmin, xmax, [datos[1] if datos is not None else None,
+                                              familia[1] if familia is not None else None])
+            self.canvas.draw_idle()
 
         except Exception as e:
             messagebox.showerror("Error Gráfica", f"No se pudo graficar: {e}")
 
+    # relim no considera colecciones: los límites en y se calculan con todos los datos
+    def ajustar_limites(self, xmin, xmax, arreglos):
+        valores = np.concatenate([np.ravel(a) for a in arreglos if a is not None])
+        valores = valores[np.isfinite(valores)]
+        self.ejes.set_xlim(xmin, xmax)
+        if len(valores) == 0:
+            return
+        bajo, alto = valores.min(), valores.max()
+        margen = 0.05 * (alto - bajo) if alto > bajo else 1.0
+        self.ejes.set_ylim(bajo - margen, alto + margen)
+
+    def datos_familia(self, xmin, xmax):
+        if not self.familia_ci:
+            return None
+        datos, msg = self.solver.datos_familia(self.familia_ci, xmin, xmax)
+        if datos is None:
+            messagebox.showwarning("Familia de CI", msg)
+            return None
+        x_vals, curvas = datos
+        return x_vals, np.real(curvas)
+
+    # Formato: conjuntos separados por ';' y condiciones por ','
+    def pedir_familia_ci(self):
+        texto = simpledialog.askstring(
+            "Familia de condiciones",
+            "Conjuntos separados por ';' y condiciones por ','\n"
+            "ej: y(0)=1, y'(0)=0; y(0)=2, y'(0)=0\n(vacío para quitar la familia)",
+            initialvalue="; ".join(", ".join(conjunto) for conjunto in self.familia_ci),
+            parent=self.ventana)
+        if texto is None:
+            return
+        self.familia_ci = [[c.strip() for c in conjunto.split(",") if c.strip()]
+                           for conjunto in texto.split(";") if conjunto.strip()]
+        self.actualizar_grafica_manual()
+
+    # Tabla de tiempos por etapa del solver mostrado
+    def abrir_estadisticas(self):
+        if self.ventana_estadisticas is not None:
+            self.ventana_estadisticas.lift()
+            return
+        self.ventana_estadisticas = Toplevel(self.ventana)
+        self.ventana_estadisticas.title("Estadísticas por etapa")
+        self.ventana_estadisticas.configure(bg=COLOR_FONDO)
+        self.ventana_estadisticas.geometry("620x360")
+        self.texto_estadisticas = tk.Text(self.ventana_estadisticas, font=FUENTE_MONO, bg=COLOR_PANEL,
+                                          fg=COLOR_TEXTO, relief="flat")
+        self.texto_estadisticas.pack(fill="both", expand=True, padx=10, pady=10)
+        self.ventana_estadisticas.protocol("WM_DELETE_WINDOW", self.cerrar_estadisticas)
+        self.actualizar_estadisticas()
+
+    def cerrar_estadisticas(self):
+        self.ventana_estadisticas.destroy()
+        self.ventana_estadisticas = None
+        self.texto_estadisticas = None
+
+    def actualizar_estadisticas(self):
+        if self.texto_estadisticas is None:
+            return
+        self.texto_estadisticas.delete("1.0", tk.END)
+        if self.solver is None or not self.solver.perfil.activo:
+            self.texto_estadisticas.insert(tk.END, "Active 'Medir etapas' y vuelva a resolver.\n")
+            return
+        self.texto_estadisticas.insert(tk.END, self.solver.perfil.reporte().texto() + "\n")
+
+    def limpiar_grafica(self):
+        if self.figura is None:
+            return
+        self.linea.set_data([], [])
+        self.coleccion_familia.set_segments([])
+        self.ejes.set_title("")
+        leyenda = self.ejes.get_legend()
+        if leyenda: leyenda.remove()
+        self.canvas.draw_idle()
+
 if __name__ == "__main__":
     Interfaz()
\ No newline at end of file
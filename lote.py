@@ -0,0 +1,323 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import wait
+
+
+#Modo por lotes: cada linea de entrada es un objeto JSON
+#  {"id": ..., "ecuacion": "y'' + y = x", "condiciones": ["y(0)=1", ...],
+#   "metodo": "auto" | "variacion" | "indeterminados", "rango": [xmin, xmax],
+#   "perfil": true}
+#Con "green": true la solucion se calcula en la malla de "rango" por convolucion con
+#la funcion de Green (green.py), sin integrales simbolicas; "muestras" puede traer
+#los valores de la forzante en esa malla en lugar de la forzante de la ecuacion.
+#y cada linea de salida es el resultado de una tarea, en el orden en que terminan.
+#Con "perfil" (o --perfil) el resultado incluye los tiempos por etapa (perfilado.py).
+#Los procesos trabajadores importan sympy una sola vez y atienden muchas tareas;
+#el que se pasa del tiempo limite se termina y se reemplaza por uno nuevo.
+
+METODOS = ("auto", "variacion", "indeterminados")
+
+
+def leer_tareas(entrada):
+    for numero, linea in enumerate(entrada, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            tarea = json.loads(linea)
+        except json.JSONDecodeError as e:
+            yield None, f"línea {numero}: JSON inválido ({e})"
+            continue
+        if isinstance(tarea, str):
+            tarea = {"ecuacion": tarea}
+        if not isinstance(tarea, dict) or not isinstance(tarea.get("ecuacion"), str):
+            yield None, f"línea {numero}: falta el campo 'ecuacion'"
+            continue
+        if tarea.get("metodo", "auto") not in METODOS:
+            yield tarea, f"método desconocido: {tarea['metodo']}"
+            continue
+        yield tarea, None
+
+
+#Resolver una tarea dentro del trabajador; devuelve los campos del resultado
+def resolver_tarea(tarea, cache=None):
+    from enrutador import resolver_automatico, resolver_con_metodo, obtener_solucion
+
+    ecuacion = tarea["ecuacion"]
+    condiciones = list(tarea.get("condiciones") or [])
+    metodo = tarea.get("metodo", "auto")
+    tiempos = {}
+    perfil = None
+    if tarea.get("perfil"):
+        from perfilado import Perfil
+        perfil = Perfil(ecuacion)
+
+    if tarea.get("green"):
+        return _resolver_green(tarea, perfil)
+
+    inicio = time.perf_counter()
+    if metodo == "auto":
+        metodo, solver = resolver_automatico(ecuacion, condiciones, cache=cache, perfil=perfil)
+    else:
+        solver = resolver_con_metodo(metodo, ecuacion, condiciones, cache, perfil)
+    tiempos["resolver"] = time.perf_counter() - inicio
+
+    final = obtener_solucion(solver)
+    if hasattr(solver, "get_solucion_general"):
+        general = solver.get_solucion_general()
+    elif solver.sol_general is not None:
+        general = solver.sol_general.rhs
+    else:
+        #dsolve con condiciones solo deja la solucion ya particularizada
+        general = obtener_solucion(resolver_con_metodo(metodo, ecuacion, None, cache, perfil))
+
+    resultado = {
+        "metodo": metodo,
+        "solucion_general": None if general is None else str(general),
+        "solucion_final": None if final is None else str(final),
+    }
+
+    rango = tarea.get("rango")
+    if rango:
+        inicio = time.perf_counter()
+        datos, msg = solver.datos_grafica(float(rango[0]), float(rango[1]))
+        tiempos["grafica"] = time.perf_counter() - inicio
+        if datos is None:
+            resultado["aviso_grafica"] = msg
+        else:
+            resultado["grafica"] = {"x": _lista_json(datos[0]), "y": _lista_json(datos[1]),
+                                    "numerica": solver.grafica_numerica}
+
+    resultado["tiempos"] = tiempos
+    if perfil is not None:
+        resultado["perfil"] = perfil.reporte().como_dict()
+    return resultado
+
+
+#Solo la homogenea (CFS) y la convolucion con la funcion de Green
+def _resolver_green(tarea, perfil=None):
+    from MetodoVariacionParametros import EDOSolver
+    from condiciones import leer_condicion
+
+    rango = tarea.get("rango") or [0, 10]
+    inicio = time.perf_counter()
+    solver = EDOSolver(tarea["ecuacion"], perfil=perfil)
+    solver.condiciones_iniciales = [leer_condicion(c) for c in tarea.get("condiciones") or []]
+    datos, msg = solver.datos_grafica_green(float(rango[0]), float(rango[1]), forzante=tarea.get("muestras"))
+    if datos is None:
+        raise ValueError(msg)
+
+    resultado = {
+        "metodo": "green",
+        "respuesta_impulso": str(solver.funcion_green().g),
+        "grafica": {"x": _lista_json(datos[0]), "y": _lista_json(datos[1]), "numerica": True},
+        "tiempos": {"resolver": time.perf_counter() - inicio},
+    }
+    if perfil is not None:
+        resultado["perfil"] = perfil.reporte().como_dict()
+    return resultado
+
+
+def _lista_json(valores):
+    return [float(v) if math.isfinite(v) else None for v in valores]
+
+
+def _proceso_trabajador(conexion):
+    #Los solvers imprimen su avance; no debe mezclarse con la salida JSONL
+    sys.stdout = open(os.devnull, "w")
+
+    #Importaciones pesadas una sola vez por proceso
+    import sympy
+    import CoefIndet
+    import MetodoVariacionParametros
+    from cache_soluciones import CacheSoluciones
+
+    cache = CacheSoluciones()
+    conexion.send(("listo", None))
+    while True:
+        try:
+            trabajo = conexion.recv()
+        except EOFError:
+            break
+        if trabajo is None:
+            break
+        indice, tarea = trabajo
+        try:
+            resultado = resolver_tarea(tarea, cache)
+        except Exception as e:
+            resultado = {"error": f"{type(e).__name__}: {e}"}
+        conexion.send(("resultado", (indice, resultado)))
+
+
+#Un proceso del pool con su propio canal: si hay que matarlo no se
+#corrompe la comunicacion con los demas
+class _Trabajador:
+    def __init__(self, contexto):
+        self.conexion, extremo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_proceso_trabajador, args=(extremo,), daemon=True)
+        self.proceso.start()
+        extremo.close()
+        self.listo = False
+        self.tarea = None
+        self.inicio = None
+
+    def asignar(self, indice, tarea):
+        self.tarea = (indice, tarea)
+        self.inicio = time.perf_counter()
+        self.conexion.send((indice, tarea))
+
+    def liberar(self):
+        tarea, inicio = self.tarea, self.inicio
+        self.tarea = None
+        self.inicio = None
+        return tarea, time.perf_counter() - inicio
+
+    def terminar(self):
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+        self.proceso.join(timeout=1)
+        self.conexion.close()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.proceso.join(timeout=1)
+        self.terminar()
+
+
+def _registro(indice, tarea, resultado, total=None):
+    registro = {"indice": indice}
+    if tarea is not None:
+        if "id" in tarea:
+            registro["id"] = tarea["id"]
+        registro["ecuacion"] = tarea.get("ecuacion")
+    registro.update(resultado)
+    registro.setdefault("error", None)
+    if total is not None:
+        registro.setdefault("tiempos", {})["total"] = total
+    return registro
+
+
+#Generador de resultados en orden de terminacion.
+#tareas: iterable de (tarea, error) como el que produce leer_tareas
+def procesar_lote(tareas, procesos=None, tiempo_limite=60.0):
+    procesos = max(1, procesos or os.cpu_count() or 1)
+    contexto = multiprocessing.get_context()
+    pendientes = enumerate(tareas)
+    agotadas = False
+    trabajadores = [_Trabajador(contexto) for _ in range(procesos)]
+
+    try:
+        while True:
+            #Repartir tareas a los trabajadores libres
+            for trabajador in trabajadores:
+                while trabajador.listo and trabajador.tarea is None and not agotadas:
+                    siguiente = next(pendientes, None)
+                    if siguiente is None:
+                        agotadas = True
+                        break
+                    indice, (tarea, error) = siguiente
+                    if error is not None:
+                        yield _registro(indice, tarea, {"error": error})
+                        continue
+                    trabajador.asignar(indice, tarea)
+
+            ocupados = [t for t in trabajadores if t.tarea is not None]
+            if agotadas and not ocupados:
+                break
+
+            espera = 0.5
+            if tiempo_limite is not None and ocupados:
+                ahora = time.perf_counter()
+                restante = min(t.inicio + tiempo_limite - ahora for t in ocupados)
+                espera = min(espera, max(restante, 0.0))
+
+            listas = wait([t.conexion for t in trabajadores], timeout=espera)
+            for trabajador in trabajadores:
+                if trabajador.conexion not in listas:
+                    continue
+                try:
+                    tipo, contenido = trabajador.conexion.recv()
+                except (EOFError, OSError):
+                    continue
+                if tipo == "listo":
+                    trabajador.listo = True
+                else:
+                    (indice, tarea), total = trabajador.liberar()
+                    yield _registro(indice, tarea, contenido[1], total)
+
+            #Trabajadores vencidos o muertos: se reemplazan por procesos nuevos
+            ahora = time.perf_counter()
+            for i, trabajador in enumerate(trabajadores):
+                vencido = (tiempo_limite is not None and trabajador.tarea is not None
+                           and ahora - trabajador.inicio > tiempo_limite)
+                muerto = not trabajador.proceso.is_alive()
+                if not (vencido or muerto):
+                    continue
+                trabajador.terminar()
+                if trabajador.tarea is not None:
+                    (indice, tarea), total = trabajador.liberar()
+                    if vencido:
+                        error = f"tiempo agotado ({tiempo_limite} s)"
+                    else:
+                        error = "el proceso trabajador terminó inesperadamente"
+                    yield _registro(indice, tarea, {"error": error}, total)
+                trabajadores[i] = _Trabajador(contexto)
+    finally:
+        for trabajador in trabajadores:
+            trabajador.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolver un lote de EDOs (JSONL) con un pool de procesos")
+    parser.add_argument("entrada", nargs="?", default="-",
+                        help="archivo JSONL con una tarea por línea ('-' para stdin)")
+    parser.add_argument("-o", "--salida", default="-", help="archivo JSONL de resultados ('-' para stdout)")
+    parser.add_argument("-p", "--procesos", type=int, default=None,
+                        help="procesos trabajadores (por defecto, uno por CPU)")
+    parser.add_argument("-t", "--tiempo-limite", type=float, default=60.0,
+                        help="segundos máximos por ecuación")
+    parser.add_argument("--perfil", "--profile", action="store_true",
+                        help="incluir en cada resultado los tiempos por etapa y enviarlos a los exportadores")
+    args = parser.parse_args()
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+
+    inicio = time.perf_counter()
+    resueltas = errores = 0
+    try:
+        tareas = leer_tareas(entrada)
+        if args.perfil:
+            tareas = ((dict(tarea, perfil=True) if tarea is not None else None, error)
+                      for tarea, error in tareas)
+        for registro in procesar_lote(tareas, args.procesos, args.tiempo_limite):
+            if "perfil" in registro:
+                #Los exportadores viven en este proceso, no en los trabajadores
+                from perfilado import exportar
+                exportar(registro["perfil"])
+            salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            salida.flush()
+            if registro["error"] is None:
+                resueltas += 1
+            else:
+                errores += 1
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"{resueltas} resueltas, {errores} con error en {time.perf_counter() - inicio:.1f} s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
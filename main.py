@@ -1,19 +1,56 @@
+import argparse
+
 from MetodoVariacionParametros import EDOSolver
+from enrutador import NOMBRES_METODOS, obtener_solucion, resolver_automatico
+from perfilado import Perfil
 
 import sympy as sp
 
 if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Solver de EDOs por Variación de Parámetros")
+    parser.add_argument("--metodo", choices=["variacion", "auto"], default="variacion",
+                        help="'auto' elige el método más barato para la ecuación")
+    parser.add_argument("--raices", choices=["auto", "exacto", "numerico"], default="auto",
+                        help="raíces del polinomio característico: sympy ('exacto'), valores propios "
+                             "de la matriz compañera ('numerico') o numéricas solo si no hay exactas ('auto')")
+    parser.add_argument("-t", "--tiempo-limite", type=float, default=60.0,
+                        help="segundos máximos por método en modo 'auto' antes de probar el otro")
+    parser.add_argument("--perfil", "--profile", action="store_true",
+                        help="mostrar tiempo, llamadas y tamaño de expresión por etapa")
+    args = parser.parse_args()
+    perfil = Perfil("main") if args.perfil else None
+
+    def mostrar_perfil():
+        if perfil is not None:
+            print("\nPerfil por etapa:")
+            print(perfil.reporte().texto())
+            perfil.publicar()
     
     # 1. Entrada de datos
     f = input("Ingresa Ecuacion diferencial (ej: y'' + y = x)\n")
+
+    if args.metodo == "auto":
+        try:
+            metodo, solver = resolver_automatico(f, tiempo_limite=args.tiempo_limite, perfil=perfil)
+            #Con limite de tiempo se resuelve en otro proceso; el perfil medido vuelve en el solver
+            if perfil is not None:
+                perfil = solver.perfil
+            print(f"\nMétodo usado: {NOMBRES_METODOS[metodo]}")
+            print("\nSolución General:")
+            sp.pprint(obtener_solucion(solver))
+        except Exception as e:
+            print(f"\nHa ocurrido un error en la ejecución: {e}")
+        mostrar_perfil()
+        raise SystemExit
     
     try:
-        solver = EDOSolver(f)
+        solver = EDOSolver(f, motor_raices=args.raices, perfil=perfil)
 
         print("\nPASO 1")
         solver.resolver_homogenea()
         
-        print("\nRaíces:")
+        print(f"\nRaíces ({solver.motor_raices_usado}):")
         sp.pprint(solver.raices)
         print("\nCFS:")
         sp.pprint(solver.CFS)
@@ -65,4 +102,6 @@ if __name__ == "__main__":
 
     except Exception as e:
         print(f"\nHa ocurrido un error en la ejecución: {e}")
-        print("Por favor, revise el formato de la ecuación.")
\ No newline at end of file
+        print("Por favor, revise el formato de la ecuación.")
+
+    mostrar_perfil()
\ No newline at end of file
@@ -1,6 +1,20 @@
+import argparse
+
 from CoefIndet import CoefIndet
+from enrutador import NOMBRES_METODOS, resolver_automatico
+from perfilado import Perfil
 
 def main():
+    parser = argparse.ArgumentParser(description="Solver de EDOs por Coeficientes Indeterminados")
+    parser.add_argument("--metodo", choices=["indeterminados", "auto"], default="indeterminados",
+                        help="'auto' elige el método más barato para la ecuación")
+    parser.add_argument("-t", "--tiempo-limite", type=float, default=60.0,
+                        help="segundos máximos por método en modo 'auto' antes de probar el otro")
+    parser.add_argument("--perfil", "--profile", action="store_true",
+                        help="mostrar tiempo, llamadas y tamaño de expresión por etapa")
+    args = parser.parse_args()
+    perfil = Perfil("main2") if args.perfil else None
+
     print("===== SOLVER DE ECUACIONES DIFERENCIALES (Coeficientes Indeterminados) =====")
     print("Ejemplos válidos:")
     print("  y'' + y = sin(x)")
@@ -16,20 +30,32 @@ def main():
     ecuacion = input("Ingresa la ecuación diferencial: ").strip()
 
     try:
-        solver = CoefIndet(ecuacion)
+        solver = CoefIndet(ecuacion, perfil=perfil)
 
         print(f"\nLa ecuación es de *orden {solver.orden}*.")
         print(f"Puedes ingresar hasta {solver.orden} condiciones iniciales.\n")
 
+        ci_list = []
         if solver.orden > 0:
             resp = input("¿Deseas agregar condiciones iniciales? (s/n): ").strip().lower()
             if resp == "s":
-                ci_list = []
                 for i in range(1, solver.orden + 1):
                     ci_list.append(input(f"CI{i}: ").strip())
-                solver.agregar_CI(ci_list)
 
-        solver.resolver()
+        if args.metodo == "auto":
+            metodo, solver = resolver_automatico(ecuacion, ci_list, args.tiempo_limite, perfil=perfil)
+            #Con limite de tiempo se resuelve en otro proceso; el perfil medido vuelve en el solver
+            if perfil is not None:
+                perfil = solver.perfil
+            print(f"\nMétodo usado: {NOMBRES_METODOS[metodo]}")
+            if metodo == "variacion":
+                print("\nSolución (una sola línea):")
+                print(solver.get_solucion_final())
+                return
+        else:
+            if ci_list:
+                solver.agregar_CI(ci_list)
+            solver.resolver()
 
         print("\nSolución (una sola línea):")
         print(solver.mostrar_sol())
@@ -41,5 +67,11 @@ def main():
         print(f"\nHa ocurrido un error: {e}")
         print("Revisa el formato de la ecuación.")
 
+    finally:
+        if perfil is not None:
+            print("\nPerfil por etapa:")
+            print(perfil.reporte().texto())
+            perfil.publicar()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
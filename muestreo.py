@@ -0,0 +1,133 @@
+import numpy as np
+
+
+#Muestreo adaptativo para graficar f en [x_min, x_max].
+#Empieza con una malla gruesa y refina (en lotes vectorizados) los intervalos
+#donde la curva se aleja de la recta entre vecinos o da saltos grandes.
+#Las singularidades se cortan con NaN para que no se dibujen lineas verticales.
+#max_puntos limita el total de puntos devueltos (evaluaciones y cortes).
+def muestrear(funcion, x_min, x_max, max_puntos=2000, puntos_iniciales=161, tolerancia=2e-3,
+              max_rondas=12):
+    x_min = float(x_min)
+    x_max = float(x_max)
+    puntos_iniciales = max(3, min(puntos_iniciales, max_puntos))
+
+    x_vals = np.linspace(x_min, x_max, puntos_iniciales)
+    y_vals = _evaluar(funcion, x_vals)
+    ancho_minimo = (x_max - x_min) * 1e-7
+    ancho_inicial = (x_max - x_min) / (puntos_iniciales - 1)
+    agotado = False
+
+    for _ in range(max_rondas):
+        presupuesto = max_puntos - len(x_vals)
+        if presupuesto <= 0:
+            agotado = True
+            break
+
+        escala = _escala(y_vals)
+        error = _error_intervalos(x_vals, y_vals, escala)
+        error[np.diff(x_vals) < ancho_minimo] = 0.0
+
+        candidatos = np.nonzero(error > tolerancia)[0]
+        if len(candidatos) == 0:
+            break
+        if len(candidatos) > presupuesto:
+            agotado = True
+            candidatos = candidatos[np.argsort(error[candidatos])[::-1][:presupuesto]]
+            candidatos.sort()
+
+        x_nuevos = 0.5 * (x_vals[candidatos] + x_vals[candidatos + 1])
+        y_nuevos = _evaluar(funcion, x_nuevos)
+        x_vals = np.insert(x_vals, candidatos + 1, x_nuevos)
+        y_vals = np.insert(y_vals, candidatos + 1, y_nuevos)
+
+    #Sin presupuesto la curva puede quedar submuestreada (una oscilacion rapida
+    #parece una sucesion de saltos) y los saltos no dicen nada: no se corta
+    if agotado:
+        return x_vals, y_vals
+    return _cortar_singularidades(x_vals, y_vals, ancho_inicial, max_puntos - len(x_vals))
+
+
+def _evaluar(funcion, x_vals):
+    with np.errstate(all='ignore'):
+        y_vals = np.asarray(funcion(x_vals))
+    if np.iscomplexobj(y_vals):
+        y_vals = np.real(y_vals)
+    y_vals = np.array(np.broadcast_to(y_vals, x_vals.shape), dtype=float)
+    y_vals[~np.isfinite(y_vals)] = np.nan
+    return y_vals
+
+
+#Escala robusta de la curva (percentiles) para que un polo no la domine
+def _escala(y_vals):
+    finitos = y_vals[np.isfinite(y_vals)]
+    if len(finitos) < 2:
+        return 1.0
+    bajo, alto = np.percentile(finitos, [5, 95])
+    return max(alto - bajo, 1e-12)
+
+
+#Error por intervalo: desviacion de cada punto respecto de la recta entre sus
+#vecinos (repartida a los dos intervalos que toca) y saltos grandes entre extremos
+def _error_intervalos(x_vals, y_vals, escala):
+    n = len(x_vals)
+    error = np.zeros(n - 1)
+
+    with np.errstate(all='ignore'):
+        h_izq = x_vals[1:-1] - x_vals[:-2]
+        h_der = x_vals[2:] - x_vals[1:-1]
+        interpolado = (y_vals[:-2] * h_der + y_vals[2:] * h_izq) / (h_izq + h_der)
+        desviacion = np.abs(y_vals[1:-1] - interpolado) / escala
+    desviacion = np.nan_to_num(desviacion, nan=0.0)
+
+    error[:-1] = np.maximum(error[:-1], desviacion)
+    error[1:] = np.maximum(error[1:], desviacion)
+
+    #Frontera entre valores finitos y no finitos: refinar para ubicarla
+    finito = np.isfinite(y_vals)
+    frontera = finito[:-1] != finito[1:]
+    error[frontera] = np.inf
+    return error
+
+
+#Un intervalo es un polo si su salto es grande frente a la escala, va en sentido
+#contrario a sus dos vecinos (+inf -> -inf) o es mucho mayor que ellos, la
+#refinacion lo achico (se volvio a partir al menos dos veces) y |y| crece hacia
+#el salto desde los dos lados. Una oscilacion submuestreada tambien da saltos
+#contrarios a sus vecinos, pero no lo ultimo.
+#presupuesto: cuantos NaN se pueden insertar (se cortan los saltos mayores)
+def _cortar_singularidades(x_vals, y_vals, ancho_inicial, presupuesto):
+    if len(x_vals) < 4 or presupuesto <= 0:
+        return x_vals, y_vals
+
+    escala = _escala(y_vals)
+    saltos = np.nan_to_num(np.diff(y_vals), nan=0.0)
+
+    izquierda = np.concatenate(([0.0], saltos[:-1]))
+    derecha = np.concatenate((saltos[1:], [0.0]))
+
+    grande = np.abs(saltos) > 0.5 * escala
+    contrario = (saltos * izquierda < 0) & (saltos * derecha < 0)
+    aislado = np.abs(saltos) > 10 * np.maximum(np.abs(izquierda), np.abs(derecha))
+    refinado = np.diff(x_vals) <= ancho_inicial / 4
+
+    #|y| sube en los dos puntos que llevan a cada extremo y los extremos quedan
+    #por encima de la escala de la curva (una oscilacion acotada no llega)
+    modulo = np.abs(y_vals)
+    borde = np.full(2, np.inf)
+    hacia_derecha = np.concatenate((borde, modulo, borde))
+    with np.errstate(invalid='ignore'):
+        sube = (hacia_derecha[2:-2] > hacia_derecha[1:-3]) & (hacia_derecha[1:-3] > hacia_derecha[:-4])
+        baja = (hacia_derecha[2:-2] > hacia_derecha[3:-1]) & (hacia_derecha[3:-1] > hacia_derecha[4:])
+        crece = sube[:-1] & baja[1:] & (np.minimum(modulo[:-1], modulo[1:]) > escala)
+
+    indices = np.nonzero(grande & (contrario | aislado) & refinado & crece)[0]
+    if len(indices) == 0:
+        return x_vals, y_vals
+    if len(indices) > presupuesto:
+        indices = np.sort(indices[np.argsort(np.abs(saltos[indices]))[::-1][:presupuesto]])
+
+    x_medios = 0.5 * (x_vals[indices] + x_vals[indices + 1])
+    x_vals = np.insert(x_vals, indices + 1, x_medios)
+    y_vals = np.insert(y_vals, indices + 1, np.nan)
+    return x_vals, y_vals
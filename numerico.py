@@ -0,0 +1,158 @@
+import math
+
+import numpy as np
+import sympy as sp
+
+from evaluador import compilar
+
+
+#Solucion numerica del problema de valores iniciales
+#    a_n y^(n) + ... + a_1 y' + a_0 y = f(x),   condiciones (orden, x0, valor)
+#como sistema de primer orden Y' = A Y + b f(x) con la matriz compañera A.
+#En una malla uniforme de paso h:
+#    Y(x + h) = e^{Ah} Y(x) + integral_0^h e^{A(h - s)} b f(x + s) ds
+#La exponencial se calcula una sola vez y la integral con Simpson sobre f
+#evaluada de forma vectorizada. No depende de raices ni de integrales simbolicas.
+
+
+#coeficientes: (a_n, ..., a_1, a_0), del mayor al menor orden
+def matriz_companera(coeficientes):
+    a = np.asarray(coeficientes, dtype=float)
+    n = len(a) - 1
+    if n < 1 or a[0] == 0:
+        raise ValueError("El coeficiente de mayor orden debe ser distinto de cero.")
+
+    A = np.zeros((n, n))
+    A[:-1, 1:] = np.eye(n - 1)
+    A[-1, :] = -a[:0:-1] / a[0]
+    b = np.zeros(n)
+    b[-1] = 1.0 / a[0]
+    return A, b
+
+
+#e^A por escalado y cuadrado: serie de Taylor de A / 2^s con ||A / 2^s|| <= 1/2
+def exponencial(A):
+    norma = np.linalg.norm(A, 1)
+    s = max(0, math.ceil(math.log2(norma / 0.5))) if norma > 0.5 else 0
+    B = A / 2**s
+
+    resultado = np.eye(len(A))
+    termino = np.eye(len(A))
+    for k in range(1, 18):
+        termino = termino @ B / k
+        resultado = resultado + termino
+    for _ in range(s):
+        resultado = resultado @ resultado
+    return resultado
+
+
+#Estados Y en x0 + k h (k = 0..pasos) partiendo de Y0
+def _barrido(A, b, forzante, x0, Y0, x1, pasos):
+    h = (x1 - x0) / pasos
+    malla = x0 + h * np.arange(pasos + 1)
+    malla[-1] = x1
+    medios = malla[:-1] + h / 2
+
+    f_malla = forzante(malla)
+    f_medios = forzante(medios)
+    paso = exponencial(A * h)
+    medio_paso = exponencial(A * (h / 2))
+
+    #Simpson en [0, h] con los extremos y el punto medio
+    aportes = (h / 6) * (np.outer(f_malla[:-1], paso @ b)
+                         + 4 * np.outer(f_medios, medio_paso @ b)
+                         + np.outer(f_malla[1:], b))
+
+    estados = np.empty((pasos + 1, len(b)))
+    estados[0] = Y0
+    for k in range(pasos):
+        estados[k + 1] = paso @ estados[k] + aportes[k]
+    return malla, estados
+
+
+#Estado inicial Y(x0) que cumple las condiciones (minimos cuadrados: con menos
+#condiciones que el orden se toma la solucion de norma minima)
+def _estado_inicial(A, b, forzante, condiciones, x0, paso_malla):
+    n = len(b)
+    filas = []
+    valores = []
+    for orden, xc, valor in condiciones:
+        if orden >= n:
+            raise ValueError(f"Condición de orden {orden} no válida para una ecuación de orden {n}.")
+        fila = np.zeros(n)
+        fila[orden] = 1.0
+        if xc == x0:
+            filas.append(fila)
+            valores.append(valor)
+            continue
+        #Y(xc) = e^{A(xc - x0)} Y(x0) + parte forzada desde Y(x0) = 0
+        pasos = max(1, math.ceil(abs(xc - x0) / paso_malla))
+        _, forzada = _barrido(A, b, forzante, x0, np.zeros(n), xc, pasos)
+        filas.append(exponencial(A * (xc - x0))[orden])
+        valores.append(valor - forzada[-1][orden])
+
+    if not filas:
+        return np.zeros(n)
+    estado, *_ = np.linalg.lstsq(np.array(filas), np.array(valores, dtype=float), rcond=None)
+    return estado
+
+
+def resolver_pvi(coeficientes, forzante, condiciones, x_min, x_max, puntos=1001):
+    A, b = matriz_companera(coeficientes)
+    x_min = float(x_min)
+    x_max = float(x_max)
+    paso_malla = (x_max - x_min) / (puntos - 1)
+
+    condiciones = [(int(k), float(xc), float(v)) for k, xc, v in condiciones]
+    x0 = condiciones[0][1] if condiciones else 0.0
+
+    with np.errstate(all='ignore'):
+        Y0 = _estado_inicial(A, b, forzante, condiciones, x0, paso_malla)
+
+        tramos = []
+        for extremo in (x_min, x_max):
+            if extremo == x0:
+                continue
+            pasos = max(1, math.ceil(abs(extremo - x0) / paso_malla))
+            tramos.append(_barrido(A, b, forzante, x0, Y0, extremo, pasos))
+
+    if not tramos:
+        return np.array([x0]), np.array([Y0[0]])
+
+    x_vals = np.concatenate([malla for malla, _ in tramos])
+    y_vals = np.concatenate([estados[:, 0] for _, estados in tramos])
+    orden = np.argsort(x_vals, kind='stable')
+    x_vals, y_vals = x_vals[orden], y_vals[orden]
+
+    #Sin el x0 repetido y solo dentro del rango pedido
+    unicos = np.concatenate(([True], np.diff(x_vals) > 0))
+    dentro = (x_vals >= x_min) & (x_vals <= x_max)
+    mascara = unicos & dentro
+    y_vals = y_vals[mascara]
+    y_vals[~np.isfinite(y_vals)] = np.nan
+    return x_vals[mascara], y_vals
+
+
+#Entrada comun para los dos solvers: polinomio caracteristico (Poly o coeficientes),
+#forzante simbolica en x y condiciones (orden, x0, valor). Devuelve ((x, y), mensaje).
+def datos_numericos(caracteristico, forzante, x, condiciones, x_min, x_max, puntos=1001):
+    if isinstance(caracteristico, sp.Poly):
+        caracteristico = caracteristico.all_coeffs()
+    try:
+        coeficientes = [float(c) for c in caracteristico]
+    except TypeError:
+        raise ValueError("La solución numérica requiere coeficientes numéricos constantes.")
+
+    forzante = sp.sympify(forzante)
+    if forzante.free_symbols - {x}:
+        raise ValueError("La forzante contiene símbolos distintos de x.")
+    funcion = compilar(forzante, x)
+
+    x_vals, y_vals = resolver_pvi(coeficientes, funcion, condiciones, x_min, x_max, puntos)
+
+    n = len(coeficientes) - 1
+    if len(condiciones) < n:
+        mensaje = f"Solución numérica (matriz compañera; solo {len(condiciones)} de {n} condiciones)"
+    else:
+        mensaje = "Solución numérica (matriz compañera)"
+    return (x_vals, y_vals), mensaje
@@ -0,0 +1,132 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import sympy as sp
+from sympy.parsing.sympy_parser import (
+    parse_expr,
+    standard_transformations,
+    implicit_multiplication_application,
+    convert_xor
+)
+
+from anulador import separar_operador
+
+
+#Parser unico de ecuaciones y condiciones iniciales para los dos solvers.
+#Sintaxis: y, y', y'', ... o y(n) para la n-esima derivada; ^ o ** para potencias;
+#multiplicacion implicita (4y', 2x, x y); ln/log, e = exp(1).
+
+X = sp.Symbol('x')
+Y = sp.Function('y')(X)
+R = sp.Symbol('r')
+
+TRANSFORMACIONES = standard_transformations + (implicit_multiplication_application, convert_xor)
+
+#y(n) como n-esima derivada (en la ecuacion, no en las condiciones) y y''...
+#(se admite x pegada delante: xy' = x*y')
+PATRON_DERIVADA_N = re.compile(r"(?<![A-Za-wz_])y\(\s*(\d+)\s*\)")
+PATRON_DERIVADA = re.compile(r"(?<![A-Za-wz_])y('*)(?![A-Za-z0-9_(])")
+
+#Condiciones: y(x0)=v, y'(x0)=v, y''(x0)=v, ... o y(n)(x0)=v
+PATRON_CONDICION = re.compile(r"^\s*y\s*(?:\(\s*(\d+)\s*\)|('*))\s*\(\s*([^()]+?)\s*\)\s*=\s*(.+?)\s*$")
+
+#Marcadores que sustituyen a y^(k) durante el parseo
+_MARCADORES = [sp.Symbol(f'Yd{k}') for k in range(64)]
+_LOCALES = {'x': X, 'e': sp.E, 'ln': sp.log, **{m.name: m for m in _MARCADORES}}
+
+
+class EcuacionEDO(NamedTuple):
+    texto: str
+    #Ecuacion como lhs = rhs con y(x) y Derivative (para dsolve)
+    lhs: sp.Expr
+    rhs: sp.Expr
+    orden: int
+    #(a_n, ..., a_0) del operador lineal de coeficientes constantes, o None
+    coeficientes: Optional[tuple]
+    #f(x) en  a_n y^(n) + ... + a_0 y = f(x)  (None si coeficientes es None)
+    forzante: Optional[sp.Expr]
+    #Condiciones normalizadas (orden, x0, valor)
+    condiciones: tuple
+
+    @property
+    def lineal_constante(self):
+        return self.coeficientes is not None
+
+    def polinomio_caracteristico(self, variable=R):
+        return sp.Poly(self.coeficientes, variable)
+
+    #a_n y^(n) + ... + a_0 y armado desde los coeficientes: el lhs escrito puede
+    #tener terminos en y del otro lado (y'' = -y + f)
+    def operador(self):
+        n = len(self.coeficientes) - 1
+        return sum(a * (Y if n - i == 0 else sp.Derivative(Y, (X, n - i)))
+                   for i, a in enumerate(self.coeficientes))
+
+
+def parsear_ecuacion(texto, condiciones=()):
+    return _parsear_ecuacion(texto.strip(), tuple(condiciones))
+
+
+@lru_cache(maxsize=512)
+def _parsear_ecuacion(texto, condiciones):
+    partes = texto.split('=')
+    if len(partes) != 2:
+        raise ValueError("La ecuación debe tener un formato 'LHS = RHS'")
+
+    try:
+        lhs = _parsear_lado(partes[0])
+        rhs = _parsear_lado(partes[1])
+    except Exception as e:
+        raise ValueError(f"Error al parsear la ecuación: {e}")
+
+    ecuacion = lhs - rhs
+    orden = max((len(d.variables) for d in ecuacion.atoms(sp.Derivative)), default=0)
+
+    coeficientes = None
+    forzante = None
+    operador = separar_operador(ecuacion, Y, X, R)
+    if operador is not None:
+        caracteristico, forzante = operador
+        coeficientes = tuple(caracteristico.all_coeffs())
+        #Se conserva la forzante como se escribio si todo el lado derecho es forzante
+        if sp.expand(forzante - rhs) == 0:
+            forzante = rhs
+
+    return EcuacionEDO(texto, lhs, rhs, orden, coeficientes, forzante,
+                       tuple(parsear_condicion(c) for c in condiciones))
+
+
+#Expresion en x sin y (por ejemplo, una forzante suelta)
+@lru_cache(maxsize=512)
+def parsear_expresion(texto):
+    expresion = _parsear_lado(texto)
+    if expresion.has(Y.func):
+        raise ValueError(f"La expresión no debe contener y: {texto}")
+    return expresion
+
+
+#"y''(0)=1" -> (2, 0, 1) con x0 y valor como numeros de sympy
+@lru_cache(maxsize=512)
+def parsear_condicion(texto):
+    match = PATRON_CONDICION.match(texto)
+    if not match:
+        raise ValueError(f"Formato de CI no soportado: {texto}")
+    orden_n, comillas, punto, valor = match.groups()
+    orden = int(orden_n) if orden_n is not None else len(comillas)
+    try:
+        return orden, sp.sympify(punto, locals=_LOCALES), sp.sympify(valor, locals=_LOCALES)
+    except (sp.SympifyError, TypeError) as e:
+        raise ValueError(f"Error al leer números en: {texto} ({e})")
+
+
+def _parsear_lado(texto):
+    texto = PATRON_DERIVADA_N.sub(lambda m: f" Yd{int(m.group(1))} ", texto)
+    texto = PATRON_DERIVADA.sub(lambda m: f" Yd{len(m.group(1))} ", texto)
+    expresion = parse_expr(texto, local_dict=dict(_LOCALES), transformations=TRANSFORMACIONES)
+
+    reemplazos = {}
+    for simbolo in expresion.free_symbols & set(_MARCADORES):
+        k = int(simbolo.name[2:])
+        reemplazos[simbolo] = Y if k == 0 else sp.Derivative(Y, (X, k))
+    return expresion.xreplace(reemplazos)
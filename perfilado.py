@@ -0,0 +1,206 @@
+import functools
+import sys
+import time
+from typing import NamedTuple, Optional
+
+from diferido import importar_diferido
+
+sp = importar_diferido('sympy')
+
+
+#Tiempo, llamadas y tamaño de expresion (count_ops) por etapa del calculo.
+#Los solvers guardan un Perfil en self.perfil; sin perfil usan PERFIL_NULO, cuyas
+#etapas no hacen nada (ni reloj ni count_ops), asi que desactivado no cuesta.
+#Las etapas se pueden anidar: 'segundos' incluye a las etapas internas y
+#'propio' descuenta el tiempo que se paso dentro de ellas.
+
+
+class EtapaPerfil(NamedTuple):
+    nombre: str
+    llamadas: int
+    segundos: float
+    propio: float
+    #Mayor count_ops visto en la etapa (None si no se midio)
+    operaciones: Optional[int]
+
+
+class Reporte:
+    def __init__(self, nombre, etapas):
+        self.nombre = nombre
+        self.etapas = etapas
+
+    #Tiempo de las etapas de primer nivel (la suma de 'propio' de todas)
+    @property
+    def total(self):
+        return sum(etapa.propio for etapa in self.etapas)
+
+    def como_dict(self):
+        return {
+            "nombre": self.nombre,
+            "total": self.total,
+            "etapas": [etapa._asdict() for etapa in self.etapas],
+        }
+
+    def texto(self):
+        lineas = [f"{'etapa':<20}{'llamadas':>9}{'total (s)':>11}{'propio (s)':>12}{'ops':>8}"]
+        for etapa in sorted(self.etapas, key=lambda e: -e.propio):
+            ops = "-" if etapa.operaciones is None else str(etapa.operaciones)
+            lineas.append(f"{etapa.nombre:<20}{etapa.llamadas:>9}{etapa.segundos:>11.4f}"
+                          f"{etapa.propio:>12.4f}{ops:>8}")
+        lineas.append(f"{'total':<20}{'':>9}{self.total:>11.4f}")
+        return "\n".join(lineas)
+
+    def __str__(self):
+        return self.texto()
+
+
+class Perfil:
+    activo = True
+
+    def __init__(self, nombre=""):
+        self.nombre = nombre
+        #nombre -> [llamadas, segundos, segundos en etapas internas, operaciones]
+        self.etapas = {}
+        self._pila = []
+
+    def etapa(self, nombre):
+        return _Medicion(self, nombre)
+
+    #Para tiempos medidos por fuera (por ejemplo, en otro proceso)
+    def registrar(self, nombre, segundos, expresion=None):
+        registro = self._registro(nombre)
+        registro[0] += 1
+        registro[1] += segundos
+        if expresion is not None:
+            self._tamano(registro, expresion)
+
+    def reporte(self):
+        etapas = [EtapaPerfil(nombre, llamadas, segundos, max(0.0, segundos - internas), operaciones)
+                  for nombre, (llamadas, segundos, internas, operaciones) in self.etapas.items()]
+        return Reporte(self.nombre, etapas)
+
+    #Envia el reporte a los exportadores registrados
+    def publicar(self):
+        exportar(self.reporte().como_dict())
+
+    def _registro(self, nombre):
+        registro = self.etapas.get(nombre)
+        if registro is None:
+            registro = self.etapas[nombre] = [0, 0.0, 0.0, None]
+        return registro
+
+    def _tamano(self, registro, expresion):
+        if expresion is None:
+            return
+        try:
+            operaciones = int(sp.count_ops(expresion))
+        except Exception:
+            return
+        if registro[3] is None or operaciones > registro[3]:
+            registro[3] = operaciones
+
+    #Sin estado de medicion en curso al copiar (procesos de trabajo, cache)
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado['_pila'] = []
+        return estado
+
+
+class _Medicion:
+    def __init__(self, perfil, nombre):
+        self.perfil = perfil
+        self.nombre = nombre
+        self.internas = 0.0
+
+    def __enter__(self):
+        self.perfil._pila.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        segundos = time.perf_counter() - self.inicio
+        self.perfil._pila.pop()
+        if self.perfil._pila:
+            self.perfil._pila[-1].internas += segundos
+
+        registro = self.perfil._registro(self.nombre)
+        registro[0] += 1
+        registro[1] += segundos
+        registro[2] += self.internas
+        return False
+
+    def tamano(self, expresion):
+        self.perfil._tamano(self.perfil._registro(self.nombre), expresion)
+
+
+class PerfilNulo:
+    activo = False
+
+    def etapa(self, nombre):
+        return _MEDICION_NULA
+
+    def registrar(self, nombre, segundos, expresion=None):
+        pass
+
+    def reporte(self):
+        return Reporte("", [])
+
+    def publicar(self):
+        pass
+
+
+class _MedicionNula:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+    def tamano(self, expresion):
+        pass
+
+
+_MEDICION_NULA = _MedicionNula()
+PERFIL_NULO = PerfilNulo()
+
+
+#Metodo medido como una etapa de self.perfil; tamano(self, resultado) da la
+#expresion cuyo count_ops se guarda (solo se calcula con el perfil activo)
+def medir(nombre, tamano=None):
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envuelto(self, *args, **kwargs):
+            perfil = self.perfil
+            if not perfil.activo:
+                return metodo(self, *args, **kwargs)
+            with perfil.etapa(nombre) as medicion:
+                resultado = metodo(self, *args, **kwargs)
+                if tamano is not None:
+                    medicion.tamano(tamano(self, resultado))
+                return resultado
+        return envuelto
+    return decorador
+
+
+#Exportadores: funcion(dict del reporte), por ejemplo para enviar a un colector de metricas.
+#Un exportador que falla no interrumpe el calculo; el error se avisa por stderr.
+_exportadores = []
+
+
+def registrar_exportador(funcion):
+    _exportadores.append(funcion)
+    return funcion
+
+
+def quitar_exportador(funcion):
+    if funcion in _exportadores:
+        _exportadores.remove(funcion)
+
+
+#datos: Reporte.como_dict() (tambien el que llega de otro proceso)
+def exportar(datos):
+    for funcion in list(_exportadores):
+        try:
+            funcion(datos)
+        except Exception as e:
+            print(f"Exportador de perfil {getattr(funcion, '__name__', funcion)} falló: {e}", file=sys.stderr)
@@ -0,0 +1,144 @@
+import functools
+import tkinter as tk
+
+from diferido import importar_diferido
+
+sp = importar_diferido('sympy')
+
+
+#Texto de resultados por secciones que se arman al abrirlas.
+#Cada seccion tiene un titulo clickeable (▸ cerrada / ▾ abierta); el contenido se
+#calcula la primera vez que se abre y queda guardado. Una expresion chica se
+#muestra con sp.pretty; una grande primero como resumen (subexpresiones comunes
+#con sp.cse y texto plano recortado) con un enlace para pedir la forma completa,
+#porque sp.pretty de una expresion de orden 4+ tarda segundos y deja megas de
+#texto que el widget Text no puede acomodar.
+
+#Por encima de esto (count_ops) no se hace sp.pretty sin que se pida
+LIMITE_OPERACIONES = 120
+#Caracteres del resumen antes de recortar
+LIMITE_CARACTERES = 3000
+
+
+#sp.pretty por expresion; las expresiones se repiten entre secciones y al reabrir
+@functools.lru_cache(maxsize=256)
+def forma_completa(expresion):
+    return sp.pretty(expresion)
+
+
+#(texto, completo): completo es False si el texto es un resumen de una expresion grande
+@functools.lru_cache(maxsize=256)
+def forma_resumida(expresion):
+    if sp.count_ops(expresion) <= LIMITE_OPERACIONES:
+        return forma_completa(expresion), True
+
+    reemplazos, reducidas = sp.cse(expresion)
+    lineas = [f"{simbolo} = {sp.sstr(valor)}" for simbolo, valor in reemplazos]
+    lineas += [sp.sstr(reducida) for reducida in reducidas]
+    return recortar("\n".join(lineas)), False
+
+
+def recortar(texto, limite=LIMITE_CARACTERES):
+    if len(texto) <= limite:
+        return texto
+    return texto[:limite] + f"… ({len(texto) - limite} caracteres más)"
+
+
+#Las matrices de sympy son mutables y no sirven de clave de cache
+def _inmutable(expresion):
+    if isinstance(expresion, sp.MatrixBase):
+        return sp.ImmutableMatrix(expresion)
+    return expresion
+
+
+class Seccion:
+    #contenido: expresion de sympy, texto ya armado, o una funcion sin argumentos
+    #que devuelve cualquiera de los dos (se llama recien al abrir la seccion)
+    def __init__(self, titulo, contenido, abierta=False):
+        self.titulo = titulo
+        self._contenido = contenido
+        self.abierta = abierta
+        self.completa = False
+        self._valor = None
+
+    def valor(self):
+        if self._valor is None:
+            contenido = self._contenido() if callable(self._contenido) else self._contenido
+            self._valor = _inmutable(contenido)
+        return self._valor
+
+    #(texto, hay_mas): hay_mas indica que falta pedir la forma completa
+    def texto(self):
+        valor = self.valor()
+        if isinstance(valor, str):
+            return (valor, False) if self.completa else (recortar(valor), len(valor) > LIMITE_CARACTERES)
+        if not isinstance(valor, sp.Basic):
+            return str(valor), False
+        if self.completa:
+            return forma_completa(valor), False
+        texto, completo = forma_resumida(valor)
+        return texto, not completo
+
+
+#Maneja las secciones dentro de un tk.Text: cada seccion ocupa el rango entre
+#dos marcas y al abrirla, cerrarla o ampliarla solo se reescribe ese rango.
+#Las marcas de secciones vecinas coinciden en el mismo indice; fuera de un dibujo
+#el inicio tiene gravedad derecha y el fin izquierda, asi el texto que se inserta
+#en ese punto no cae dentro de ninguna. Al dibujar una seccion se invierten las
+#suyas para que su contenido quede entre ellas.
+class PanelSecciones:
+    def __init__(self, texto, color_titulo, color_enlace):
+        self.texto = texto
+        self.secciones = []
+        texto.tag_configure("seccion_titulo", foreground=color_titulo)
+        texto.tag_configure("seccion_enlace", foreground=color_enlace, underline=True)
+        for etiqueta in ("seccion_titulo", "seccion_enlace"):
+            texto.tag_bind(etiqueta, "<Enter>", lambda e: texto.config(cursor="hand2"))
+            texto.tag_bind(etiqueta, "<Leave>", lambda e: texto.config(cursor=""))
+
+    #Se llama junto con el borrado del widget
+    def limpiar(self):
+        for i in range(len(self.secciones)):
+            self.texto.mark_unset(f"seccion{i}_inicio", f"seccion{i}_fin")
+            self.texto.tag_delete(f"seccion{i}_titulo", f"seccion{i}_enlace")
+        self.secciones = []
+
+    def agregar(self, seccion):
+        i = len(self.secciones)
+        self.secciones.append(seccion)
+        self.texto.mark_set(f"seccion{i}_inicio", "end-1c")
+        self.texto.mark_set(f"seccion{i}_fin", "end-1c")
+        self.texto.tag_bind(f"seccion{i}_titulo", "<Button-1>", lambda e: self.alternar(i))
+        self.texto.tag_bind(f"seccion{i}_enlace", "<Button-1>", lambda e: self.ampliar(i))
+        self._dibujar(i)
+        return seccion
+
+    def alternar(self, i):
+        self.secciones[i].abierta = not self.secciones[i].abierta
+        self._dibujar(i)
+
+    def ampliar(self, i):
+        self.secciones[i].completa = True
+        self._dibujar(i)
+
+    def _dibujar(self, i):
+        seccion = self.secciones[i]
+        inicio, fin = f"seccion{i}_inicio", f"seccion{i}_fin"
+        self.texto.mark_gravity(inicio, tk.LEFT)
+        self.texto.mark_gravity(fin, tk.RIGHT)
+        self.texto.delete(inicio, fin)
+
+        marcador = "▾" if seccion.abierta else "▸"
+        self.texto.insert(fin, f"{marcador} {seccion.titulo}\n", ("seccion_titulo", f"seccion{i}_titulo"))
+        if seccion.abierta:
+            try:
+                contenido, hay_mas = seccion.texto()
+            except Exception as e:
+                contenido, hay_mas = f"(no se pudo mostrar: {e})", False
+            self.texto.insert(fin, contenido + "\n")
+            if hay_mas:
+                self.texto.insert(fin, "[Mostrar forma completa]\n", ("seccion_enlace", f"seccion{i}_enlace"))
+        self.texto.insert(fin, "\n")
+
+        self.texto.mark_gravity(inicio, tk.RIGHT)
+        self.texto.mark_gravity(fin, tk.LEFT)
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+#Tiempo de importacion de los puntos de entrada medido con  python -X importtime
+#y comparado con el presupuesto guardado en presupuesto_arranque.json.
+#Sale con codigo 1 si algun modulo se pasa del presupuesto.
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_PRESUPUESTO = os.path.join(DIRECTORIO, "presupuesto_arranque.json")
+
+
+#Lineas "import time: propio | acumulado | nombre" -> [(nivel, nombre, propio_us, acumulado_us)]
+def leer_importtime(texto):
+    registros = []
+    for linea in texto.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        partes = linea[len("import time:"):].split("|")
+        if len(partes) != 3 or not partes[0].strip().isdigit():
+            continue
+        nombre = partes[2].rstrip()
+        nivel = (len(nombre) - len(nombre.lstrip())) // 2
+        registros.append((nivel, nombre.strip(), int(partes[0]), int(partes[1])))
+    return registros
+
+
+#Una importacion en frio (proceso nuevo); devuelve el acumulado en ms y los hijos directos
+def medir_modulo(modulo):
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                               cwd=DIRECTORIO, capture_output=True, text=True)
+    if resultado.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulo}:\n{resultado.stderr[-2000:]}")
+
+    registros = leer_importtime(resultado.stderr)
+    total = next(acumulado for nivel, nombre, _, acumulado in registros if nivel == 0 and nombre == modulo)
+
+    #Los hijos aparecen antes que su padre en la salida de importtime
+    hijos = []
+    for nivel, nombre, _, acumulado in reversed(registros):
+        if nivel == 0 and nombre == modulo:
+            continue
+        if nivel == 0:
+            break
+        if nivel == 1:
+            hijos.append((nombre, acumulado / 1000))
+    hijos.sort(key=lambda h: -h[1])
+    return total / 1000, hijos
+
+
+#Minimo de varias mediciones para quitar ruido del sistema
+def medir(modulo, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        total, hijos = medir_modulo(modulo)
+        if mejor is None or total < mejor[0]:
+            mejor = (total, hijos)
+    return mejor
+
+
+def cargar_presupuesto(archivo):
+    with open(archivo, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Medir el tiempo de arranque contra el presupuesto")
+    parser.add_argument("modulos", nargs="*", help="módulos a medir (por defecto, los del presupuesto)")
+    parser.add_argument("-r", "--repeticiones", type=int, default=3)
+    parser.add_argument("-d", "--detalle", type=int, default=0,
+                        help="mostrar las N importaciones directas más pesadas de cada módulo")
+    parser.add_argument("--presupuesto", default=ARCHIVO_PRESUPUESTO)
+    parser.add_argument("--guardar", action="store_true",
+                        help="escribir las mediciones (por --margen) como nuevo presupuesto")
+    parser.add_argument("--margen", type=float, default=2.0)
+    args = parser.parse_args()
+
+    presupuesto = cargar_presupuesto(args.presupuesto) if os.path.exists(args.presupuesto) else {}
+    limites = presupuesto.get("modulos_ms", {})
+    modulos = args.modulos or list(limites)
+    if not modulos:
+        parser.error("no hay módulos en el presupuesto; indíquelos en la línea de comandos")
+
+    excedidos = []
+    mediciones = {}
+    print(f"{'módulo':<28}{'medido (ms)':>12}{'límite (ms)':>13}")
+    for modulo in modulos:
+        total, hijos = medir(modulo, args.repeticiones)
+        mediciones[modulo] = total
+        limite = limites.get(modulo)
+        marca = ""
+        if limite is not None and total > limite:
+            excedidos.append(modulo)
+            marca = "  EXCEDIDO"
+        texto_limite = f"{limite:.0f}" if limite is not None else "-"
+        print(f"{modulo:<28}{total:>12.1f}{texto_limite:>13}{marca}")
+        for nombre, ms in hijos[:args.detalle]:
+            print(f"    {nombre:<24}{ms:>12.1f}")
+
+    if args.guardar:
+        presupuesto["modulos_ms"] = {**limites, **{m: round(t * args.margen) for m, t in mediciones.items()}}
+        with open(args.presupuesto, "w", encoding="utf-8") as f:
+            json.dump(presupuesto, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nPresupuesto guardado en {args.presupuesto}")
+        return
+
+    if excedidos:
+        print(f"\nFuera de presupuesto: {', '.join(excedidos)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+#Utilidades para detener trabajos de sympy que no terminan a tiempo.
+#Un hilo no se puede interrumpir, por eso todo lo que necesita limite de
+#tiempo corre en procesos que se terminan a la fuerza.
+
+
+#Terminar los procesos de un ProcessPoolExecutor, incluso los que siguen ocupados
+def terminar_procesos(executor):
+    terminar = getattr(executor, 'terminate_workers', None)
+    if terminar is not None:
+        terminar()
+        return
+
+    procesos = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for proceso in procesos:
+        if proceso.is_alive():
+            proceso.terminate()
+    for proceso in procesos:
+        proceso.join(timeout=1)
@@ -0,0 +1,168 @@
+import sympy as sp
+
+from diferido import importar_diferido
+
+#Solo se cargan si hace falta el motor numerico
+np = importar_diferido('numpy')
+numerico = importar_diferido('numerico')
+
+
+#Raices del polinomio caracteristico como valores propios de la matriz compañera.
+#Una raiz de multiplicidad m aparece como m valores propios repartidos en un
+#circulo de radio ~ eps^(1/m) alrededor de la raiz verdadera; se agrupan con ese
+#radio (con un tope, porque para m grande eps^(1/m) ya junta raices distintas),
+#el centro del grupo se pule con Newton sobre p^(m-1) (donde la raiz ya es
+#simple) y el grupo se acepta solo si p, p', ..., p^(m-2) tambien se anulan ahi.
+#Los pares conjugados se arman juntos para que la CFS quede real y al final se
+#comprueba que el producto de los factores reproduce los coeficientes.
+
+MOTORES = ("auto", "exacto", "numerico")
+
+#Radio relativo maximo de un grupo, sea cual sea su multiplicidad
+RADIO_MAXIMO = 0.1
+#Diferencia relativa admitida entre los coeficientes y el producto de los factores
+TOLERANCIA_COEFICIENTES = 1e-6
+
+
+#coeficientes: (a_n, ..., a_0), del mayor al menor orden.
+#Devuelve {raiz: multiplicidad} con raices sp.Float o sp.Float + I*sp.Float,
+#en el mismo formato que sympy.roots.
+#factor: holgura sobre el radio eps^(1/m) al decidir si dos grupos son la misma raiz
+def raices_numericas(coeficientes, factor=50.0):
+    try:
+        a = np.array([float(c) for c in coeficientes])
+    except TypeError:
+        raise ValueError("Los coeficientes del polinomio característico deben ser números reales.")
+
+    A, _ = numerico.matriz_companera(a)
+    valores = np.linalg.eigvals(A)
+
+    resultado = {}
+    for z, multiplicidad in _agrupar(a, valores, factor):
+        if abs(z.imag) <= _radio(z, multiplicidad, factor):
+            raiz = sp.Float(_limpiar(z.real))
+            resultado[raiz] = resultado.get(raiz, 0) + multiplicidad
+        elif z.imag > 0:
+            #Cada par se arma desde la mitad superior; el conjugado es exacto
+            real, imaginaria = _limpiar(z.real, abs(z)), _limpiar(abs(z.imag), abs(z))
+            real, imaginaria = sp.Float(real), sp.Float(imaginaria)
+            for raiz in (real + sp.I * imaginaria, real - sp.I * imaginaria):
+                resultado[raiz] = resultado.get(raiz, 0) + multiplicidad
+
+    if sum(resultado.values()) != len(a) - 1:
+        raise ValueError("No se pudieron agrupar las raíces del polinomio característico.")
+    _verificar(a, resultado)
+    return resultado
+
+
+#Radio en que se dispersan los valores propios de una raiz de multiplicidad m
+def _radio(centro, multiplicidad, factor):
+    relativo = min(factor * np.finfo(float).eps ** (1.0 / multiplicidad), RADIO_MAXIMO)
+    return relativo * max(1.0, abs(centro))
+
+
+#Desde cada valor pendiente se prueba el grupo mas grande (el valor y sus vecinos
+#mas cercanos) cuyo centro los contiene a todos dentro del radio de su multiplicidad
+#y que, pulido, es una raiz multiple de verdad. Devuelve [(raiz, multiplicidad)]
+def _agrupar(a, valores, factor):
+    pendientes = sorted(valores, key=lambda v: (v.real, v.imag))
+    grupos = []
+    while pendientes:
+        semilla = pendientes[0]
+        cercanos = sorted(pendientes, key=lambda v: abs(v - semilla))
+        grupo, raiz = [semilla], complex(semilla)
+        for m in range(len(cercanos), 1, -1):
+            centro = np.mean(cercanos[:m])
+            if max(abs(v - centro) for v in cercanos[:m]) > _radio(centro, m, factor):
+                continue
+            z = _pulir(a, centro, m)
+            if _es_multiple(a, z, m, factor):
+                grupo, raiz = cercanos[:m], z
+                break
+        for v in grupo:
+            pendientes.remove(v)
+        grupos.append((raiz, len(grupo)))
+    return grupos
+
+
+#Newton sobre la derivada (m-1)-esima, donde una raiz de multiplicidad m es simple
+def _pulir(a, centro, multiplicidad, iteraciones=8):
+    p = np.polyder(a, multiplicidad - 1) if multiplicidad > 1 else a
+    dp = np.polyder(p)
+    z = complex(centro)
+    for _ in range(iteraciones):
+        derivada = np.polyval(dp, z)
+        if derivada == 0:
+            break
+        paso = np.polyval(p, z) / derivada
+        z -= paso
+        if abs(paso) <= 1e-15 * max(1.0, abs(z)):
+            break
+    #Si Newton se aleja (grupo mal formado) se conserva el promedio
+    if abs(z - centro) > 1e-3 * max(1.0, abs(centro)):
+        return complex(centro)
+    return z
+
+
+#z es raiz de multiplicidad m si p^(j)(z) ~ 0 para j < m, relativo a la escala
+#de cada termino (|coeficientes| evaluados en |z|). Un grupo de raices distintas
+#tiene un centro donde p^(m-1) puede anularse pero las derivadas menores no.
+#Con una raiz multiple perturbada a un circulo de radio rho ~ eps^(1/m),
+#p^(j) en el centro es del orden de rho^(m-j)
+def _es_multiple(a, z, multiplicidad, factor):
+    eps = np.finfo(float).eps
+    for j in range(multiplicidad - 1):
+        p = np.polyder(a, j) if j else a
+        escala = np.polyval(np.abs(p), abs(z))
+        tolerancia = factor * eps ** ((multiplicidad - j) / multiplicidad)
+        if abs(np.polyval(p, z)) > tolerancia * escala:
+            return False
+    return True
+
+
+#a_n * prod (r - raiz)^m tiene que reproducir los coeficientes
+def _verificar(a, raices):
+    producto = np.array([a[0]], dtype=complex)
+    for raiz, multiplicidad in raices.items():
+        producto = np.polymul(producto, np.poly([complex(raiz)] * multiplicidad))
+    diferencia = np.max(np.abs(producto - a)) / np.max(np.abs(a))
+    if diferencia > TOLERANCIA_COEFICIENTES:
+        raise ValueError("Las raíces numéricas no reproducen el polinomio característico "
+                         f"(diferencia relativa {diferencia:.1e}).")
+
+
+#Redondeo a 12 cifras significativas para quitar el ruido de punto flotante (1.9999999999997 -> 2.0);
+#una parte despreciable frente al modulo de la raiz queda en cero
+def _limpiar(valor, modulo=0.0):
+    if abs(valor) <= 1e-12 * max(1.0, modulo):
+        return 0.0
+    return float(f"{valor:.12g}")
+
+
+#Raices exactas si sympy las da sin radicales de Cardano/Ferrari, o None.
+#Con cubics/quartics desactivados sympy solo factoriza y resuelve cuadraticas;
+#si la suma de multiplicidades no llega al grado las raices no estan disponibles.
+def raices_exactas(polinomio):
+    raices = sp.roots(polinomio, cubics=False, quartics=False, quintics=False)
+    if sum(raices.values()) != polinomio.degree():
+        return None
+    return raices
+
+
+#motor: 'exacto' (sympy.roots, como siempre), 'numerico' (matriz compañera) o
+#'auto': numerico si hay coeficientes decimales o si no hay raices exactas sencillas
+def raices_caracteristicas(polinomio, motor="auto"):
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de raíces desconocido: {motor}")
+    coeficientes = polinomio.all_coeffs()
+
+    if motor == "exacto":
+        return sp.roots(polinomio), "exacto"
+    if motor == "numerico":
+        return raices_numericas(coeficientes), "numerico"
+
+    if not any(c.has(sp.Float) for c in coeficientes):
+        raices = raices_exactas(polinomio)
+        if raices is not None:
+            return raices, "exacto"
+    return raices_numericas(coeficientes), "numerico"
@@ -0,0 +1,88 @@
+import time
+
+import sympy as sp
+from sympy.simplify.fu import TR8
+
+from terminos import descomponer_termino
+
+
+#Simplificacion por etapas para las soluciones de los dos solvers.
+#Primero reescrituras baratas pensadas para la forma de nuestras soluciones
+#(sumas de c x^k e^{ax} {cos,sin}(bx)): powsimp, productos trigonometricos a
+#sumas (sin^2 + cos^2 se cancela) y agrupacion por los elementos de la base.
+#sp.simplify solo se intenta si queda algo fuera de esa familia (log, raices,
+#integrales...) y el presupuesto lo permite.
+#
+#nivel: 'auto' (dirigida y, si hace falta, completa dentro del presupuesto),
+#'dirigida' (solo las reescrituras baratas) o 'ninguna' (la expresion tal cual,
+#para quien solo necesita evaluar numeros).
+
+NIVELES = ("auto", "dirigida", "ninguna")
+
+
+#Limite de sp.simplify para una resolucion: segundos acumulados y tamaño de la
+#expresion (count_ops). Una llamada a simplify no se puede interrumpir, asi que
+#el tiempo se revisa antes de cada llamada y el tamaño acota lo que dura cada una.
+class Presupuesto:
+    def __init__(self, segundos=2.0, max_operaciones=200):
+        self.segundos = segundos
+        self.max_operaciones = max_operaciones
+        self.usado = 0.0
+        self.llamadas = 0
+
+    def permite(self, operaciones):
+        return self.usado < self.segundos and operaciones <= self.max_operaciones
+
+    def cobrar(self, inicio):
+        self.usado += time.perf_counter() - inicio
+        self.llamadas += 1
+
+
+def simplificar(expresion, x, base=(), nivel="auto", presupuesto=None):
+    if nivel not in NIVELES:
+        raise ValueError(f"Nivel de simplificación desconocido: {nivel}")
+    if nivel == "ninguna" or not isinstance(expresion, sp.Basic) or not expresion.has(x):
+        return expresion
+
+    mejor = _menor([expresion, *_dirigidas(expresion, x, base)])
+
+    if nivel == "auto" and not _en_familia(mejor, x):
+        presupuesto = presupuesto if presupuesto is not None else Presupuesto()
+        operaciones = sp.count_ops(mejor)
+        if presupuesto.permite(operaciones):
+            inicio = time.perf_counter()
+            try:
+                mejor = _menor([mejor, sp.simplify(mejor)])
+            finally:
+                presupuesto.cobrar(inicio)
+    return mejor
+
+
+#Candidatos baratos; el de menos operaciones gana
+def _dirigidas(expresion, x, base):
+    candidatos = []
+    expandida = sp.powsimp(sp.expand(expresion))
+    candidatos.append(expandida)
+    if expandida.has(sp.sin, sp.cos):
+        #Productos y potencias de sin/cos a sumas: x sin^2 + x cos^2 -> x
+        candidatos.append(sp.powsimp(sp.expand(TR8(expandida))))
+
+    factores = list(base) or _factores(expresion, x)
+    if factores:
+        candidatos += [sp.collect(c, factores) for c in candidatos]
+    return candidatos
+
+
+#exp, sin, cos y log que dependen de x, en orden estable
+def _factores(expresion, x):
+    atomos = expresion.atoms(sp.exp, sp.sin, sp.cos, sp.log)
+    return sorted((a for a in atomos if a.has(x)), key=sp.default_sort_key)
+
+
+def _menor(candidatos):
+    return min(candidatos, key=sp.count_ops)
+
+
+#Todos los terminos son de la forma c x^k e^{ax} {cos,sin}(bx): simplify no tiene nada que ganar
+def _en_familia(expresion, x):
+    return all(descomponer_termino(t, x) is not None for t in sp.Add.make_args(sp.expand(expresion)))
@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import sympy as sp
+
+from cache_soluciones import CacheSoluciones, clave_canonica
+from terminos import terminos_aditivos, descomponer_termino
+
+
+#Superposicion: L[y] = f1 + f2 + ... se resuelve como L[y_i] = f_i y y_p = sum(y_i).
+#La forzante se separa en grupos de terminos del mismo tipo (misma familia
+#x^k e^{ax} {cos,sin}(bx), o las mismas funciones fuera de la familia: tan, log...)
+#y la particular de cada grupo se guarda en una cache por (operador, grupo), asi
+#dos ecuaciones con el mismo operador que comparten terminos reutilizan el trabajo.
+
+#Particulares por grupo de los dos solvers (en memoria, por proceso)
+cache_terminos = CacheSoluciones(max_entradas=512)
+
+
+#Devuelve [(tipo, grupo)] en orden estable. tipo es ('familia', a, |b|) para los
+#terminos de la familia del anulador y ('otros', nombres) para el resto, donde
+#nombres son las funciones de x que aparecen en el termino.
+def agrupar_terminos(forzante, x):
+    grupos = {}
+    for termino in terminos_aditivos(forzante, x):
+        if termino == 0:
+            continue
+        tipo = _tipo_termino(termino, x)
+        grupos[tipo] = grupos.get(tipo, 0) + termino
+    return sorted(grupos.items(), key=lambda g: str(g[0]))
+
+
+def _tipo_termino(termino, x):
+    partes = descomponer_termino(termino, x)
+    if partes is not None:
+        _, _, a, b, tipo, _ = partes
+        if tipo is None:
+            b = sp.Integer(0)
+        return ('familia', str(a), str(abs(b)))
+    funciones = {type(f).__name__ for f in termino.atoms(sp.Function) if f.has(x)}
+    if any(p.base.has(x) and not p.exp.is_Integer for p in termino.atoms(sp.Pow)):
+        funciones.add('Pow')
+    return ('otros', tuple(sorted(funciones)))
+
+
+def es_familia(tipo):
+    return tipo[0] == 'familia'
+
+
+def clave_termino(metodo, operador, grupo, *extra):
+    return clave_canonica('termino', metodo, operador, grupo, *extra)
+
+
+#funcion(*argumentos) para cada elemento de lista_argumentos; con paralelo y mas de
+#uno, cada llamada en su propio proceso (un proceso nuevo cuesta importar sympy,
+#por eso solo vale la pena para grupos caros como los que van a dsolve)
+def resolver_grupos(funcion, lista_argumentos, paralelo=False, max_procesos=None):
+    if not paralelo or len(lista_argumentos) < 2:
+        return [funcion(*argumentos) for argumentos in lista_argumentos]
+
+    procesos = min(len(lista_argumentos), max_procesos or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        futuros = [executor.submit(funcion, *argumentos) for argumentos in lista_argumentos]
+        return [futuro.result() for futuro in futuros]
@@ -0,0 +1,57 @@
+import sympy as sp
+from sympy.simplify.fu import TR8
+
+
+#Separar una expresion en terminos aditivos, pasando antes los productos y
+#potencias de sin/cos a sumas (sin(x)*cos(x) -> sin(2x)/2)
+def terminos_aditivos(expresion, x):
+    expresion = sp.expand(TR8(sp.expand(expresion)))
+    return list(sp.Add.make_args(expresion))
+
+
+#Descomponer un termino de la forma  c * x^k * e^{a x} * {cos,sin}(b x + fase)
+#Devuelve (c, k, a, b, tipo, fase) con tipo en ('cos', 'sin', None),
+#o None si el termino no pertenece a esa familia.
+def descomponer_termino(termino, x):
+    coeficiente, resto = termino.as_independent(x, as_Add=False)
+
+    k = 0
+    a = sp.Integer(0)
+    b = sp.Integer(0)
+    fase = sp.Integer(0)
+    tipo = None
+
+    for factor in sp.Mul.make_args(resto):
+        if factor == 1:
+            continue
+        elif factor == x:
+            k += 1
+        elif factor.is_Pow and factor.base == x and factor.exp.is_Integer and factor.exp > 0:
+            k += int(factor.exp)
+        elif isinstance(factor, sp.exp):
+            lineal = _lineal(factor.args[0], x)
+            if lineal is None:
+                return None
+            a += lineal[0]
+            coeficiente *= sp.exp(lineal[1])
+        elif isinstance(factor, (sp.sin, sp.cos)) and tipo is None:
+            lineal = _lineal(factor.args[0], x)
+            if lineal is None:
+                return None
+            b, fase = lineal
+            tipo = 'sin' if isinstance(factor, sp.sin) else 'cos'
+        else:
+            return None
+
+    return coeficiente, k, a, b, tipo, fase
+
+
+def _lineal(argumento, x):
+    argumento = sp.expand(argumento)
+    if not argumento.is_polynomial(x) or sp.degree(argumento, x) > 1:
+        return None
+    pendiente = argumento.coeff(x, 1)
+    constante = argumento.coeff(x, 0)
+    if pendiente.has(x) or constante.has(x):
+        return None
+    return pendiente, constante
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+import sympy as sp
+
+#Los modulos del solver estan en la raiz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser_edo import X, Y, parsear_ecuacion
+
+
+#Maximo de |L[y] - f| en algunos puntos, con las constantes libres fijadas
+def residuo(ecuacion, y, puntos=(0.3, 0.7, 1.1)):
+    ir = parsear_ecuacion(ecuacion)
+    constantes = sorted(y.free_symbols - {X}, key=str)
+    y = y.subs({c: sp.Rational(i + 2, 3) for i, c in enumerate(constantes)})
+    r = (ir.lhs - ir.rhs).subs(Y, y).doit()
+    return max(abs(complex(sp.N(r.subs(X, p)))) for p in puntos)
+
+
+@pytest.fixture
+def calcular_residuo():
+    return residuo
@@ -0,0 +1,60 @@
+import pytest
+import sympy as sp
+
+from anulador import base_homogenea, multiplicidad_raiz, separar_operador, solucion_particular
+from CoefIndet import CoefIndet
+from parser_edo import R, X, Y, parsear_ecuacion
+
+
+@pytest.mark.parametrize("ecuacion", [
+    "y'' + y = sin(x)",
+    "y'' + 9y = cos(3x)",
+    "y'' - 4y' + 4y = exp(2x)",
+    "y'' + 2y' + y = x*exp(x)",
+    "y'' + 4y = x*sin(2x)",
+    "y''' - 3y'' + 3y' - y = exp(x)",
+    "y'''' + 2y'' + y = cos(x)",
+    "y'' - 9y = 5",
+    "y'' + y = x*exp(x) + sin(3x) + 5",
+])
+def test_residuo_nulo(ecuacion, calcular_residuo):
+    s = CoefIndet(ecuacion)
+    s.resolver()
+    assert s.motor in ('anulador', 'superposicion')
+    assert calcular_residuo(ecuacion, s.sol.rhs) < 1e-9
+
+
+def test_termino_fuera_de_la_familia(calcular_residuo):
+    s = CoefIndet("y'' + y = tan(x)")
+    s.resolver()
+    assert s.motor == 'superposicion'
+    assert calcular_residuo("y'' + y = tan(x)", s.sol.rhs) < 1e-9
+
+
+def test_coeficientes_variables_usan_dsolve(calcular_residuo):
+    s = CoefIndet("x*y' + y = x")
+    s.resolver()
+    assert s.motor == 'dsolve'
+    assert calcular_residuo("x*y' + y = x", s.sol.rhs) < 1e-9
+
+
+def test_separar_operador():
+    caracteristico, forzante = separar_operador(
+        sp.Derivative(Y, (X, 2)) - 2 * Y - sp.exp(X), Y, X, R)
+    assert caracteristico.all_coeffs() == [1, 0, -2]
+    assert forzante == sp.exp(X)
+    #Coeficiente variable
+    assert separar_operador(sp.Derivative(Y, X) + X * Y, Y, X, R) is None
+
+
+def test_base_y_multiplicidad():
+    caracteristico = parsear_ecuacion("y'''' + 2y'' + y = 0").polinomio_caracteristico()
+    base = base_homogenea(caracteristico, X)
+    assert set(base) == {sp.cos(X), sp.sin(X), X * sp.cos(X), X * sp.sin(X)}
+    assert multiplicidad_raiz(caracteristico, sp.I) == 2
+    assert multiplicidad_raiz(caracteristico, 1) == 0
+
+
+def test_particular_fuera_de_la_familia():
+    caracteristico = sp.Poly(R**2 + 1, R)
+    assert solucion_particular(caracteristico, sp.log(X), X) is None
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from diferido import importar_diferido
+from presupuesto_arranque import leer_importtime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cargados_al_importar(modulo):
+    codigo = (f"import sys, {modulo}; "
+              "print(' '.join(m for m in ('sympy', 'numpy', 'matplotlib', 'PIL') if m in sys.modules))")
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    return set(resultado.stdout.split())
+
+
+def test_interfaz_no_carga_librerias_pesadas():
+    pytest.importorskip("tkinter")
+    assert _cargados_al_importar("interfaz") == set()
+
+
+def test_solver_no_carga_numpy_ni_matplotlib():
+    assert _cargados_al_importar("MetodoVariacionParametros") == {"sympy"}
+    assert _cargados_al_importar("CoefIndet") == {"sympy"}
+
+
+def test_modulo_diferido_carga_al_primer_uso():
+    modulo = importar_diferido("json")
+    assert "sin cargar" in repr(modulo)
+    assert modulo.dumps([1]) == "[1]"
+    assert "cargado" in repr(modulo) and "sin" not in repr(modulo)
+
+
+def test_leer_importtime():
+    texto = ("import time: self [us] | cumulative | imported package\n"
+             "import time:       100 |        100 |   hijo\n"
+             "import time:       200 |        300 | padre\n"
+             "otra linea\n")
+    assert leer_importtime(texto) == [(1, "hijo", 100, 100), (0, "padre", 200, 300)]
@@ -0,0 +1,60 @@
+import benchmark
+from benchmark import ARCHIVO_CORPUS, cargar_json, comparar, ejecutar
+
+
+def _corpus(*casos):
+    return {"version": 0, "puntos": [0.3, 0.7], "casos": list(casos)}
+
+
+def test_corpus_valido():
+    corpus = cargar_json(ARCHIVO_CORPUS)
+    ids = [caso["id"] for caso in corpus["casos"]]
+    assert len(ids) == len(set(ids))
+    for caso in corpus["casos"]:
+        if "lento" in caso.get("etiquetas", []):
+            assert "tiempo_limite" in caso
+
+
+def test_ejecutar_mide_y_compara_los_motores():
+    resultados = ejecutar(_corpus({"id": "a", "ecuacion": "y'' + y = x"},
+                                  {"id": "b", "ecuacion": "y'' + y = x",
+                                   "condiciones": ["y(0)=1", "y'(0)=0"]}),
+                          1, 60, False, avisar=lambda texto: None)
+    for caso in ("a", "b"):
+        assert resultados[caso]["acuerdo"] is True
+        for motor in benchmark.MOTORES:
+            assert resultados[caso]["motores"][motor]["estado"] == "ok"
+
+
+def test_casos_lentos_y_limite_por_caso(monkeypatch):
+    llamadas = []
+
+    def medir_caso(motor, caso, repeticiones, tiempo_limite, memoria):
+        llamadas.append((caso["id"], tiempo_limite))
+        return {"estado": "tiempo_agotado", "segundos": None}
+
+    monkeypatch.setattr(benchmark, "medir_caso", medir_caso)
+    corpus = _corpus({"id": "lento", "ecuacion": "y'' = x", "etiquetas": ["lento"], "tiempo_limite": 5},
+                     {"id": "normal", "ecuacion": "y'' = x"})
+    assert list(ejecutar(corpus, 1, 60, False, avisar=lambda texto: None)) == ["normal"]
+    assert set(ejecutar(corpus, 1, 60, False, filtro="lento", avisar=lambda texto: None)) == {"lento"}
+    llamadas.clear()
+    resultados = ejecutar(corpus, 1, 60, False, avisar=lambda texto: None, lentos=True)
+    assert ("lento", 5) in llamadas and ("normal", 60) in llamadas
+    assert resultados["lento"]["acuerdo"] is None
+
+
+def _resultado(segundos, estado="ok", acuerdo=True):
+    motor = {"estado": estado, "segundos": segundos, "etapas": {"raices": segundos}}
+    return {"motores": {m: motor for m in benchmark.MOTORES}, "acuerdo": acuerdo}
+
+
+def test_comparar_detecta_regresiones():
+    base = {"resultados": {"a": _resultado(1.0), "b": _resultado(1.0), "c": _resultado(1.0)}}
+    ahora = {"a": _resultado(1.05), "b": _resultado(2.0), "c": _resultado(None, "tiempo_agotado", None),
+             "nuevo": _resultado(9.0)}
+    regresiones = comparar(base, ahora, umbral=0.25)
+    assert not any(r.startswith("a/") for r in regresiones)
+    assert any(r.startswith("b/variacion: 1.000s -> 2.000s") for r in regresiones)
+    assert any("ok -> tiempo_agotado" in r for r in regresiones)
+    assert not any("nuevo" in r for r in regresiones)
@@ -0,0 +1,57 @@
+import sympy as sp
+
+from cache_soluciones import CacheSoluciones, clave_canonica
+from CoefIndet import CoefIndet
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+
+def test_clave_igual_para_escrituras_equivalentes():
+    a = EDOSolver("y''+y=x").clave_cache()
+    b = EDOSolver("y'' + 1*y = x").clave_cache()
+    c = EDOSolver("y'' + y = 1*x + 0").clave_cache()
+    assert a == b == c
+    assert a != EDOSolver("y'' + 2y = x").clave_cache()
+
+
+def test_clave_expande_productos():
+    assert clave_canonica((X + 1)**2) == clave_canonica(X**2 + 2*X + 1)
+    assert clave_canonica('a', [X, sp.Integer(2)]) == clave_canonica('a', (X, sp.Integer(2)))
+
+
+def test_clave_coefindet_incluye_condiciones():
+    c1 = CoefIndet("y'' + y = x")
+    c2 = CoefIndet("y''+y=x")
+    c2.agregar_CI(["y(0)=1", "y'(0)=0"])
+    assert c1.clave_cache() != c2.clave_cache()
+    assert c1.clave_cache() == CoefIndet("y''+1*y=x").clave_cache()
+
+
+def test_acierto_edosolver():
+    cache = CacheSoluciones()
+    s = EDOSolver("y'' + y = x")
+    s.resolver(cache=cache)
+    otro = EDOSolver("y''+y=x")
+    otro.resolver(cache=cache)
+    assert cache.estadisticas()["aciertos"] == 1
+    assert sp.simplify(otro.y_general - s.y_general) == 0
+
+
+def test_acierto_coefindet():
+    cache = CacheSoluciones()
+    CoefIndet("y'' - y = exp(2x)").resolver(cache=cache)
+    otro = CoefIndet("y''-y=exp(2*x)")
+    otro.resolver(cache=cache)
+    assert cache.estadisticas()["aciertos"] == 1
+    assert otro.sol is not None
+
+
+def test_lru_y_disco(tmp_path):
+    cache = CacheSoluciones(max_entradas=2, directorio=str(tmp_path))
+    for i in range(3):
+        cache.guardar(('k', i), {'v': i})
+    assert len(cache) == 2
+    #La primera salio de memoria pero sigue en disco
+    assert cache.obtener(('k', 0)) == {'v': 0}
+    assert cache.estadisticas()["aciertos_disco"] == 1
+    assert cache.obtener(('k', 9)) is None
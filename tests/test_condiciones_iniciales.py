@@ -0,0 +1,51 @@
+import sympy as sp
+
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+
+def _resuelto(ecuacion):
+    s = EDOSolver(ecuacion)
+    s.resolver()
+    return s
+
+
+def test_constantes_exactas_por_defecto():
+    s = _resuelto("y'' + y = x")
+    s.gestionar_condiciones_iniciales(["y(0)=1/2", "y'(0)=0"])
+    final = s.get_solucion_final()
+    assert not final.atoms(sp.Float)
+    assert sp.simplify(final - (X - sp.sin(X) + sp.cos(X) / 2)) == 0
+
+
+def test_constantes_en_punto_flotante():
+    s = _resuelto("y''' - y = exp(x)")
+    s.gestionar_condiciones_iniciales(["y(0)=1", "y'(0)=0", "y''(0)=0"], exacto=False)
+    final = s.get_solucion_final()
+    assert final.atoms(sp.Float)
+    exacta = _resuelto("y''' - y = exp(x)")
+    exacta.gestionar_condiciones_iniciales(["y(0)=1", "y'(0)=0", "y''(0)=0"])
+    for p in (0.3, 1.2):
+        assert abs(complex(sp.N(final.subs(X, p) - exacta.get_solucion_final().subs(X, p)))) < 1e-9
+
+
+def test_condiciones_en_distintos_puntos(calcular_residuo):
+    s = _resuelto("y'' + y = x")
+    s.gestionar_condiciones_iniciales(["y(pi/2)=1", "y(0)=0"])
+    final = s.get_solucion_final()
+    assert sp.simplify(final.subs(X, sp.pi / 2) - 1) == 0
+    assert sp.simplify(final.subs(X, 0)) == 0
+    assert calcular_residuo("y'' + y = x", final) < 1e-9
+
+
+def test_sistema_singular():
+    s = _resuelto("y'' + y = x")
+    assert s.gestionar_condiciones_iniciales(["y(0)=1", "y(pi)=0"]) == \
+        "No se encontró solución única para las constantes."
+    assert s.gestionar_condiciones_iniciales(["y(0)=1", "y(pi)=0"], exacto=False) == \
+        "No se encontró solución única para las constantes."
+
+
+def test_cantidad_de_condiciones():
+    s = _resuelto("y'' + y = x")
+    assert s.gestionar_condiciones_iniciales(["y(0)=1"]).startswith("Error: Se requieren 2")
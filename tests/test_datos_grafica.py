@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from CoefIndet import CoefIndet
+from MetodoVariacionParametros import EDOSolver
+
+
+def test_variacion_devuelve_datos():
+    s = EDOSolver("y'' + y = x")
+    s.resolver()
+    s.gestionar_condiciones_iniciales(["y(0)=1", "y'(0)=0"])
+    (x, y), msg = s.datos_grafica(-2, 2)
+    assert msg == "Gráfico generado con éxito"
+    np.testing.assert_allclose(y, x - np.sin(x) + np.cos(x), atol=1e-9)
+
+
+def test_variacion_sin_condiciones_no_grafica():
+    s = EDOSolver("y'' + y = x")
+    s.resolver()
+    datos, msg = s.datos_grafica()
+    assert datos is None
+    assert "constantes" in msg
+
+
+def test_coefindet_devuelve_datos_con_c_igual_a_uno():
+    c = CoefIndet("y'' - y = 0")
+    c.resolver()
+    (x, y), _ = c.datos_grafica(0, 1)
+    np.testing.assert_allclose(y, np.exp(x) + np.exp(-x), rtol=1e-9)
+
+
+def test_graficar_cierra_la_figura(monkeypatch):
+    plt = pytest.importorskip("matplotlib.pyplot")
+    plt.switch_backend("Agg")
+    monkeypatch.setattr(plt, "show", lambda: None)
+    c = CoefIndet("y'' + y = x")
+    c.resolver()
+    c.graficar()
+    assert plt.get_fignums() == []
@@ -0,0 +1,36 @@
+import pytest
+
+from enrutador import elegir_metodo, obtener_solucion, orden_metodos, resolver_automatico
+
+
+@pytest.mark.parametrize("ecuacion, metodo", [
+    ("y'' + y = x*exp(x) + sin(3x)", "indeterminados"),
+    ("y'' - 9y = 5", "indeterminados"),
+    ("y'' + y = tan(x)", "variacion"),
+    ("y'' + 4y = ln(x)", "variacion"),
+    ("x*y' + y = x", "indeterminados"),
+])
+def test_elegir_metodo(ecuacion, metodo):
+    assert elegir_metodo(ecuacion) == metodo
+
+
+def test_orden_incluye_respaldo():
+    assert orden_metodos("y'' + y = tan(x)") == ("variacion", "indeterminados")
+    assert orden_metodos("y'' + y = x") == ("indeterminados", "variacion")
+
+
+def test_resolver_automatico_con_condiciones(calcular_residuo):
+    avisos = []
+    metodo, solver = resolver_automatico("y'' + y = x", ["y(0)=1", "y'(0)=0"], avisar=avisos.append)
+    assert metodo == "indeterminados"
+    assert avisos and "Coeficientes Indeterminados" in avisos[0]
+    y = obtener_solucion(solver)
+    assert y.subs("x", 0) == 1
+    assert calcular_residuo("y'' + y = x", y) < 1e-9
+
+
+def test_tiempo_agotado_en_ambos_metodos():
+    avisos = []
+    with pytest.raises(ValueError, match="tiempo agotado"):
+        resolver_automatico("y'' + 4y = ln(x)", tiempo_limite=1, avisar=avisos.append)
+    assert len(avisos) == 2 and avisos[1].startswith("Falló variacion")
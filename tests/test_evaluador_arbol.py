@@ -0,0 +1,81 @@
+import numpy as np
+import sympy as sp
+
+from CoefIndet import CoefIndet
+from evaluador import EvaluadorArbol, compilar, compilar_lista
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+T = sp.Symbol('t')
+
+
+def test_igual_a_lambdify():
+    expr = sp.exp(-X) * sp.sin(3 * X) + sp.sqrt(X**2 + 1) + sp.Abs(X) + sp.atan(X)
+    xs = np.linspace(-2, 2, 21)
+    np.testing.assert_allclose(EvaluadorArbol(expr, X)(xs), sp.lambdify(X, expr)(xs), rtol=1e-12)
+
+
+def test_integral_indefinida_desde_cero():
+    xs = np.linspace(-2, 2, 9)
+    ys = EvaluadorArbol(sp.Integral(sp.exp(-X**2), X), X)(xs)
+    exacta = np.array([float(sp.sqrt(sp.pi) / 2 * sp.erf(v)) for v in xs])
+    np.testing.assert_allclose(ys, exacta, atol=1e-6)
+
+
+def test_integral_definida_con_extremo_en_x():
+    expr = sp.Integral(sp.sin(T) / T, (T, 1, X))
+    ys = EvaluadorArbol(expr, X)(np.array([2.0, 3.0]))
+    exacta = [float(sp.Si(v) - sp.Si(1)) for v in (2, 3)]
+    np.testing.assert_allclose(ys, exacta, atol=1e-6)
+    #compilar manda las integrales al arbol
+    np.testing.assert_allclose(compilar(expr, X)(np.array([2.0, 3.0])), exacta, atol=1e-6)
+
+
+def test_nan_de_punto_flotante_se_recalcula():
+    #Con floats log(sin(x) - 1) es NaN; en la rama principal la diferencia es i*pi
+    expr = sp.log(sp.sin(X) - 1) - sp.log(1 - sp.sin(X))
+    xs = np.linspace(-1, 1, 5)
+    with np.errstate(all='ignore'):
+        assert np.isnan(sp.lambdify(X, expr)(xs)).all()
+    np.testing.assert_allclose(compilar(expr, X)(xs), 1j * np.pi, atol=1e-12)
+    #Parte imaginaria despreciable: el arbol devuelve floats
+    assert not np.iscomplexobj(EvaluadorArbol(expr - sp.I * sp.pi, X)(xs))
+
+
+def test_funciones_sin_equivalente_en_numpy():
+    ys = compilar_lista([sp.airyai(X), sp.airyaiprime(X), X], X)(np.array([0.0, 1.0]))
+    np.testing.assert_allclose(ys[0], [float(sp.airyai(0)), float(sp.airyai(1))], rtol=1e-10)
+    np.testing.assert_allclose(ys[1], [float(sp.airyaiprime(0)), float(sp.airyaiprime(1))], rtol=1e-10)
+
+
+def test_por_tramos():
+    expr = sp.Piecewise((X**2, X < 0), (sp.sin(X), True))
+    xs = np.array([-1.0, 0.5])
+    np.testing.assert_allclose(EvaluadorArbol(expr, X)(xs), [1.0, np.sin(0.5)])
+
+
+def test_grafica_tan_con_condiciones_finita():
+    s = EDOSolver("y'' + y = tan(x)")
+    s.resolver()
+    s.gestionar_condiciones_iniciales(["y(0)=0", "y'(0)=0"])
+    (x, y), _ = s.datos_grafica(-1, 1)
+    assert np.isfinite(y).all()
+    (xn, yn), _ = s.datos_grafica_numerica(-1, 1)
+    assert np.max(np.abs(np.interp(xn, x, y) - yn)) < 1e-4
+    c = CoefIndet("y'' + y = tan(x)")
+    c.agregar_CI(["y(0)=0", "y'(0)=0"])
+    c.resolver()
+    (xc, yc), _ = c.datos_grafica(-1, 1)
+    assert np.isfinite(yc).all()
+    assert np.max(np.abs(yc - np.interp(xc, x, y))) < 1e-4
+
+
+def test_integral_sin_evaluar_en_la_solucion():
+    s = EDOSolver("y'' + 4y = ln(x)", paralelo=True, tiempo_limite=1)
+    s.resolver()
+    assert s.y_general.has(sp.Integral)
+    s.gestionar_condiciones_iniciales(["y(1)=0", "y'(1)=0"])
+    (x, y), _ = s.datos_grafica(0.5, 3)
+    (xn, yn), _ = s.datos_grafica_numerica(0.5, 3)
+    assert np.isfinite(y).all()
+    assert np.max(np.abs(np.interp(xn, x, y) - yn)) < 1e-3
@@ -0,0 +1,43 @@
+import numpy as np
+import sympy as sp
+
+from evaluador import compilar, compilar_lista, obtener_evaluador
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+
+def test_compilar_igual_a_lambdify():
+    expr = sp.exp(-X) * sp.sin(3 * X) + sp.exp(-X) * sp.cos(3 * X) + X**2
+    xs = np.linspace(-2, 2, 41)
+    np.testing.assert_allclose(compilar(expr, X)(xs), sp.lambdify(X, expr)(xs))
+
+
+def test_constante_con_la_forma_de_x():
+    ys = compilar(sp.Integer(3), X)(np.linspace(0, 1, 5))
+    assert ys.shape == (5,)
+    assert np.all(ys == 3.0)
+
+
+def test_lista_comparte_cse():
+    exprs = [sp.sin(X)**2, sp.cos(X)**2, sp.Integer(1)]
+    ys = compilar_lista(exprs, X)(np.linspace(0, 3, 7))
+    assert ys.shape == (3, 7)
+    np.testing.assert_allclose(ys[0] + ys[1], ys[2])
+    assert compilar_lista([], X)(np.zeros(4)).shape == (0, 4)
+
+
+def test_evaluador_se_compila_una_vez():
+    evaluadores = {}
+    primero = obtener_evaluador(evaluadores, sp.sin(X), X)
+    assert obtener_evaluador(evaluadores, sp.sin(X), X) is primero
+    assert len(evaluadores) == 1
+
+
+def test_solver_reutiliza_el_evaluador():
+    s = EDOSolver("y'' + y = x")
+    s.resolver()
+    s.gestionar_condiciones_iniciales(["y(0)=1", "y'(0)=0"])
+    xs = np.linspace(0, 1, 5)
+    np.testing.assert_allclose(s.evaluar_solucion(xs), xs - np.sin(xs) + np.cos(xs), atol=1e-12)
+    s.evaluar_solucion(xs)
+    assert len(s.evaluadores) == 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from CoefIndet import CoefIndet
+from condiciones import familia_soluciones
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+CONJUNTOS = [["y(0)=1", "y'(0)=0"], ["y(0)=0", "y'(0)=1"], [(0, 1.0, 2.0), (1, 0.0, -1.0)]]
+
+
+def test_familia_variacion_coincide_con_cada_solucion():
+    s = EDOSolver("y'' + y = x")
+    s.resolver()
+    x = np.linspace(-1, 2, 9)
+    curvas = s.familia_soluciones(CONJUNTOS, x)
+    assert curvas.shape == (3, 9)
+    for conjunto, curva in zip(CONJUNTOS[:2], curvas):
+        individual = EDOSolver("y'' + y = x")
+        individual.resolver()
+        individual.gestionar_condiciones_iniciales(conjunto)
+        np.testing.assert_allclose(curva, individual.evaluar_solucion(x), atol=1e-12)
+    #y(1) = 2 en el tercer conjunto
+    assert abs(s.familia_soluciones([CONJUNTOS[2]], np.array([1.0]))[0, 0] - 2) < 1e-12
+
+
+def test_familia_coefindet_usa_la_general_aunque_tenga_condiciones():
+    c = CoefIndet("y'' + y = x")
+    c.agregar_CI(["y(0)=1", "y'(0)=0"])
+    c.resolver()
+    x = np.linspace(0, 1, 5)
+    curvas = c.familia_soluciones(CONJUNTOS[:2], x)
+    np.testing.assert_allclose(curvas[0], x - np.sin(x) + np.cos(x), atol=1e-12)
+    np.testing.assert_allclose(curvas[1], x, atol=1e-12)
+
+
+def test_constantes_dentro_de_productos():
+    C1 = sp.Symbol('C1')
+    curvas = familia_soluciones(sp.expand(C1 * (1 + X) / X), [C1], X, [["y(1)=2"]], np.array([1.0, 2.0]))
+    np.testing.assert_allclose(curvas[0], [2.0, 1.5])
+
+
+def test_funciones_especiales():
+    c = CoefIndet("y'' - x*y = 0")
+    c.resolver()
+    curvas = c.familia_soluciones([["y(0)=1", "y'(0)=0"]], np.array([0.0, 0.5, 1.0]))
+    #Serie de Taylor de la solucion de Airy par: 1 + x^3/6 + x^6/180 + ...
+    np.testing.assert_allclose(curvas[0], [1.0, 1.02094, 1.17230], atol=1e-4)
+
+
+def test_conjunto_singular():
+    s = EDOSolver("y'' + y = x")
+    s.resolver()
+    with pytest.raises(ValueError, match="no determina"):
+        s.familia_soluciones([["y(0)=1", "y(pi)=0"]], np.linspace(0, 1, 3))
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+import green
+from green import FuncionGreen, convolucion_causal
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+
+def _solver(ecuacion, condiciones):
+    s = EDOSolver(ecuacion)
+    s.resolver()
+    s.gestionar_condiciones_iniciales(condiciones)
+    return s
+
+
+def test_convolucion_igual_a_la_directa():
+    rng = np.random.default_rng(0)
+    nucleo, f, h = rng.normal(size=50), rng.normal(size=50), 0.1
+    directa = [h * (sum(nucleo[i - j] * f[j] for j in range(i + 1))
+                    - 0.5 * nucleo[i] * f[0] - 0.5 * nucleo[0] * f[i]) for i in range(50)]
+    np.testing.assert_allclose(convolucion_causal(nucleo, f, h), directa, atol=1e-12)
+
+
+def test_respuesta_impulso():
+    g = FuncionGreen((2, 0, 2), [sp.cos(X), sp.sin(X)], X).g
+    assert sp.simplify(g - sp.sin(X) / 2) == 0
+
+
+@pytest.mark.parametrize("ecuacion, condiciones, x_min, x_max", [
+    ("y'' + y = x", ["y(0)=1", "y'(0)=0"], -2, 5),
+    ("2y''' - 2y = exp(x)", ["y(0)=1", "y'(0)=0", "y''(0)=0"], 0, 3),
+    ("y'' + 2y' + 5y = cos(3x)", ["y(1)=0", "y'(1)=1"], 0, 4),
+])
+def test_coincide_con_la_solucion_simbolica(ecuacion, condiciones, x_min, x_max):
+    s = _solver(ecuacion, condiciones)
+    (x, y), _ = s.datos_grafica_green(x_min, x_max, puntos=4001)
+    exacta = sp.lambdify(X, s.get_solucion_final())(x)
+    assert np.max(np.abs(y - exacta) / np.maximum(1, np.abs(exacta))) < 1e-5
+
+
+def test_tan_coincide_con_la_numerica():
+    s = EDOSolver("y'' + y = tan(x)")
+    s.resolver_homogenea()
+    s.condiciones_iniciales = [(0, 0.0, 1.0), (1, 0.0, 0.0)]
+    (x, y), _ = s.datos_grafica_green(0, 1.4, puntos=8193)
+    (xn, yn), _ = s.datos_grafica_numerica(0, 1.4)
+    assert np.max(np.abs(np.interp(xn, x, y) - yn)) < 1e-5
+
+
+def test_muestras_tabuladas():
+    s = EDOSolver("y'' + 2y' + 5y = 0")
+    s.resolver_homogenea()
+    s.condiciones_iniciales = [(0, 0.0, 0.0), (1, 0.0, 0.0)]
+    muestras = np.cos(3 * np.linspace(0, 5, 3001))
+    (x, y), _ = s.datos_grafica_green(0, 5, forzante=muestras)
+    exacta = _solver("y'' + 2y' + 5y = cos(3x)", ["y(0)=0", "y'(0)=0"]).get_solucion_final()
+    assert np.max(np.abs(y - sp.lambdify(X, exacta)(x))) < 1e-5
+
+
+def test_errores():
+    fg = FuncionGreen((1, 0, 1), [sp.cos(X), sp.sin(X)], X)
+    with pytest.raises(ValueError):
+        fg.particular(X, 1, 0)
+    with pytest.raises(ValueError):
+        fg.resolver(X, 0, 1, [(0, 2.0, 1.0)])
+    with pytest.raises(ValueError):
+        fg.particular(sp.Symbol('a') * X, 0, 1)
+
+
+def test_una_funcion_de_green_por_operador():
+    base = (sp.cos(X), sp.sin(X))
+    assert green.obtener((1, 0, 1), base, X) is green.obtener((1, 0, 1), base, X)
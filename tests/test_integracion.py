@@ -0,0 +1,33 @@
+import pytest
+import sympy as sp
+
+from integracion import integrar, integrar_termino
+from parser_edo import X
+
+
+@pytest.mark.parametrize("integrando", [
+    X**3,
+    X**2 * sp.exp(-3 * X),
+    X * sp.exp(2 * X) * sp.cos(5 * X),
+    X**2 * sp.sin(3 * X + 1),
+    sp.exp(X) * sp.sin(X) - 4 * X * sp.cos(2 * X),
+    sp.cos(X)**2,
+])
+def test_tabla_derivada_igual_al_integrando(integrando):
+    resultado, ruta = integrar(integrando, X)
+    assert ruta == 'tabla'
+    assert not resultado.has(sp.Integral)
+    assert sp.simplify(sp.diff(resultado, X) - integrando) == 0
+
+
+def test_resto_va_a_sympy():
+    resultado, ruta = integrar(X * sp.exp(X) + sp.tan(X), X)
+    assert ruta == 'mixta'
+    assert sp.simplify(sp.diff(resultado, X) - X * sp.exp(X) - sp.tan(X)) == 0
+    assert integrar(sp.tan(X), X)[1] == 'sympy'
+
+
+def test_termino_con_b_cero():
+    #cos(0*x + fase) es una constante
+    r = integrar_termino(sp.Integer(2), 1, 0, 0, 'cos', sp.pi / 3, X)
+    assert sp.simplify(r - X**2 / 2) == 0
@@ -0,0 +1,36 @@
+import time
+
+import sympy as sp
+
+from cache_soluciones import CacheSoluciones
+from integracion import integrar_en_paralelo
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+
+#sympy no termina esta integral en segundos
+LENTA = sp.log(X) * sp.sin(2 * X)**2
+
+
+def test_limite_devuelve_integral_sin_evaluar():
+    inicio = time.monotonic()
+    resultados = integrar_en_paralelo([LENTA, X * sp.exp(X), sp.tan(X)], X, tiempo_limite=1)
+    assert time.monotonic() - inicio < 30
+    (lenta, ruta_lenta), (tabla, ruta_tabla), (sympy, ruta_sympy) = resultados
+    assert ruta_lenta == 'tiempo_agotado' and lenta.has(sp.Integral)
+    assert ruta_tabla == 'tabla' and sp.simplify(sp.diff(tabla, X) - X * sp.exp(X)) == 0
+    assert ruta_sympy == 'sympy' and sp.simplify(sp.diff(sympy, X) - sp.tan(X)) == 0
+
+
+def test_paralelo_igual_a_secuencial():
+    integrandos = [X * sp.exp(X), sp.tan(X), sp.exp(X) / X]
+    paralelo = integrar_en_paralelo(integrandos, X, max_procesos=2)
+    for integrando, (resultado, _) in zip(integrandos, paralelo):
+        assert sp.simplify(sp.diff(resultado, X) - integrando) == 0
+
+
+def test_solucion_con_tiempo_agotado_no_se_guarda():
+    cache = CacheSoluciones()
+    s = EDOSolver("y'' + 4y = ln(x)", paralelo=True, tiempo_limite=1)
+    s.resolver(cache=cache)
+    assert 'tiempo_agotado' in s.rutas_integracion
+    assert len(cache) == 0
@@ -0,0 +1,47 @@
+import io
+import json
+
+import sympy as sp
+
+from lote import leer_tareas, procesar_lote, resolver_tarea
+from parser_edo import X
+
+
+def _tareas(*lineas):
+    return list(leer_tareas(io.StringIO("\n".join(lineas))))
+
+
+def test_leer_tareas_errores():
+    tareas = _tareas('"y\'\' + y = x"', '# comentario', '{"id": 1}', '{roto',
+                     json.dumps({"ecuacion": "y' = x", "metodo": "otro"}))
+    assert tareas[0] == ({"ecuacion": "y'' + y = x"}, None)
+    assert "falta el campo" in tareas[1][1]
+    assert "JSON inválido" in tareas[2][1]
+    assert "método desconocido" in tareas[3][1]
+    assert len(tareas) == 4
+
+
+def test_resolver_tarea_con_condiciones_incluye_la_general():
+    resultado = resolver_tarea({"ecuacion": "y'' + y = x", "condiciones": ["y(0)=1", "y'(0)=0"],
+                                "metodo": "indeterminados", "rango": [0, 1]})
+    final = sp.sympify(resultado["solucion_final"], locals={"x": X})
+    assert sp.simplify(final - (X - sp.sin(X) + sp.cos(X))) == 0
+    assert "C1" in resultado["solucion_general"]
+    assert resultado["grafica"]["x"][0] == 0.0
+
+
+def test_tiempo_agotado_y_reemplazo_del_trabajador():
+    tareas = _tareas(json.dumps({"id": "lenta", "ecuacion": "y'' + 4y = ln(x)", "metodo": "variacion"}),
+                     json.dumps({"id": "rapida", "ecuacion": "y'' + y = x"}),
+                     json.dumps({"id": "otra", "ecuacion": "y'' - y = exp(2x)"}))
+    resultados = {r["id"]: r for r in procesar_lote(tareas, procesos=1, tiempo_limite=5)}
+    assert resultados["lenta"]["error"].startswith("tiempo agotado")
+    #El trabajador nuevo atiende las tareas que siguen
+    assert resultados["rapida"]["error"] is None
+    assert resultados["otra"]["error"] is None
+    assert resultados["otra"]["solucion_final"] is not None
+
+
+def test_errores_de_lectura_pasan_al_resultado():
+    resultados = list(procesar_lote(_tareas('{"id": 1}'), procesos=1))
+    assert resultados == [{"indice": 0, "error": "línea 1: falta el campo 'ecuacion'"}]
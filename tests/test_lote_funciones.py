@@ -0,0 +1,26 @@
+import sympy as sp
+
+from MetodoVariacionParametros import EDOSolver, resolver_lote
+from parser_edo import X
+
+
+def test_lote_coincide_con_resoluciones_individuales(calcular_residuo):
+    funciones = ["x", "exp(2x)", "sin(3x)", "x*exp(x)"]
+    resultados = list(resolver_lote("y'' - y", funciones))
+    assert len(resultados) == len(funciones)
+    for texto, (f, y_p, y_general) in zip(funciones, resultados):
+        ecuacion = f"y'' - y = {texto}"
+        assert calcular_residuo(ecuacion, y_p) < 1e-9
+        individual = EDOSolver(ecuacion)
+        individual.resolver()
+        #Misma particular salvo terminos de la homogenea: la diferencia cumple L[d] = 0
+        d = y_general - individual.y_general
+        assert calcular_residuo("y'' - y = 0", d) < 1e-9
+
+
+def test_lote_reutiliza_la_base():
+    solver = EDOSolver("y'' + 4y = 0")
+    list(solver.resolver_lote([sp.cos(X)]))
+    columna = solver.columna_wronskiano
+    list(solver.resolver_lote(["x**2"]))
+    assert solver.columna_wronskiano is columna
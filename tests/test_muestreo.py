@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from muestreo import muestrear
+
+
+def _cortes(x, y):
+    return x[np.isnan(y)]
+
+
+def test_tan_cortes_en_los_polos():
+    x, y = muestrear(np.tan, -5, 5)
+    polos = np.array([-3, -1, 1, 3]) * np.pi / 2
+    cortes = _cortes(x, y)
+    assert len(cortes) == len(polos)
+    np.testing.assert_allclose(cortes, polos, atol=1e-2)
+    assert len(x) <= 2000
+
+
+@pytest.mark.parametrize("funcion", [
+    lambda x: np.cos(30 * x),
+    lambda x: np.sin(x) + np.cos(3 * x),
+    lambda x: np.where(x > 0, 1.0, 0.0),
+    lambda x: x**2,
+])
+def test_funciones_acotadas_sin_cortes(funcion):
+    x, y = muestrear(funcion, -10, 10)
+    assert not np.isnan(y).any()
+    assert len(x) <= 2000
+
+
+def test_oscilacion_rapida_fiel():
+    x, y = muestrear(lambda x: np.cos(30 * x), -5, 5)
+    xf = np.linspace(-5, 5, 100001)
+    assert np.max(np.abs(np.interp(xf, x, y) - np.cos(30 * xf))) < 0.05
+
+
+@pytest.mark.parametrize("max_puntos", [100, 300, 2000])
+def test_respeta_max_puntos(max_puntos):
+    x, y = muestrear(np.tan, -10, 10, max_puntos=max_puntos)
+    assert len(x) <= max_puntos
+    assert np.all(np.diff(x) > 0)
+
+
+def test_constante_y_escalar():
+    x, y = muestrear(lambda x: 3.0, -1, 1)
+    assert np.all(y == 3.0)
+    assert len(x) == 161
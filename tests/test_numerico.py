@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from numerico import datos_numericos, exponencial, matriz_companera
+from parser_edo import X
+
+
+def test_exponencial_igual_a_sympy():
+    A, _ = matriz_companera([1, 2, 5])
+    esperada = np.array(sp.Matrix(A).exp().evalf(), dtype=float)
+    np.testing.assert_allclose(exponencial(A), esperada, rtol=1e-12, atol=1e-12)
+
+
+def test_coeficiente_principal_nulo():
+    with pytest.raises(ValueError):
+        matriz_companera([0, 1, 1])
+
+
+def test_pvi_coincide_con_la_simbolica():
+    (x, y), msg = datos_numericos([1, 0, 1], X, X, [(0, 0, 1), (1, 0, 0)], -10, 10)
+    assert msg == "Solución numérica (matriz compañera)"
+    np.testing.assert_allclose(y, x - np.sin(x) + np.cos(x), atol=1e-8)
+
+
+def test_condiciones_en_otro_punto():
+    f = sp.exp(-X) * sp.cos(3 * X)
+    (x, y), _ = datos_numericos([1, 2, 1], f, X, [(0, 2, 1), (1, 2, 0)], -2, 5)
+    Yf = sp.Function('y')
+    exacta = sp.dsolve(Yf(X).diff(X, 2) + 2 * Yf(X).diff(X) + Yf(X) - f,
+                       ics={Yf(2): 1, Yf(X).diff(X).subs(X, 2): 0}).rhs
+    referencia = sp.lambdify(X, exacta)(x)
+    assert np.max(np.abs(y - referencia) / np.maximum(1, np.abs(referencia))) < 1e-7
+
+
+def test_condiciones_de_frontera():
+    (x, y), _ = datos_numericos([1, 0, 0], 0, X, [(0, 0, 0), (0, 1, 1)], -3, 3)
+    np.testing.assert_allclose(y, x, atol=1e-9)
+
+
+def test_pocas_condiciones_avisan():
+    _, msg = datos_numericos([1, 0, 0, 1], sp.sin(X), X, [(0, 0, 1)], 0, 1)
+    assert "1 de 3" in msg
@@ -0,0 +1,61 @@
+import pytest
+import sympy as sp
+
+from parser_edo import X, Y, parsear_condicion, parsear_ecuacion, parsear_expresion
+
+
+@pytest.mark.parametrize("a, b", [
+    ("y'' + y = x", "y''+1*y=x"),
+    ("y'' + 4y' + 4y = 2x", "y(2) + 4*y(1) + 4*y = 2*x"),
+    ("y'' = -y + tan(x)", "y'' + y = tan(x)"),
+    ("y'' - y = e^x", "y'' - y = exp(x)"),
+    ("y'' + y = ln(x)", "y'' + y = log(x)"),
+])
+def test_escrituras_equivalentes(a, b):
+    ia, ib = parsear_ecuacion(a), parsear_ecuacion(b)
+    assert ia.coeficientes == ib.coeficientes
+    assert sp.simplify(ia.forzante - ib.forzante) == 0
+
+
+def test_representacion():
+    ir = parsear_ecuacion("2y''' - 3y' + y = x*exp(x)")
+    assert ir.orden == 3
+    assert ir.coeficientes == (2, 0, -3, 1)
+    assert ir.forzante == X * sp.exp(X)
+    assert ir.polinomio_caracteristico().all_coeffs() == [2, 0, -3, 1]
+    assert sp.expand(ir.operador() - (ir.lhs - ir.rhs + ir.forzante)) == 0
+
+
+def test_operador_con_y_del_otro_lado():
+    ir = parsear_ecuacion("y'' = -y + tan(x)")
+    assert ir.forzante == sp.tan(X)
+    assert ir.operador() == sp.Derivative(Y, (X, 2)) + Y
+
+
+def test_no_lineal_o_coeficientes_variables():
+    assert not parsear_ecuacion("x*y' + y = x").lineal_constante
+    assert not parsear_ecuacion("y'' + y**2 = 0").lineal_constante
+
+
+@pytest.mark.parametrize("texto, esperada", [
+    ("y(0)=1", (0, 0, 1)),
+    ("y'(0) = -2", (1, 0, -2)),
+    ("y''(pi/2)=1/3", (2, sp.pi / 2, sp.Rational(1, 3))),
+    ("y(4)(1)=0", (4, 1, 0)),
+])
+def test_condiciones(texto, esperada):
+    assert parsear_condicion(texto) == esperada
+
+
+@pytest.mark.parametrize("texto", ["y'' + y", "y'' = x = 1"])
+def test_errores(texto):
+    with pytest.raises(ValueError):
+        parsear_ecuacion(texto)
+
+
+def test_expresion_sin_y():
+    assert parsear_expresion("2x + sin(3x)") == 2 * X + sp.sin(3 * X)
+    with pytest.raises(ValueError):
+        parsear_expresion("y + x")
+    with pytest.raises(ValueError):
+        parsear_condicion("z(0)=1")
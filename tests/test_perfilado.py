@@ -0,0 +1,67 @@
+import pickle
+import time
+
+import sympy as sp
+
+from MetodoVariacionParametros import EDOSolver
+from perfilado import PERFIL_NULO, Perfil, exportar, quitar_exportador, registrar_exportador
+from parser_edo import X
+
+
+def test_etapas_anidadas_descuentan_el_tiempo_interno():
+    perfil = Perfil("prueba")
+    with perfil.etapa("externa"):
+        with perfil.etapa("interna") as medicion:
+            time.sleep(0.02)
+            medicion.tamano(X * sp.exp(X) + 1)
+    etapas = {e.nombre: e for e in perfil.reporte().etapas}
+    assert etapas["externa"].segundos >= etapas["interna"].segundos >= 0.02
+    assert etapas["externa"].propio < etapas["interna"].segundos
+    assert etapas["interna"].operaciones == sp.count_ops(X * sp.exp(X) + 1)
+    assert etapas["externa"].operaciones is None
+    reporte = perfil.reporte()
+    assert abs(reporte.total - etapas["externa"].segundos) < 1e-9
+    assert "interna" in reporte.texto()
+
+
+def test_solver_registra_las_etapas():
+    perfil = Perfil("y'' + y = tan(x)")
+    EDOSolver("y'' + y = tan(x)", perfil=perfil).resolver()
+    nombres = {e.nombre for e in perfil.reporte().etapas}
+    assert {"raices", "cfs", "wronskiano", "solucion_general"} <= nombres
+
+
+def test_perfil_nulo_no_mide():
+    s = EDOSolver("y'' + y = x")
+    assert s.perfil is PERFIL_NULO
+    s.resolver()
+    assert PERFIL_NULO.reporte().etapas == []
+
+
+def test_exportadores():
+    recibidos = []
+
+    def falla(datos):
+        raise RuntimeError("caido")
+
+    registrar_exportador(falla)
+    registrar_exportador(recibidos.append)
+    try:
+        perfil = Perfil("p")
+        perfil.registrar("remota", 0.5)
+        perfil.publicar()
+    finally:
+        quitar_exportador(falla)
+        quitar_exportador(recibidos.append)
+    assert recibidos == [{"nombre": "p", "total": 0.5,
+                          "etapas": [{"nombre": "remota", "llamadas": 1, "segundos": 0.5,
+                                      "propio": 0.5, "operaciones": None}]}]
+    exportar({})
+    assert len(recibidos) == 1
+
+
+def test_se_puede_copiar_a_otro_proceso():
+    perfil = Perfil("p")
+    with perfil.etapa("a"):
+        copia = pickle.loads(pickle.dumps(perfil))
+    assert copia._pila == []
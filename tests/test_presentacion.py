@@ -0,0 +1,60 @@
+import pytest
+import sympy as sp
+
+tk = pytest.importorskip("tkinter")
+
+from parser_edo import X
+from presentacion import LIMITE_CARACTERES, PanelSecciones, Seccion, forma_resumida
+
+GRANDE = sum(sp.Symbol(f"c{i}") * X**i * sp.exp(i * X) * sp.cos(i * X) for i in range(1, 40))
+
+
+def test_contenido_se_calcula_al_abrir():
+    llamadas = []
+
+    def contenido():
+        llamadas.append(1)
+        return X**2
+
+    seccion = Seccion("y", contenido)
+    assert llamadas == []
+    assert seccion.texto() == (sp.pretty(X**2), False)
+    seccion.texto()
+    assert llamadas == [1]
+
+
+def test_expresion_grande_se_resume():
+    texto, completo = forma_resumida(GRANDE)
+    assert not completo
+    assert len(texto) <= LIMITE_CARACTERES + 40
+    seccion = Seccion("y", GRANDE)
+    assert seccion.texto()[1] is True
+    seccion.completa = True
+    assert seccion.texto() == (sp.pretty(GRANDE), False)
+
+
+def test_texto_largo_y_matrices():
+    assert Seccion("log", "a" * (LIMITE_CARACTERES + 10)).texto()[1] is True
+    matriz = Seccion("W", sp.Matrix([[X, 1], [1, X]]))
+    assert matriz.texto() == (sp.pretty(sp.ImmutableMatrix([[X, 1], [1, X]])), False)
+
+
+def test_panel_reescribe_solo_su_seccion():
+    try:
+        raiz = tk.Tk()
+    except tk.TclError:
+        pytest.skip("sin pantalla")
+    try:
+        texto = tk.Text(raiz)
+        panel = PanelSecciones(texto, "blue", "green")
+        panel.agregar(Seccion("A", "uno"))
+        panel.agregar(Seccion("B", "dos", abierta=True))
+        texto.insert("end", "final\n")
+        panel.alternar(0)
+        contenido = texto.get("1.0", "end")
+        assert contenido.index("▾ A") < contenido.index("uno") < contenido.index("▾ B")
+        assert contenido.rstrip().endswith("final")
+        panel.alternar(0)
+        assert "uno" not in texto.get("1.0", "end")
+    finally:
+        raiz.destroy()
@@ -0,0 +1,64 @@
+import pytest
+import sympy as sp
+
+from MetodoVariacionParametros import EDOSolver
+from raices import raices_caracteristicas, raices_numericas
+
+r = sp.Symbol('r')
+
+
+def _coeficientes(polinomio):
+    return sp.Poly(sp.expand(polinomio), r).all_coeffs()
+
+
+def _multiplicidades(raices):
+    return sorted(((complex(z).real, complex(z).imag), m) for z, m in raices.items())
+
+
+@pytest.mark.parametrize("polinomio, esperadas", [
+    ((r - 1)**10, {1: 10}),
+    ((r - 2)**3 * (r + 1)**2, {2: 3, -1: 2}),
+    ((r**2 + 1)**3, {sp.I: 3, -sp.I: 3}),
+    ((r - 1)**2 * (r**2 + 1)**4, {1: 2, sp.I: 4, -sp.I: 4}),
+    ((r**2 + 4 * r + 5)**2, {-2 + sp.I: 2, -2 - sp.I: 2}),
+    (r**7 + r**5, {0: 5, sp.I: 1, -sp.I: 1}),
+    (r**4 * (r - 3)**4, {0: 4, 3: 4}),
+    ((r + 2)**8, {-2: 8}),
+    ((r - sp.Rational(1, 10))**2, {sp.Rational(1, 10): 2}),
+])
+def test_multiplicidades(polinomio, esperadas):
+    obtenidas = raices_numericas(_coeficientes(polinomio))
+    assert _multiplicidades(obtenidas) == pytest.approx(_multiplicidades(esperadas))
+    #Formato de sympy.roots: Float o Float + I*Float, con los pares conjugados completos
+    assert all(z.has(sp.Float) or z == 0 for z in obtenidas)
+
+
+def test_raices_simples():
+    obtenidas = raices_numericas(_coeficientes(r**8 - 1))
+    assert len(obtenidas) == 8 and set(obtenidas.values()) == {1}
+
+
+def test_coeficientes_simbolicos():
+    with pytest.raises(ValueError):
+        raices_numericas([1, sp.Symbol('a'), 1])
+
+
+def test_motor_automatico():
+    assert raices_caracteristicas(sp.Poly(r**2 + 1, r))[1] == "exacto"
+    assert raices_caracteristicas(sp.Poly(r**2 + 0.3 * r + 2.17, r))[1] == "numerico"
+    #Cubica sin raices racionales: sympy daria radicales de Cardano
+    assert raices_caracteristicas(sp.Poly(r**3 + r + 1, r))[1] == "numerico"
+    with pytest.raises(ValueError):
+        raices_caracteristicas(sp.Poly(r, r), motor="otro")
+
+
+@pytest.mark.parametrize("ecuacion", [
+    "y'' + 0.3y' + 2.17y = x",
+    "y''' + y' + y = sin(x)",
+    "y(6) - y = sin(2x)",
+])
+def test_residuo_con_raices_numericas(ecuacion, calcular_residuo):
+    s = EDOSolver(ecuacion, motor_raices='numerico')
+    s.resolver()
+    assert s.motor_raices_usado == "numerico"
+    assert calcular_residuo(ecuacion, s.y_general) < 1e-7
@@ -0,0 +1,50 @@
+import pytest
+import sympy as sp
+
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+from simplificacion import Presupuesto, simplificar
+
+
+def test_identidad_trigonometrica():
+    expr = X * sp.sin(X)**2 + X * sp.cos(X)**2 + sp.exp(X) * sp.exp(2 * X)
+    assert simplificar(expr, X, nivel="dirigida") == X + sp.exp(3 * X)
+
+
+def test_ninguna_devuelve_la_expresion():
+    expr = X * sp.sin(X)**2 + X * sp.cos(X)**2
+    assert simplificar(expr, X, nivel="ninguna") is expr
+    with pytest.raises(ValueError):
+        simplificar(expr, X, nivel="toda")
+
+
+def test_en_la_familia_no_llama_a_simplify():
+    presupuesto = Presupuesto()
+    simplificar(X * sp.exp(X) * sp.cos(2 * X) + 3, X, presupuesto=presupuesto)
+    assert presupuesto.llamadas == 0
+
+
+def test_presupuesto_agotado():
+    expr = sp.log(sp.exp(X) * X) - sp.log(X)
+    agotado = Presupuesto(segundos=0.0)
+    assert simplificar(expr, X, presupuesto=agotado) == sp.expand(expr)
+    assert agotado.llamadas == 0
+    presupuesto = Presupuesto()
+    simplificar(expr, X, presupuesto=presupuesto)
+    assert presupuesto.llamadas == 1
+    #Expresiones grandes no van a simplify
+    chico = Presupuesto(max_operaciones=1)
+    simplificar(expr, X, presupuesto=chico)
+    assert chico.llamadas == 0
+
+
+def test_nivel_entra_en_la_clave_de_cache():
+    auto = EDOSolver("y'' + y = x").clave_cache()
+    assert EDOSolver("y'' + y = x", simplificacion='ninguna').clave_cache() != auto
+
+
+@pytest.mark.parametrize("nivel", ["auto", "dirigida", "ninguna"])
+def test_todos_los_niveles_dan_soluciones(nivel, calcular_residuo):
+    s = EDOSolver("y'' + y = tan(x)", simplificacion=nivel)
+    s.resolver()
+    assert calcular_residuo("y'' + y = tan(x)", s.y_general) < 1e-9
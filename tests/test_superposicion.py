@@ -0,0 +1,56 @@
+import operator
+
+import pytest
+import sympy as sp
+
+from CoefIndet import CoefIndet
+from MetodoVariacionParametros import EDOSolver
+from parser_edo import X
+from superposicion import agrupar_terminos, cache_terminos, es_familia, resolver_grupos
+
+
+def test_agrupar_por_tipo():
+    f = 3 * sp.exp(2 * X) + X * sp.exp(2 * X) + sp.sin(X) + sp.cos(-X) + sp.tan(X) + X * sp.tan(X) + 5
+    grupos = dict(agrupar_terminos(f, X))
+    assert grupos[('familia', '2', '0')] == 3 * sp.exp(2 * X) + X * sp.exp(2 * X)
+    assert grupos[('familia', '0', '1')] == sp.sin(X) + sp.cos(X)
+    assert grupos[('otros', ('tan',))] == sp.tan(X) + X * sp.tan(X)
+    assert grupos[('familia', '0', '0')] == 5
+    assert sum(grupos.values()) == f
+    assert not es_familia(('otros', ('tan',)))
+
+
+def test_raices_no_enteras_quedan_fuera_de_la_familia():
+    assert agrupar_terminos(sp.sqrt(X), X) == [(('otros', ('Pow',)), sp.sqrt(X))]
+
+
+@pytest.mark.parametrize("ecuacion", [
+    "y'' = -y + tan(x)",
+    "y'' + y = tan(x) + x*exp(x)",
+    "y'' - y = exp(x)*ln(x) + sin(x)",
+])
+@pytest.mark.parametrize("solver", ["variacion", "indeterminados"])
+def test_residuo_por_superposicion(ecuacion, solver, calcular_residuo):
+    if solver == "variacion":
+        s = EDOSolver(ecuacion)
+        s.resolver()
+        y = s.y_general
+    else:
+        s = CoefIndet(ecuacion)
+        s.resolver()
+        y = s.sol.rhs
+    assert calcular_residuo(ecuacion, y) < 1e-8
+
+
+def test_terminos_compartidos_salen_de_la_cache():
+    cache_terminos.limpiar()
+    CoefIndet("y'' + 4y = tan(x) + x").resolver()
+    antes = cache_terminos.estadisticas()["aciertos"]
+    CoefIndet("y'' + 4y = tan(x) + exp(x)").resolver()
+    assert cache_terminos.estadisticas()["aciertos"] == antes + 1
+
+
+def test_resolver_grupos_en_paralelo():
+    argumentos = [(1, 2), (3, 4), (5, 6)]
+    assert resolver_grupos(operator.mul, argumentos, paralelo=True, max_procesos=2) == [2, 12, 30]
+    assert resolver_grupos(operator.mul, argumentos) == [2, 12, 30]
@@ -0,0 +1,47 @@
+import time
+
+from trabajador import Trabajador
+
+
+def _esperar(trabajador, segundos=60):
+    mensajes = []
+    limite = time.monotonic() + segundos
+    while time.monotonic() < limite:
+        mensajes.extend(trabajador.mensajes())
+        if trabajador.terminado:
+            return mensajes
+        time.sleep(0.05)
+    trabajador.cancelar()
+    raise AssertionError(f"sin respuesta en {segundos} s: {mensajes}")
+
+
+def test_resultado_con_progreso():
+    trabajador = Trabajador("variacion", "y'' + y = x")
+    trabajador.iniciar()
+    mensajes = _esperar(trabajador)
+    tipos = [tipo for tipo, _ in mensajes]
+    assert "progreso" in tipos
+    assert tipos[-1] == "resultado"
+    assert mensajes[-1][1].y_general is not None
+
+
+def test_error_de_parseo():
+    trabajador = Trabajador("coeficientes", "y'' + y")
+    trabajador.iniciar()
+    assert _esperar(trabajador)[-1][0] == "error"
+
+
+def test_cancelar_termina_el_proceso():
+    trabajador = Trabajador("variacion", "y'' + 4y = ln(x)")
+    trabajador.iniciar()
+    trabajador.cancelar()
+    assert not trabajador.activo()
+    assert not trabajador.proceso.is_alive()
+
+
+def test_tiempo_limite_prueba_el_otro_metodo():
+    trabajador = Trabajador("auto", "y'' + 4y = ln(x)", tiempo_limite=1)
+    trabajador.iniciar()
+    mensajes = _esperar(trabajador, segundos=120)
+    assert any("tiempo agotado" in str(texto) for _, texto in mensajes)
+    assert mensajes[-1][0] in ("resultado", "error")
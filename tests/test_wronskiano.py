@@ -0,0 +1,38 @@
+import pytest
+import sympy as sp
+
+from MetodoVariacionParametros import EDOSolver
+from wronskiano import columna_inversa_estructurada, determinante_wronskiano
+
+
+@pytest.mark.parametrize("ecuacion", [
+    "y'' + y = 0",
+    "2y'' + 3y' + y = 0",
+    "y''' - 3y'' + 3y' - y = 0",
+    "y'''' + 2y'' + y = 0",
+    "y'''' + 4y''' + 14y'' + 20y' + 25y = 0",
+    "y(6) - y = 0",
+])
+def test_w_por_columna_es_e_n(ecuacion):
+    s = EDOSolver(ecuacion, motor_raices='exacto')
+    s.resolver_homogenea()
+    columna = columna_inversa_estructurada(s.raices, s.fHomogenea, s.y, s.x, s.grado)
+    assert columna is not None
+    r = s._hacerWronskiano() * columna
+    r[-1] -= 1
+    for x0 in (0.3, 1.7):
+        assert max(abs(complex(sp.N(v.subs(s.x, x0)))) for v in r) < 1e-9
+
+
+def test_raices_incompletas_devuelven_none():
+    s = EDOSolver("y'' + y = 0")
+    s.resolver_homogenea()
+    raices = dict(list(s.raices.items())[:1])
+    assert columna_inversa_estructurada(raices, s.fHomogenea, s.y, s.x, s.grado) is None
+
+
+def test_determinante_por_abel():
+    s = EDOSolver("y'' + 3y' + 2y = 0")
+    s.resolver_homogenea()
+    W = determinante_wronskiano(s.CFS, s.fHomogenea, s.y, s.x, s.grado)
+    assert sp.simplify(W - s._hacerWronskiano().det()) == 0
@@ -0,0 +1,153 @@
+import multiprocessing
+import queue
+import time
+
+
+def crear_solver(metodo, ecuacion, condiciones=None, perfil=None):
+    if metodo == "variacion":
+        from MetodoVariacionParametros import EDOSolver
+        return EDOSolver(ecuacion, perfil=perfil)
+
+    from CoefIndet import CoefIndet
+    solver = CoefIndet(ecuacion, perfil=perfil)
+    if condiciones:
+        solver.agregar_CI(condiciones)
+    return solver
+
+
+#Etapas del calculo; avisar(texto) recibe el progreso de cada una
+def ejecutar_etapas(solver, avisar):
+    if hasattr(solver, "resolver_homogenea"):
+        avisar("Resolviendo homogénea (raíces y CFS)...")
+        solver.resolver_homogenea()
+        avisar("Resolviendo particular (Wronskiano e integrales)...")
+        solver.resolver_particular()
+        avisar("Formando solución general...")
+        solver.crear_solucion_general()
+    else:
+        avisar("Resolviendo por Coeficientes Indeterminados...")
+        solver.resolver()
+
+
+#intento: un solo metodo del modo automatico (con condiciones tambien en variacion)
+def _proceso_trabajador(metodo, ecuacion, condiciones, perfilar, cola, intento=False):
+    avisar = lambda texto: cola.put(("progreso", texto))
+    perfil = None
+    if perfilar:
+        from perfilado import Perfil
+        perfil = Perfil(ecuacion)
+    try:
+        #Cada intento lo anuncia el Trabajador
+        if not intento:
+            cola.put(("progreso", "Analizando ecuación..."))
+        if metodo == "auto":
+            from enrutador import resolver_automatico
+            _, solver = resolver_automatico(ecuacion, condiciones, avisar=avisar, perfil=perfil)
+        elif intento:
+            from enrutador import resolver_con_metodo
+            solver = resolver_con_metodo(metodo, ecuacion, condiciones, None, perfil)
+        else:
+            solver = crear_solver(metodo, ecuacion, condiciones, perfil)
+            ejecutar_etapas(solver, avisar)
+        cola.put(("resultado", solver))
+    except Exception as e:
+        cola.put(("error", str(e)))
+
+
+#Resolucion en un proceso aparte para no bloquear el hilo de Tk.
+#cancelar() termina el proceso aunque sympy siga ocupado.
+#perfilar: medir las etapas; el perfil vuelve dentro del solver (solver.perfil)
+#tiempo_limite (solo en modo automatico): segundos por metodo. Cada metodo corre
+#en su propio proceso y, si falla o se pasa del limite, se prueba el otro en uno
+#nuevo (el proceso es daemon y no puede abrir otros, ver enrutador.py)
+class Trabajador:
+    def __init__(self, metodo, ecuacion, condiciones=None, perfilar=False, tiempo_limite=None):
+        self.metodo = metodo
+        self.ecuacion = ecuacion
+        self.condiciones = list(condiciones or [])
+        self.perfilar = perfilar
+        self.tiempo_limite = tiempo_limite if metodo == "auto" else None
+
+        self.contexto = multiprocessing.get_context()
+        #Metodos que faltan probar y errores de los ya probados (con limite de tiempo)
+        self.intentos = []
+        self.errores = []
+        #Mensajes del propio Trabajador que se entregan con los del proceso
+        self.avisos = []
+        if self.tiempo_limite is None:
+            self._preparar(metodo)
+        else:
+            from enrutador import NOMBRES_METODOS, orden_metodos
+            self.intentos = list(orden_metodos(ecuacion))
+            self._preparar(self.intentos.pop(0))
+            self.avisos.append(("progreso", f"Método elegido: {NOMBRES_METODOS[self.metodo_actual]}..."))
+        self.terminado = False
+
+    #Una cola por proceso: terminar un proceso puede dejar su cola inservible
+    def _preparar(self, metodo):
+        self.metodo_actual = metodo
+        self.cola = self.contexto.Queue()
+        intento = self.tiempo_limite is not None
+        self.proceso = self.contexto.Process(target=_proceso_trabajador,
+                                             args=(metodo, self.ecuacion, self.condiciones, self.perfilar,
+                                                   self.cola, intento),
+                                             daemon=True)
+
+    def iniciar(self):
+        self.inicio = time.monotonic()
+        self.proceso.start()
+
+    def _detener(self):
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+            self.proceso.join(timeout=1)
+        self.cola.close()
+
+    def cancelar(self):
+        self._detener()
+        self.terminado = True
+
+    def activo(self):
+        return not self.terminado and self.proceso.is_alive()
+
+    #Con el metodo actual fallido: el siguiente en un proceso nuevo, o el error final
+    def _fallo(self, error):
+        self._detener()
+        from enrutador import NOMBRES_METODOS
+        self.errores.append(f"{self.metodo_actual}: {error}")
+        if not self.intentos:
+            self.terminado = True
+            return ("error", "Ningún método pudo resolver la ecuación. " + "; ".join(self.errores))
+        self._preparar(self.intentos.pop(0))
+        self.iniciar()
+        return ("progreso", f"Falló {self.errores[-1]}; probando {NOMBRES_METODOS[self.metodo_actual]}...")
+
+    #Mensajes pendientes sin bloquear: ("progreso", texto), ("resultado", solver) o ("error", texto)
+    def mensajes(self):
+        pendientes, self.avisos = self.avisos, []
+        while not self.terminado:
+            try:
+                mensaje = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            if mensaje[0] == "error" and self.tiempo_limite is not None:
+                pendientes.append(self._fallo(mensaje[1]))
+                continue
+            pendientes.append(mensaje)
+            if mensaje[0] in ("resultado", "error"):
+                self.terminado = True
+                self.proceso.join(timeout=1)
+
+        if (not self.terminado and self.tiempo_limite is not None
+                and time.monotonic() - self.inicio > self.tiempo_limite):
+            pendientes.append(self._fallo(f"tiempo agotado ({self.tiempo_limite} s)"))
+
+        #El proceso murio sin avisar (por ejemplo, sin memoria)
+        if not pendientes and not self.terminado and not self.proceso.is_alive() and self.cola.empty():
+            error = "El proceso de cálculo terminó inesperadamente."
+            if self.tiempo_limite is not None:
+                pendientes.append(self._fallo(error))
+            else:
+                self.terminado = True
+                pendientes.append(("error", error))
+        return pendientes
@@ -0,0 +1,129 @@
+import sympy as sp
+
+
+#Ultima columna de W^-1 en forma cerrada para una CFS de la forma x^k e^{ax} {cos,sin}(bx).
+#
+#Si g(x) es la respuesta al impulso del operador monico p(D), entonces
+#g(x - t) = sum_k y_k(x) w_k(t), donde w es justamente la ultima columna de W^-1.
+#Con la fraccion parcial 1/p(s) = sum A_ij / (s - r_i)^(j+1) se obtiene
+#w para x^l e^{r x}:  e^{-r t} sum_{j>=l} A_ij / j! * C(j, l) * (-t)^(j-l)
+#
+#Devuelve None si la base no es reconocible (raices incompletas o simbolicas);
+#en ese caso se usa la resolucion generica del Wronskiano.
+def columna_inversa_estructurada(raices, fHomogenea, y, x, grado):
+    try:
+        polinomio = sp.Poly(fHomogenea, y).monic()
+    except sp.PolynomialError:
+        return None
+
+    if sum(raices.values()) != grado or polinomio.degree() != grado:
+        return None
+
+    columna = []
+    raicesProcesadas = set()
+
+    for raiz, multiplicidad in raices.items():
+        if raiz in raicesProcesadas:
+            continue
+        alfa = sp.re(raiz)
+        beta = sp.im(raiz)
+
+        es_compleja = beta != 0
+        if not isinstance(es_compleja, bool):
+            return None
+
+        if es_compleja:
+            if beta.is_negative:
+                continue
+            raicesProcesadas.add(raiz)
+            raicesProcesadas.add(sp.conjugate(raiz))
+            beta = abs(beta)
+            r = alfa + sp.I * beta
+        else:
+            raicesProcesadas.add(raiz)
+            r = alfa
+
+        A = _coeficientes_fraccion_parcial(polinomio, r, multiplicidad)
+        if A is None:
+            return None
+
+        for l in range(multiplicidad):
+            P = 0
+            for j in range(l, multiplicidad):
+                P += A[j] / sp.factorial(j) * sp.binomial(j, l) * (-x)**(j - l)
+            P = sp.expand(P)
+
+            if es_compleja:
+                a, b = _partes_real_imaginaria(P, x)
+                coseno = sp.cos(beta * x)
+                seno = sp.sin(beta * x)
+                exponencial = sp.exp(-alfa * x)
+                #w_cos = 2 Re(e^{-r x} P),  w_sin = -2 Im(e^{-r x} P)
+                columna.append(sp.expand(2 * exponencial * (a * coseno + b * seno)))
+                columna.append(sp.expand(-2 * exponencial * (b * coseno - a * seno)))
+            else:
+                columna.append(sp.expand(sp.exp(-alfa * x) * P))
+
+    if len(columna) != grado:
+        return None
+    return sp.Matrix(columna)
+
+
+#Determinante del Wronskiano por la formula de Abel: W(x) = W(0) * exp(-a_{n-1} x)
+def determinante_wronskiano(CFS, fHomogenea, y, x, grado):
+    polinomio = sp.Poly(fHomogenea, y).monic()
+    coeficientes = polinomio.all_coeffs()
+    a_n1 = coeficientes[1] if grado >= 1 else 0
+
+    matriz = sp.zeros(grado, grado)
+    for i in range(grado):
+        funcion = CFS[i]
+        for j in range(grado):
+            matriz[j, i] = funcion.subs(x, 0)
+            funcion = sp.diff(funcion, x)
+    return matriz.det() * sp.exp(-a_n1 * x)
+
+
+#A_j (coeficiente de 1/(s - r)^(j+1)) para una raiz de multiplicidad m.
+#Con p(s) = (s - r)^m q(s) los coeficientes de Taylor de q en r son
+#q_j = p^(m+j)(r) / (m+j)!, y 1/q se obtiene por division de series.
+def _coeficientes_fraccion_parcial(polinomio, r, multiplicidad):
+    derivada = polinomio
+    for _ in range(multiplicidad):
+        derivada = derivada.diff()
+
+    q = []
+    for j in range(multiplicidad):
+        q.append(sp.expand(derivada.eval(r) / sp.factorial(multiplicidad + j)))
+        derivada = derivada.diff()
+
+    if q[0] == 0:
+        return None
+
+    inverso_q0 = _inverso(q[0])
+    h = [inverso_q0]
+    for k in range(1, multiplicidad):
+        acumulado = sum(q[i] * h[k - i] for i in range(1, k + 1))
+        h.append(sp.expand(-acumulado * inverso_q0))
+
+    #A_{m-1-k} = h_k
+    return [h[multiplicidad - 1 - j] for j in range(multiplicidad)]
+
+
+#1/z = conj(z) / |z|^2, sin racionalizar la expresion compleja completa
+def _inverso(z):
+    real, imaginaria = z.as_real_imag()
+    if imaginaria == 0:
+        return 1 / real
+    modulo = sp.expand(real**2 + imaginaria**2)
+    return sp.expand(real / modulo) - sp.I * sp.expand(imaginaria / modulo)
+
+
+def _partes_real_imaginaria(P, x):
+    a = 0
+    b = 0
+    for (potencia,), coeficiente in sp.Poly(P, x).terms():
+        real, imaginaria = sp.expand_complex(coeficiente).as_real_imag()
+        a += real * x**potencia
+        b += imaginaria * x**potencia
+    return a, b